@@ -0,0 +1,88 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+
+from plpc.ast import ArrayType, BuiltInType, RangeType
+from plpc.session import CompilerSession
+from plpc.typechecker import TypeChecker
+
+from .common import measure, print_result, print_throughput
+
+STATEMENTS = 5000
+DIMENSIONS = 16
+INDEXATIONS = 10000
+
+def benchmark_type_checker() -> None:
+    type_checker = TypeChecker('<benchmark>', None)
+
+    def declare() -> ArrayType:
+        dimensions = tuple(RangeType(1, 2, BuiltInType.INTEGER) for _ in range(DIMENSIONS))
+        array_type = type_checker.intern_type(ArrayType(BuiltInType.INTEGER, dimensions))
+        assert isinstance(array_type, ArrayType)
+        return array_type
+
+    # Two separately declared variables of the same type
+    left_type, right_type = declare(), declare()
+
+    def index() -> None:
+        for _ in range(INDEXATIONS):
+            current_type: object = left_type
+            for _ in range(DIMENSIONS):
+                assert isinstance(current_type, ArrayType)
+                current_type = type_checker.type_after_indexation(
+                    current_type,
+                    BuiltInType.INTEGER,
+                    (0, 0)
+                )
+
+    def assign() -> None:
+        for _ in range(INDEXATIONS):
+            type_checker.can_assign(left_type, right_type)
+
+    print_throughput(f'Indexing {DIMENSIONS}-dimensional arrays',
+                     INDEXATIONS,
+                     'variables',
+                     measure(index))
+    print_throughput(f'Assigning {DIMENSIONS}-dimensional arrays',
+                     INDEXATIONS,
+                     'assignments',
+                     measure(assign))
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+    benchmark_type_checker()
+
+    # Every statement indexes (and type checks) multi-dimensional arrays
+    statements = ';\n'.join(['    a[i, j, k] := a[k, j, i] + b[i, j][k] * c[k]'] * STATEMENTS)
+    source = 'program arrays;\n' \
+        'var\n' \
+        '    i, j, k: integer;\n' \
+        '    a: array[1..4, 1..4, 1..4] of integer;\n' \
+        '    b: array[1..4] of array[1..4, 1..4] of integer;\n' \
+        '    c: array[1..4] of integer;\n' \
+        f'begin\n    i := 1;\n    j := 1;\n    k := 1;\n{statements}\nend.\n'
+
+    session = CompilerSession()
+    print_result(f'Parsing {STATEMENTS} array statements',
+                 measure(lambda: session.parse(source, '<benchmark>'), 3))
+    print_result(f'Compiling {STATEMENTS} array statements',
+                 measure(lambda: session.compile(source, '<benchmark>'), 3))
+
+if __name__ == '__main__':
+    main()
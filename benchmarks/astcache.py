@@ -0,0 +1,65 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import contextlib
+import glob
+import io
+import os
+import shutil
+import tempfile
+
+from plpc.cache import FRONTEND_MODULES, BuildCache, get_compiler_version
+from plpc.session import CompilerSession
+
+from .common import measure, print_result
+
+def main() -> None:
+    sources = []
+    for path in sorted(glob.glob('tests/professor/*.pas') + glob.glob('tests/programs/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            sources.append((path, f.read()))
+
+    cache_directory = tempfile.mkdtemp()
+    os.environ['PLPC_CACHE_DIR'] = cache_directory
+    cache = BuildCache(os.path.join(cache_directory, 'ast'),
+                       2 ** 30,
+                       get_compiler_version(FRONTEND_MODULES))
+
+    def parse(session: CompilerSession) -> None:
+        for path, source in sources:
+            try:
+                session.parse(source, path)
+            except ValueError:
+                pass
+
+    uncached_session = CompilerSession()
+    cached_session = CompilerSession(ast_cache=cache)
+
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            parse(cached_session) # Fill the cache
+            uncached_time = measure(lambda: parse(uncached_session))
+            cached_time = measure(lambda: parse(cached_session))
+    finally:
+        shutil.rmtree(cache_directory)
+
+    print_result(f'{len(sources)} parses (no syntax tree cache)', uncached_time)
+    print_result(f'{len(sources)} parses (warm syntax tree cache)', cached_time)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from dataclasses import fields, is_dataclass
+import os
+import tracemalloc
+
+from plpc.ast import Program
+from plpc.session import CompilerSession
+
+STATEMENTS = 20000
+
+def count_nodes(ast: Program) -> tuple[int, int]:
+    # Syntax tree objects (dataclass instances) and tuples wrapping expressions and statements
+    nodes, tuples = 0, 0
+    visited = set()
+    stack: list[object] = [ast]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if isinstance(node, (tuple, list)):
+            tuples += isinstance(node, tuple)
+            stack.extend(node)
+        elif is_dataclass(node):
+            nodes += 1
+            stack.extend(getattr(node, field.name) for field in fields(node))
+
+    return nodes, tuples
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    statements = ';\n'.join([
+        '    i := (i + j * 2) mod 7',
+        '    if i < j then j := j - 1 else a[i mod 10 + 1] := -j',
+        '    while not (10 <= i) do i := i + 1',
+        '    writeln(\'i = \', i, a[1])',
+    ] * (STATEMENTS // 4))
+    source = f'program memory;\nvar i, j: integer;\n    a: array[1..10] of integer;\n' \
+        f'begin\n    i := 0;\n    j := 0;\n{statements}\nend.\n'
+
+    session = CompilerSession()
+    session.parse(source, '<benchmark>') # Build the parser outside of the measurement
+
+    tracemalloc.start()
+    ast = session.parse(source, '<benchmark>')
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes, tuples = count_nodes(ast)
+    print(f'{"Syntax tree nodes":<48} {nodes:10}')
+    print(f'{"Expression and statement tuples":<48} {tuples:10}')
+    print(f'{"Syntax tree size":<48} {size / 2 ** 20:10.3f} MiB')
+    print(f'{"Peak memory while parsing":<48} {peak / 2 ** 20:10.3f} MiB')
+    print(f'{"Memory per node":<48} {size / (nodes + tuples):10.1f} B')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+
+from plpc.batch import compile_files
+
+from .common import measure, print_result
+
+COPIES = 50
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    sources = [f'tests/professor/{i}.pas' for i in [1, 2, 3, 4, 6, 7]]
+
+    input_paths = []
+    for i in range(COPIES):
+        for source in sources:
+            input_path = os.path.join(directory, f'{i}-{os.path.basename(source)}')
+            shutil.copy(source, input_path)
+            input_paths.append(input_path)
+
+    jobs = os.cpu_count() or 1
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            serial_time = measure(lambda: compile_files(input_paths, True, False, 1), 3)
+            parallel_time = measure(lambda: compile_files(input_paths, True, False, jobs), 3)
+    finally:
+        shutil.rmtree(directory)
+
+    print_result(f'{len(input_paths)} files, -j 1', serial_time)
+    print_result(f'{len(input_paths)} files, -j {jobs}', parallel_time)
+
+if __name__ == '__main__':
+    main()
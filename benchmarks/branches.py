@@ -0,0 +1,72 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import glob
+import os
+from unittest.mock import patch
+
+from plpc.session import CompilerSession
+
+from .common import count_instructions
+
+# Conditions that need a NOT unless comparisons are inverted or branches swapped
+CONDITIONS_PROGRAM = '''program conditions;
+var i, n, count: integer;
+    found: boolean;
+begin
+    read(n);
+    count := 0;
+    found := false;
+    i := 0;
+    while (i < n) and not found do
+    begin
+        if i mod 7 <> 3 then
+            count := count + 1
+        else
+            count := count - 1;
+        if not (i < count) or (count <> 2) then
+            found := count > n;
+        i := i + 1
+    end;
+    writeln(count)
+end.
+'''
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    programs = {'<conditions>': CONDITIONS_PROGRAM}
+    for path in sorted(glob.glob('tests/professor/*.pas') + glob.glob('tests/programs/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            programs[path] = f.read()
+
+    print(f'{"Program":<36} {"Before":>10} {"After":>10} {"Before":>10} {"After":>10}')
+    print(f'{"":<36} {"(instructions)":>21} {"(estimated executed)":>21}')
+    session = CompilerSession(True, short_circuit=True)
+    for path, source in programs.items():
+        # Without inverted comparisons, no branches are swapped and no loops on comparisons are
+        # rotated either. Loops on and / or (lowered to jumps), and the check of the length of
+        # characters read by readln don't depend on this, and are the same in both columns.
+        with patch('plpc.ewvm.INVERTED_COMPARISONS', {}):
+            before = count_instructions(session.compile(source, path))
+        after = count_instructions(session.compile(source, path))
+
+        print(f'{path:<36} {before[0]:>10} {after[0]:>10} {before[1]:>10.0f} {after[1]:>10.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+import sys
+from typing import Callable
+from unittest.mock import patch
+
+from plpc.ewvm import EWVMProgram, EWVMStatement, Label
+from plpc.session import CompilerSession
+
+ARMS = [4, 16, 64, 200]
+
+# Instructions executed by the code reading the case expression and choosing an arm. Only the
+# instructions generated for that are supported.
+DISPATCH_OPERATIONS: dict[str, Callable[[int, int], int]] = {
+    'EQUAL': lambda a, b: int(a == b),
+    'OR': lambda a, b: int(bool(a or b)),
+    'INF': lambda a, b: int(a < b),
+    'INFEQ': lambda a, b: int(a <= b),
+    'SUPEQ': lambda a, b: int(a >= b)
+}
+
+def generate_dispatcher(arms: int, spacing: int) -> str:
+    elements = ';\n'.join(f'        {i * spacing}: writeln({i})' for i in range(arms))
+    return f'program dispatcher;\nvar opcode: integer;\nbegin\n    read(opcode);\n' \
+        f'    case opcode of\n{elements}\n    end\nend.'
+
+# Number of instructions executed until an arm (which starts by popping the case expression) is
+# entered, checking that it's the arm that writes the expected number. Unsupported instructions stop
+# the benchmark, rather than being skipped.
+def count_dispatch_instructions(program: EWVMProgram, opcode: int, arm: int) -> int:
+    code: list[EWVMStatement] = []
+    labels: dict[str, int] = {}
+    for statement in program:
+        if isinstance(statement, Label):
+            labels[statement.name] = len(code)
+        elif isinstance(statement, EWVMStatement):
+            code.append(statement)
+
+    stack: list[int] = []
+    pc = steps = 0
+    while code[pc].instruction not in ['POP', 'ERR']:
+        statement = code[pc]
+        argument = statement.arguments[0] if statement.arguments else None
+        pc += 1
+        steps += 1
+
+        if statement.instruction in DISPATCH_OPERATIONS:
+            right = stack.pop()
+            stack.append(DISPATCH_OPERATIONS[statement.instruction](stack.pop(), right))
+        elif statement.instruction == 'READ':
+            stack.append(opcode)
+        elif statement.instruction in ['START', 'ATOI']:
+            pass
+        elif statement.instruction == 'PUSHN' and isinstance(argument, int):
+            stack.extend([0] * argument)
+        elif statement.instruction == 'PUSHI' and isinstance(argument, int):
+            stack.append(argument)
+        elif statement.instruction == 'PUSHG' and isinstance(argument, int):
+            stack.append(stack[argument])
+        elif statement.instruction == 'STOREG' and isinstance(argument, int):
+            stack[argument] = stack.pop()
+        elif statement.instruction == 'DUP' and isinstance(argument, int):
+            stack.extend(stack[-argument:])
+        elif statement.instruction == 'PUSHSP':
+            stack.append(len(stack) - 1) # Address of the top of the stack
+        elif statement.instruction == 'LOAD' and isinstance(argument, int):
+            stack.append(stack[stack.pop() + argument])
+        elif statement.instruction == 'JUMP' and isinstance(argument, Label):
+            pc = labels[argument.name]
+        elif statement.instruction == 'JZ' and isinstance(argument, Label):
+            if stack.pop() == 0:
+                pc = labels[argument.name]
+        else:
+            raise ValueError(f'Unsupported instruction in case dispatch: {statement}')
+
+    if code[pc].instruction == 'ERR' or code[pc + 1] != EWVMStatement('PUSHI', arm):
+        raise ValueError(f'Opcode {opcode} dispatched to the wrong arm')
+
+    return steps
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    print(f'{"Dispatcher":<36} {"Chain":>10} {"Search":>10}   (executed instructions per opcode)')
+    for spacing, name in [(1, 'dense'), (37, 'sparse')]:
+        for arms in ARMS:
+            source = generate_dispatcher(arms, spacing)
+
+            with patch('plpc.ewvm.CASE_SEARCH_MIN_LABELS', sys.maxsize):
+                chain = CompilerSession(True).compile(source, '<benchmark>')
+            search = CompilerSession(True).compile(source, '<benchmark>')
+
+            counts = [sum(count_dispatch_instructions(program, i * spacing, i)
+                          for i in range(arms)) / arms
+                      for program in [chain, search]]
+            print(f'{f"{arms} arms ({name})":<36} {counts[0]:>10.1f} {counts[1]:>10.1f}')
+
+if __name__ == '__main__':
+    main()
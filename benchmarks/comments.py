@@ -0,0 +1,49 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+
+from plpc.lexer import create_lexer
+
+from .common import measure, print_result
+
+SOURCE_LINE = 'x := x + 1; '
+COMMENT_LINE = 'Licensed under the Apache License, Version 2.0 (the "License");\n'
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    # A single huge comment, and many small comments between code
+    sources = [
+        ('1 comment', '{' + COMMENT_LINE * 40000 + '}' + SOURCE_LINE),
+        ('40000 comments', ('(* ' + COMMENT_LINE + ' *)' + SOURCE_LINE) * 40000)
+    ]
+
+    lexer = create_lexer('<benchmark>')
+    def tokenize(source: str) -> None:
+        lexer.lineno = 1
+        lexer.input(source)
+        for _ in lexer:
+            pass
+
+    for name, source in sources:
+        seconds = measure(lambda: tokenize(source), 3) # pylint: disable=cell-var-from-loop
+        print_result(f'Lexing {len(source) / 2 ** 20:.2f} MiB ({name})', seconds)
+
+if __name__ == '__main__':
+    main()
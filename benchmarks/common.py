@@ -0,0 +1,50 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import time
+from typing import Callable
+
+from plpc.ewvm import EWVMProgram, EWVMStatement
+from plpc.ewvmpeephole import LOOP_ITERATIONS, get_loop_depths
+
+def measure(function: Callable[[], object], repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def print_result(name: str, seconds: float) -> None:
+    print(f'{name:<48} {seconds * 1000:10.3f} ms')
+
+def print_throughput(name: str, count: int, unit: str, seconds: float) -> None:
+    print(f'{name:<48} {count / seconds:10.0f} {unit}/s')
+
+# Instructions in a program, and an estimate of how many of them are executed, assuming that every
+# loop runs LOOP_ITERATIONS times
+def count_instructions(program: EWVMProgram) -> tuple[int, float]:
+    instructions = 0
+    executed = 0.0
+    for statement, depth in zip(program, get_loop_depths(program)):
+        if isinstance(statement, EWVMStatement):
+            instructions += 1
+            executed += LOOP_ITERATIONS ** depth
+
+    return instructions, executed
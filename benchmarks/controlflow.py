@@ -0,0 +1,69 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import glob
+import os
+from unittest.mock import patch
+
+from plpc.session import CompilerSession
+
+from .common import count_instructions
+
+# Ifs without else and nested loops, whose jumps the cleanup simplifies
+BRANCHES_PROGRAM = '''program branches;
+var i, j, n, count: integer;
+begin
+    read(n);
+    count := 0;
+    for i := 1 to n do
+    begin
+        for j := 1 to n do
+            if (i + j) mod 2 = 0 then
+                count := count + 1;
+        if i mod 3 = 0 then
+        begin
+            if count > n then
+                count := count - n
+        end
+        else if i mod 5 = 0 then
+            count := count + 5
+    end;
+    writeln(count)
+end.
+'''
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    programs = {'<branches>': BRANCHES_PROGRAM}
+    for path in sorted(glob.glob('tests/professor/*.pas') + glob.glob('tests/programs/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            programs[path] = f.read()
+
+    # The dead jumps back after each for loop look like more loops, so the estimate of executed
+    # instructions would be meaningless before the cleanup
+    print(f'{"Program":<36} {"Before":>10} {"After":>10}   (instructions)')
+    for path, source in programs.items():
+        with patch('plpc.session.apply_ewvm_control_flow_cleanup', lambda assembly: assembly):
+            before, _ = count_instructions(CompilerSession(True).compile(source, path))
+        after, _ = count_instructions(CompilerSession(True).compile(source, path))
+
+        print(f'{path:<36} {before:>10} {after:>10}')
+
+if __name__ == '__main__':
+    main()
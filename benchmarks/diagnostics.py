@@ -0,0 +1,51 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import contextlib
+import io
+import os
+
+from plpc.session import CompilerSession
+
+from .common import measure, print_result
+
+VARIABLES = 3000
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    # Every local variable shadows a global one, resulting in one warning each
+    variables = ''.join(f'    v{i}: integer;\n' for i in range(VARIABLES))
+    source = f'program diagnostics;\nvar\n{variables}\n' \
+        f'procedure p;\nvar\n{variables}begin\n    v0 := 1\nend;\n\n' \
+        'begin\n    v0 := 0\nend.\n'
+
+    session = CompilerSession()
+    diagnostics = io.StringIO()
+    def compile_source() -> None:
+        diagnostics.seek(0)
+        diagnostics.truncate()
+        with contextlib.redirect_stderr(diagnostics):
+            session.compile(source, '<benchmark>')
+
+    seconds = measure(compile_source, 3)
+    warnings = diagnostics.getvalue().count('warning')
+    print_result(f'Compiling {len(source) / 2 ** 20:.2f} MiB ({warnings} warnings)', seconds)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import glob
+import os
+from unittest.mock import patch
+
+from plpc.session import CompilerSession
+
+from .common import count_instructions
+
+# Array accesses with constant offsets, like most of the code folded after code generation
+ARRAYS_PROGRAM = '''program arrays;
+var a: array[1..10] of integer;
+    m: array[1..5, 0..4] of integer;
+    i, j: integer;
+begin
+    for i := 1 to 9 do
+        a[i + 1] := a[i] - (-i);
+    for i := 1 to 5 do
+        for j := 0 to 4 do
+            m[i, j] := m[i, j] + a[i + 1] * 1;
+    for i := 0 to 9 do
+        if a[i + 1] > 0 then
+            writeln(a[i + 1])
+end.
+'''
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    programs = {'<arrays>': ARRAYS_PROGRAM}
+    for path in sorted(glob.glob('tests/professor/*.pas') + glob.glob('tests/programs/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            programs[path] = f.read()
+
+    print(f'{"Program":<36} {"Before":>10} {"After":>10} {"Before":>10} {"After":>10}')
+    print(f'{"":<36} {"(instructions)":>21} {"(estimated executed)":>21}')
+    for path, source in programs.items():
+        with patch('plpc.session.apply_ewvm_constant_folding', lambda assembly: assembly):
+            before = count_instructions(CompilerSession(True).compile(source, path))
+        after = count_instructions(CompilerSession(True).compile(source, path))
+
+        print(f'{path:<36} {before[0]:>10} {after[0]:>10} {before[1]:>10.0f} {after[1]:>10.0f}')
+
+if __name__ == '__main__':
+    main()
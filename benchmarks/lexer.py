@@ -0,0 +1,55 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import glob
+import os
+
+from plpc.lexer import LexerError, create_lexer
+
+from .common import measure, print_result, print_throughput
+
+COPIES = 200
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    sources = []
+    for path in sorted(glob.glob('tests/professor/*.pas') + glob.glob('tests/programs/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            sources.append(f.read())
+    source = '\n'.join(sources) * COPIES
+
+    lexer = create_lexer('<benchmark>')
+    token_count = 0
+
+    def tokenize() -> None:
+        nonlocal token_count
+
+        lexer.lineno = 1
+        lexer.input(source)
+        try:
+            token_count = sum(1 for _ in lexer)
+        except LexerError:
+            pass
+
+    seconds = measure(tokenize)
+    print_result(f'Lexing {len(source) / 2 ** 20:.2f} MiB', seconds)
+    print_throughput('Lexer throughput', token_count, 'tokens', seconds)
+
+if __name__ == '__main__':
+    main()
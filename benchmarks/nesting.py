@@ -0,0 +1,56 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+import time
+
+from plpc.ewvm import generate_ewvm_code
+from plpc.optimizer import optimize_ast
+from plpc.session import CompilerSession
+
+from .common import measure, print_result
+
+SIZES = [5000, 10000, 20000, 40000]
+
+def generate_source(depth: int) -> str:
+    # A long chain of operations and a deep if / else if ladder
+    chain = ' + '.join(['(x - 1)'] * depth)
+    ladder = ''.join(f'if x = {i} then x := {i} else ' for i in range(depth))
+    return f'program nesting;\nvar x: integer;\nbegin\n    x := {chain};\n    {ladder}x := 0\nend.'
+
+def benchmark(session: CompilerSession, depth: int) -> None:
+    source = generate_source(depth)
+
+    # The optimizer modifies the tree, so it's only measured once per parse
+    ast = session.parse(source, '<benchmark>')
+    start = time.perf_counter()
+    optimize_ast(ast)
+    print_result(f'optimize_ast (depth {depth})', time.perf_counter() - start)
+
+    ast = session.parse(source, '<benchmark>')
+    print_result(f'generate_ewvm_code (depth {depth})', measure(lambda: generate_ewvm_code(ast), 3))
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    session = CompilerSession()
+    for depth in SIZES:
+        benchmark(session, depth)
+
+if __name__ == '__main__':
+    main()
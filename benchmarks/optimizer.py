@@ -0,0 +1,60 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import copy
+import os
+import sys
+
+from plpc.ast import Program
+from plpc.optimizer import optimize_ast
+from plpc.session import CompilerSession
+
+from .common import measure, print_result
+
+SIZES = [2500, 5000, 10000, 20000]
+
+def generate_source(statements: int) -> str:
+    body = ';\n'.join([
+        '    i := (i + 2 * 3) mod 7 - (1 + 2)',
+        '    if not (i < j) then j := j - (4 div 2) else a[i mod 10 + 1] := -j',
+        '    while not (not (i = 10)) and not (j > 0) do i := i + 1',
+        '    writeln(\'i = \', i + 1 * 1, a[1 + 1])',
+    ] * (statements // 4))
+    return f'program optimizer;\nvar i, j: integer;\n    a: array[1..10] of integer;\n' \
+        f'begin\n    i := 0;\n    j := 0;\n{body}\nend.\n'
+
+def benchmark(session: CompilerSession, statements: int) -> None:
+    ast = session.parse(generate_source(statements), '<benchmark>')
+
+    # Every run optimizes a new copy of the tree, and copies aren't measured
+    copies: list[Program] = [copy.deepcopy(ast) for _ in range(5)]
+    seconds = measure(lambda: optimize_ast(copies.pop()), len(copies))
+
+    print_result(f'optimize_ast ({statements} statements)', seconds)
+    print(f'{"":<48} {seconds / statements * 1e6:10.3f} us/statement')
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+    sys.setrecursionlimit(100000) # Deep copies of syntax trees
+
+    session = CompilerSession()
+    for statements in SIZES:
+        benchmark(session, statements)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import contextlib
+import glob
+import io
+import os
+
+from plpc.session import CompilerSession
+
+from .common import measure, print_result
+
+STATEMENTS = 20000
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    professor_sources = []
+    for path in sorted(glob.glob('tests/professor/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            professor_sources.append((path, f.read()))
+
+    statements = ';\n'.join(['    x := (x + 1) * 2 - x div 3'] * STATEMENTS)
+    synthetic_source = f'program synthetic;\nvar x: integer;\nbegin\n{statements}\nend.\n'
+
+    workloads = [
+        ('tests/professor/*.pas', professor_sources),
+        (f'{STATEMENTS} statements', [('<synthetic>', synthetic_source)])
+    ]
+
+    session = CompilerSession()
+    def parse(sources: list[tuple[str, str]], tracking: bool) -> None:
+        for path, source in sources:
+            session.reset(path)
+            try:
+                session.parser.parse(source, tracking)
+            except ValueError:
+                pass
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        for name, sources in workloads:
+            for tracking in [True, False]:
+                seconds = measure(lambda: parse(sources, tracking)) # pylint: disable=cell-var-from-loop
+                mode = 'always tracking positions' if tracking else 'tracking only on diagnostics'
+                print_result(f'{name} ({mode})', seconds)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+
+from plpc.parser import create_parser
+
+from .common import measure, print_result
+
+def main() -> None:
+    cache_directory = tempfile.mkdtemp()
+    os.environ['PLPC_CACHE_DIR'] = cache_directory
+
+    def cold() -> None:
+        for file in os.listdir(cache_directory):
+            os.remove(os.path.join(cache_directory, file))
+        create_parser('<benchmark>')
+
+    def warm() -> None:
+        create_parser('<benchmark>')
+
+    try:
+        print_result('create_parser (cold table cache)', measure(cold))
+        print_result('create_parser (warm table cache)', measure(warm))
+    finally:
+        shutil.rmtree(cache_directory)
+
+    os.environ['PLPC_CACHE_DIR'] = ''
+    print_result('create_parser (no table cache)', measure(warm))
+
+if __name__ == '__main__':
+    main()
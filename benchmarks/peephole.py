@@ -0,0 +1,71 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+
+from plpc.ewvm import EWVMProgram, generate_ewvm_code, remove_ewvm_comments
+from plpc.ewvmpeephole import DEFAULT_PEEPHOLE_RULES, PeepholeOptimizer, parse_peephole_rules
+from plpc.session import CompilerSession
+
+from .common import measure, print_result, print_throughput
+
+SIZES = [25000, 50000, 100000, 200000]
+EXTRA_RULES = [0, 16, 64]
+
+# Rules that never apply, spread over the opcodes generated by the compiler
+OPCODES = ['ADD', 'ALLOC', 'ATOF', 'ATOI', 'CALL', 'CHARAT', 'COPY', 'DUP', 'EQUAL', 'ERR', 'INFEQ',
+           'JUMP', 'JZ', 'LOAD', 'LOADN', 'MUL', 'NOT', 'OR', 'PADD', 'POP', 'POPST', 'PUSHA',
+           'PUSHF', 'PUSHI', 'PUSHL', 'PUSHS', 'PUSHSP', 'READ', 'RETURN', 'START', 'STOP', 'STORE',
+           'STOREN', 'STRLEN', 'SUB', 'SUPEQ', 'SWAP', 'WRITECHR', 'WRITEF', 'WRITEI', 'WRITELN',
+           'WRITES']
+
+def generate_rules(count: int) -> str:
+    return '\n'.join(f'{OPCODES[i % len(OPCODES)]}; PUSHI {-1 - i}; SWAP -> SWAP; PUSHI {-1 - i}'
+                     for i in range(count))
+
+def generate_program(instructions: int) -> EWVMProgram:
+    statements = ';\n'.join([
+        '    i := i * 2',
+        '    x := x * 2.0',
+        '    j := i + j',
+        '    if i < j then i := i + 1 else j := j - 1',
+    ] * (instructions // 27))
+    source = f'program peephole;\nvar i, j, k, l: integer;\n    x, y: real;\n' \
+        f'begin\n{statements}\nend.\n'
+
+    return remove_ewvm_comments(generate_ewvm_code(CompilerSession().parse(source, '<benchmark>')))
+
+def benchmark(program: EWVMProgram, extra_rules: int) -> None:
+    optimizer = PeepholeOptimizer([*DEFAULT_PEEPHOLE_RULES,
+                                   *parse_peephole_rules(generate_rules(extra_rules))])
+
+    seconds = measure(lambda: optimizer.optimize(program), 3)
+    print_result(f'Peephole optimizer ({len(program)} instructions, {len(optimizer.rules)} rules)',
+                 seconds)
+    print_throughput('', len(program), 'instructions', seconds)
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = ''
+
+    for instructions in SIZES:
+        program = generate_program(instructions)
+        for extra_rules in EXTRA_RULES:
+            benchmark(program, extra_rules)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import contextlib
+import glob
+import io
+import os
+
+from plpc.session import CompilerSession
+
+from .common import measure, print_result
+
+def main() -> None:
+    os.environ['PLPC_CACHE_DIR'] = '' # Measure without the table cache
+
+    sources = []
+    for path in sorted(glob.glob('tests/professor/*.pas') + glob.glob('tests/programs/*.pas')):
+        with open(path, 'r', encoding='utf-8') as f:
+            sources.append((path, f.read()))
+
+    def fresh() -> None:
+        for path, source in sources:
+            try:
+                CompilerSession().compile(source, path)
+            except ValueError:
+                pass
+
+    session = CompilerSession()
+    def reused() -> None:
+        for path, source in sources:
+            try:
+                session.compile(source, path)
+            except ValueError:
+                pass
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        fresh_time = measure(fresh)
+        reused_time = measure(reused)
+
+    print_result(f'{len(sources)} compilations (new session each)', fresh_time)
+    print_result(f'{len(sources)} compilations (reused session)', reused_time)
+
+if __name__ == '__main__':
+    main()
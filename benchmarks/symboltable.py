@@ -0,0 +1,56 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from plpc.ast import BuiltInType, VariableDefinition
+from plpc.symboltable import SymbolTable
+
+from .common import measure, print_result
+
+DEPTH = 64
+IDENTIFIERS_PER_SCOPE = 500
+
+def main() -> None:
+    names = [
+        [f'v{depth}x{i}' for i in range(IDENTIFIERS_PER_SCOPE)] for depth in range(DEPTH)
+    ]
+    symbols = SymbolTable('<benchmark>', None)
+
+    def declare() -> None:
+        symbols.reset('<benchmark>')
+        for depth in range(DEPTH):
+            symbols.new_scope()
+            for name in names[depth]:
+                symbols.add(VariableDefinition(name, BuiltInType.INTEGER, True), (0, 0))
+
+    def query() -> None:
+        for scope_names in names:
+            for name in scope_names:
+                symbols.query_variable(name)
+
+    def unstack() -> None:
+        declare()
+        for _ in range(DEPTH):
+            symbols.unstack_top_scope()
+
+    identifiers = DEPTH * IDENTIFIERS_PER_SCOPE
+    print_result(f'Declaring {identifiers} identifiers ({DEPTH} scopes)', measure(declare))
+    print_result(f'Querying {identifiers} identifiers ({DEPTH} scopes)', measure(query))
+    print_result(f'Declaring and unstacking {identifiers} identifiers', measure(unstack))
+
+if __name__ == '__main__':
+    main()
@@ -17,64 +17,198 @@
 # -------------------------------------------------------------------------------------------------
 
 import argparse
+import os
 import sys
+from typing import Any
 
-from .ewvm import export_assembly, generate_ewvm_code, remove_ewvm_comments
-from .ewvmpeephole import apply_ewvm_peephole_optimizations
-from .lexer import LexerError
-from .optimizer import optimize_ast
-from .parser import ParserError, create_parser
+# NOTE: the compiler is only imported when needed, to keep the startup of the client fast
+from .cache import FRONTEND_MODULES, BuildCache, get_compiler_version
+from .client import compile_file_remotely, get_default_socket_path
+from .error import configure_diagnostics, print_unlocalized_error
+from .sourcefile import read_source_file, write_assembly_file
 
 def main() -> None:
     argument_parser = argparse.ArgumentParser(description='Compile Pascal for the EWVM.')
-    argument_parser.add_argument('file', nargs='?', default='-', help='path to the file to compile')
-    argument_parser.add_argument('-o', default='-', help='output assembly file')
+    argument_parser.add_argument('files',
+                                 nargs='*',
+                                 default=['-'],
+                                 help='paths to the files (or directories) to compile')
+    argument_parser.add_argument('-o',
+                                 default='-',
+                                 help='output assembly file (only when compiling a single file)')
     argument_parser.add_argument('-O', action='store_true', help='optimize generated code')
+    argument_parser.add_argument('-O2',
+                                 action='store_true',
+                                 help='optimize generated code more aggressively (-O with '
+                                      '-fshort-circuit)')
     argument_parser.add_argument('-g', action='store_true', help='add debug symbols')
+    argument_parser.add_argument('-fshort-circuit',
+                                 action='store_true',
+                                 dest='short_circuit',
+                                 help='don\'t evaluate the right operand of and / or in '
+                                      'conditions when the left one decides the result')
+    argument_parser.add_argument('--peephole-rules',
+                                 action='append',
+                                 default=[],
+                                 metavar='FILE',
+                                 help='file with more peephole optimization rules (used with -O)')
+    argument_parser.add_argument('--peephole-stats',
+                                 action='store_true',
+                                 help='print how much each peephole optimization rule was used '
+                                      '(with -O, disables the compilation cache)')
+    argument_parser.add_argument('--diagnostics-format',
+                                 choices=['text', 'json'],
+                                 default='text',
+                                 help='format of errors and warnings (json: one object per line)')
+    argument_parser.add_argument('-j',
+                                 type=int,
+                                 default=1,
+                                 help='number of parallel compilation jobs (0 for one per CPU)')
+    argument_parser.add_argument('--no-cache',
+                                 action='store_true',
+                                 help='don\'t use cached compilation results')
+    argument_parser.add_argument('--ast-cache',
+                                 action='store_true',
+                                 help='cache typed syntax trees, to skip parsing when only the '
+                                      'optimization or debug flags change')
+    argument_parser.add_argument('--cache-stats',
+                                 action='store_true',
+                                 help='print statistics about the compilation cache')
+    argument_parser.add_argument('--cache-size',
+                                 type=int,
+                                 default=256,
+                                 help='maximum size of the compilation cache, in MiB')
+    argument_parser.add_argument('--server',
+                                 action='store_true',
+                                 help='run a compilation server, for use with --client')
+    argument_parser.add_argument('--client',
+                                 action='store_true',
+                                 help='compile using a running compilation server')
+    argument_parser.add_argument('--socket',
+                                 default=get_default_socket_path(),
+                                 help='path to the compilation server\'s socket')
     args = argument_parser.parse_args()
+    if args.O2:
+        args.O = args.short_circuit = True
+    configure_diagnostics(args.diagnostics_format == 'json')
 
-    try:
-        human_readable_filename = args.file
+    if args.server:
+        # pylint: disable-next=import-outside-toplevel
+        from .server import run_server
+        if not run_server(args.socket):
+            sys.exit(1)
+
+    elif args.client:
+        if len(args.files) != 1 or os.path.isdir(args.files[0]):
+            argument_parser.error('--client can only compile a single file')
+        if args.peephole_rules or args.peephole_stats:
+            argument_parser.error('peephole options cannot be used with --client')
+
+        if not compile_file_remotely(args.socket,
+                                     args.files[0],
+                                     args.o,
+                                     args.O,
+                                     args.g,
+                                     args.short_circuit):
+            sys.exit(1)
+
+    else:
+        if args.peephole_stats and not args.O:
+            argument_parser.error('--peephole-stats requires -O')
+
+        # PeepholeRule and PeepholeStatistics, without importing the compiler
+        peephole_rules: list[Any] = []
+        peephole_statistics: Any = None
+        if args.peephole_rules or args.peephole_stats:
+            # pylint: disable-next=import-outside-toplevel
+            from .ewvmpeephole import DEFAULT_PEEPHOLE_RULES, PeepholeRuleError, \
+                PeepholeStatistics, load_peephole_rules
 
-        if args.file == '-':
-            source = sys.stdin.read()
-            human_readable_filename = '<stdin>'
-        else:
             try:
-                with open(args.file, 'r', encoding='utf-8') as f:
-                    source = f.read()
-            except IOError:
-                print(f'Failed to open source file: {args.file}', file=sys.stderr)
+                for rules_path in args.peephole_rules:
+                    peephole_rules.extend(load_peephole_rules(rules_path))
+            except PeepholeRuleError as e:
+                print_unlocalized_error(str(e))
+                sys.exit(1)
 
-        parser = create_parser(human_readable_filename)
-        ast = parser.parse(source)
+            if args.peephole_stats:
+                peephole_statistics = PeepholeStatistics([*DEFAULT_PEEPHOLE_RULES, *peephole_rules])
 
-        if args.O:
-            optimize_ast(ast)
+        # Cached outputs wouldn't count towards peephole statistics
+        cache = None
+        if not args.no_cache and not args.peephole_stats:
+            cache = BuildCache.create_default(args.cache_size * 2 ** 20)
+        ast_cache = None
+        if args.ast_cache and not args.no_cache:
+            ast_cache = BuildCache.create_default(args.cache_size * 2 ** 20,
+                                                  'ast',
+                                                  get_compiler_version(FRONTEND_MODULES))
 
-        assembly = generate_ewvm_code(ast)
+        success = False
+        if len(args.files) == 1 and not os.path.isdir(args.files[0]):
+            # Single file: output to the file provided with -o (stdout by default)
+            read_result = read_source_file(args.files[0])
+            if read_result is not None:
+                source, human_readable_filename = read_result
 
-        if not args.g:
-            assembly = remove_ewvm_comments(assembly)
+                # The compiler is only loaded on cache misses
+                assembly_text = None
+                if cache is not None:
+                    key = cache.get_key(source,
+                                        args.O,
+                                        args.g,
+                                        args.short_circuit,
+                                        *(rule.source for rule in peephole_rules))
+                    assembly_text = cache.replay(key, human_readable_filename)
 
-        if args.O:
-            assembly = apply_ewvm_peephole_optimizations(assembly)
+                if assembly_text is None:
+                    # pylint: disable-next=import-outside-toplevel
+                    from .session import CompilerSession
 
-        assembly_text = export_assembly(assembly)
+                    session = CompilerSession(args.O,
+                                              args.g,
+                                              ast_cache,
+                                              peephole_rules,
+                                              peephole_statistics,
+                                              args.short_circuit)
+                    assembly_text = session.compile_to_text(source, human_readable_filename, cache)
 
-        if args.o == '-':
-            print(assembly_text)
+                if assembly_text is not None:
+                    success = write_assembly_file(args.o, assembly_text)
         else:
-            try:
-                with open(args.o, 'w', encoding='utf-8') as f:
-                    f.write(assembly_text)
-            except IOError:
-                print(f'Failed to write to output file: {args.o}', file=sys.stderr)
-
-    except LexerError:
-        print('Lexer failed. Aborting ...', file=sys.stderr)
-    except ParserError:
-        print('Parser failed. Aborting ...', file=sys.stderr)
+            # Multiple files: one .ewvm file next to each source file
+            if args.o != '-':
+                argument_parser.error('-o cannot be used when compiling multiple files')
+
+            # pylint: disable-next=import-outside-toplevel
+            from .batch import compile_files, find_source_files
+
+            jobs = args.j if args.j > 0 else os.cpu_count() or 1
+            failures = compile_files(find_source_files(args.files),
+                                     args.O,
+                                     args.g,
+                                     jobs,
+                                     cache,
+                                     ast_cache,
+                                     peephole_rules,
+                                     peephole_statistics,
+                                     args.short_circuit)
+            success = failures == 0
+
+        for used_cache in [cache, ast_cache]:
+            if used_cache is not None:
+                used_cache.trim()
+                if args.cache_stats:
+                    used_cache.print_statistics()
+
+        if args.cache_stats and cache is None:
+            print('Cache disabled', file=sys.stderr)
+
+        if peephole_statistics is not None:
+            peephole_statistics.print_statistics()
+
+        if not success:
+            sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -17,16 +17,17 @@
 # -------------------------------------------------------------------------------------------------
 
 from __future__ import annotations
+import dataclasses
 from dataclasses import dataclass
 from enum import IntEnum
 from typing import Literal
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     name: str
     block: Block
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     labels: list[LabelDefinition]
     constants: list[ConstantDefinition]
@@ -35,18 +36,18 @@ class Block:
     callables: list[CallableDefinition]
     body: BeginEndStatement
 
-@dataclass
+@dataclass(slots=True)
 class LabelDefinition:
     name: int
     statement: None | Statement
     used: bool = False
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConstantDefinition:
     name: str
     value: ConstantValue
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TypeDefinition:
     name: str
     value: TypeValue
@@ -60,56 +61,100 @@ class BuiltInType(IntEnum):
 
 EnumeratedType = list[ConstantDefinition]
 
-@dataclass
+@dataclass(slots=True)
 class EnumeratedTypeConstantValue:
     name: str
     value: int
     constant_type: None | TypeDefinition
 
-@dataclass
+# Range and array types are interned by the type checker (see TypeChecker.intern_type), so that
+# equal types are the same object
+
+@dataclass(frozen=True, slots=True)
 class RangeType:
     start: ConstantValue
     end: ConstantValue
     subtype: TypeValue
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ArrayType:
     subtype: TypeValue
-    dimensions: list[RangeType]
+    dimensions: tuple[RangeType, ...]
+
+    # Number of elements, and number of elements between consecutive indices of each dimension
+    # (computed when not provided by the type checker). The type after indexing the first dimension
+    # is only known for interned types.
+    size: int = dataclasses.field(default=0, compare=False, repr=False)
+    strides: tuple[int, ...] = dataclasses.field(default=(), compare=False, repr=False)
+    element_type: None | TypeValue = dataclasses.field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.strides or not self.dimensions:
+            return
+
+        lengths = []
+        for dimension in self.dimensions:
+            start = get_constant_ordinal_value(dimension.start)
+            end = get_constant_ordinal_value(dimension.end)
+            if start is None or end is None:
+                return # Invalid type, reported by the type checker
+            lengths.append(end - start + 1)
+
+        strides = [1] * len(lengths)
+        size = 1
+        for i in reversed(range(len(lengths))):
+            strides[i] = size
+            size *= lengths[i]
+
+        # Frozen dataclass
+        object.__setattr__(self, 'size', size)
+        object.__setattr__(self, 'strides', tuple(strides))
 
 ConstantValue = bool | int | float | str | EnumeratedTypeConstantValue
+
+def get_constant_ordinal_value(constant: ConstantValue) -> None | int:
+    if isinstance(constant, (bool, int)):
+        return int(constant)
+    elif isinstance(constant, str) and len(constant) == 1:
+        return ord(constant)
+    elif isinstance(constant, EnumeratedTypeConstantValue):
+        return constant.value
+    else:
+        return None
+
 TypeValue = BuiltInType | EnumeratedType | RangeType | ArrayType
 
-@dataclass
+@dataclass(slots=True)
 class VariableDefinition:
     name: str
     variable_type: TypeValue
     callable_scope: bool
     scope_offset: int = -1
 
-@dataclass
+@dataclass(slots=True)
 class VariableUsage:
     variable: VariableDefinition
     type: TypeValue
     indices: list[Expression]
 
-@dataclass
+@dataclass(slots=True)
 class CallableDefinition:
     name: str
     parameters: None | list[VariableDefinition]
     return_variable: None | VariableDefinition
     body: Block
 
-@dataclass
+@dataclass(slots=True)
 class CallableCall:
     callable: CallableDefinition
     arguments: list[Expression]
+    builtin: bool = False
 
 BinaryOperator = Literal['+', '-', '*', '/', 'div', 'mod',
                          'and', 'or', 'in',
                          '=', '<>', '<', '>', '<=', '>=']
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOperation:
     operator: BinaryOperator
     left: Expression
@@ -117,7 +162,7 @@ class BinaryOperation:
 
 UnaryOperator = Literal['+', '-', 'not']
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOperation:
     operator: UnaryOperator
     sub: Expression
@@ -127,42 +172,42 @@ Expression = tuple[
     TypeValue
 ]
 
-@dataclass
+@dataclass(slots=True)
 class AssignStatement:
     left: VariableUsage
     right: Expression
 
-@dataclass
+@dataclass(slots=True)
 class GotoStatement:
     label: LabelDefinition
 
-@dataclass
+@dataclass(slots=True)
 class IfStatement:
     condition: Expression
     when_true: Statement
     when_false: Statement
 
-@dataclass
+@dataclass(slots=True)
 class CaseElement:
     labels: list[ConstantValue]
     body: Statement
 
-@dataclass
+@dataclass(slots=True)
 class CaseStatement:
     expression: Expression
     elements: list[CaseElement]
 
-@dataclass
+@dataclass(slots=True)
 class RepeatStatement:
     condition: Expression
     body: list[Statement]
 
-@dataclass
+@dataclass(slots=True)
 class WhileStatement:
     condition: Expression
     body: Statement
 
-@dataclass
+@dataclass(slots=True)
 class ForStatement:
     variable: VariableDefinition
     initial_expression: Expression
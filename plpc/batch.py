@@ -0,0 +1,157 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+from typing import Sequence
+
+from .cache import BuildCache
+from .error import Diagnostic, collect_diagnostics, report_diagnostics
+from .ewvmpeephole import PeepholeRule, PeepholeStatistics
+from .session import CompilerSession
+
+def find_source_files(paths: list[str]) -> list[str]:
+    ret = []
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(glob.escape(path), '**', '*.pas')
+            ret.extend(sorted(glob.glob(pattern, recursive=True)))
+        elif not os.path.exists(path) and any(c in path for c in '*?['):
+            # Glob not expanded by the shell
+            ret.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            ret.append(path)
+
+    return ret
+
+def get_output_path(input_path: str) -> str:
+    return os.path.splitext(input_path)[0] + '.ewvm'
+
+# Each worker process keeps its own session, so that the parsing tables are only loaded once
+__worker_session: None | CompilerSession = None # pylint: disable=invalid-name
+__worker_cache: None | BuildCache = None # pylint: disable=invalid-name
+
+def __initialize_worker(optimize: bool,
+                        debug: bool,
+                        cache: None | BuildCache,
+                        ast_cache: None | BuildCache,
+                        peephole_rules: Sequence[PeepholeRule],
+                        peephole_statistics: None | PeepholeStatistics,
+                        short_circuit: bool) -> None:
+
+    global __worker_session, __worker_cache
+    __worker_session = CompilerSession(optimize,
+                                       debug,
+                                       ast_cache,
+                                       peephole_rules,
+                                       peephole_statistics,
+                                       short_circuit)
+    __worker_cache = cache
+
+def __get_cache_statistics(cache: None | BuildCache) -> tuple[int, int, int]:
+    return (0, 0, 0) if cache is None else (cache.hits, cache.misses, cache.stored)
+
+# Returns success, diagnostics, the hits, misses and stored bytes of the build and syntax tree
+# caches, and the firings of peephole rules (when collected)
+def __compile_in_worker(input_path: str) -> tuple[bool,
+                                                  list[Diagnostic],
+                                                  list[tuple[int, int, int]],
+                                                  None | PeepholeStatistics]:
+    assert __worker_session is not None
+
+    caches = [__worker_cache, __worker_session.ast_cache]
+    before = [__get_cache_statistics(cache) for cache in caches]
+
+    # Diagnostics are reported by the main process, so that they aren't interleaved
+    with collect_diagnostics() as diagnostics:
+        success = __worker_session.compile_file(input_path,
+                                                get_output_path(input_path),
+                                                __worker_cache)
+
+    after = [__get_cache_statistics(cache) for cache in caches]
+    statistics = [(a[0] - b[0], a[1] - b[1], a[2] - b[2]) for a, b in zip(after, before)]
+
+    peephole_statistics = __worker_session.peephole_statistics
+    if peephole_statistics is not None:
+        __worker_session.peephole_statistics = PeepholeStatistics()
+
+    return success, diagnostics, statistics, peephole_statistics
+
+# Returns the number of files that failed to compile. Peephole rule firings are added to
+# peephole_statistics (when provided).
+def compile_files(input_paths: list[str],
+                  optimize: bool,
+                  debug: bool,
+                  jobs: int,
+                  cache: None | BuildCache = None,
+                  ast_cache: None | BuildCache = None,
+                  peephole_rules: Sequence[PeepholeRule] = (),
+                  peephole_statistics: None | PeepholeStatistics = None,
+                  short_circuit: bool = False) -> int:
+
+    failures = 0
+
+    if jobs == 1 or len(input_paths) <= 1:
+        session = CompilerSession(optimize,
+                                  debug,
+                                  ast_cache,
+                                  peephole_rules,
+                                  peephole_statistics,
+                                  short_circuit)
+        for input_path in input_paths:
+            if not session.compile_file(input_path, get_output_path(input_path), cache):
+                failures += 1
+
+        return failures
+
+    jobs = min(jobs, len(input_paths))
+    chunk_size = max(1, len(input_paths) // (jobs * 4))
+
+    # Workers count firings from zero, and their counts are merged here
+    worker_peephole_statistics = None if peephole_statistics is None else PeepholeStatistics()
+    initargs = (optimize,
+                debug,
+                cache,
+                ast_cache,
+                peephole_rules,
+                worker_peephole_statistics,
+                short_circuit)
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=__initialize_worker,
+                             initargs=initargs) as executor:
+
+        # Results (and diagnostics) are reported in the same order as the input files
+        for success, diagnostics, statistics, file_peephole_statistics in \
+            executor.map(__compile_in_worker, input_paths, chunksize=chunk_size):
+
+            report_diagnostics(diagnostics)
+            if not success:
+                failures += 1
+
+            # Stored bytes are added to the size of the cache when it's trimmed
+            for used_cache, (hits, misses, stored) in zip([cache, ast_cache], statistics):
+                if used_cache is not None:
+                    used_cache.hits += hits
+                    used_cache.misses += misses
+                    used_cache.stored += stored
+
+            if peephole_statistics is not None and file_peephole_statistics is not None:
+                peephole_statistics.merge(file_peephole_statistics)
+
+    return failures
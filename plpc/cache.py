@@ -0,0 +1,234 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from __future__ import annotations
+from dataclasses import dataclass, replace
+import functools
+import hashlib
+import os
+import pickle
+import sys
+from typing import Any
+
+from .error import Diagnostic, report_diagnostics
+
+def get_cache_directory() -> None | str:
+    # PLPC_CACHE_DIR overrides the location. Setting it to an empty string disables caching.
+    directory = os.environ.get('PLPC_CACHE_DIR')
+    if directory is None:
+        user_cache = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(user_cache, 'plpc')
+    elif directory == '':
+        return None
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return None
+
+    return directory
+
+# Modules the cached typed syntax trees depend on: the frontend, the format of the entries
+# (cache.py), and visitor.py, whose child fields of every node class are used to walk cached trees
+FRONTEND_MODULES = ('ast.py', 'cache.py', 'error.py', 'lexer.py', 'parser.py', 'symboltable.py',
+                    'typechecker.py', 'visitor.py')
+
+@functools.cache
+def get_compiler_version(modules: None | tuple[str, ...] = None) -> str:
+    # Hash of the compiler's source code (or of some of its modules), so that any change to the
+    # compiler invalidates the cache
+    compiler_hash = hashlib.sha256()
+    package_directory = os.path.dirname(os.path.abspath(__file__))
+    for file_name in sorted(os.listdir(package_directory)):
+        if file_name.endswith('.py') and (modules is None or file_name in modules):
+            with open(os.path.join(package_directory, file_name), 'rb') as f:
+                compiler_hash.update(file_name.encode())
+                compiler_hash.update(f.read())
+
+    return compiler_hash.hexdigest()
+
+@dataclass
+class BuildCacheEntry:
+    output: Any # Exported assembly or typed syntax tree
+    diagnostics: list[Diagnostic]
+
+class BuildCache:
+    def __init__(self, directory: str, max_size: int, version: None | str = None) -> None:
+        self.directory = directory # Where entries are stored
+        self.max_size = max_size   # Maximum size of all entries, in bytes
+        self.version = version or get_compiler_version()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0 # Bytes stored and not yet added to the size in the index file
+
+    @staticmethod
+    def create_default(max_size: int,
+                       name: str = 'build',
+                       version: None | str = None) -> None | BuildCache:
+
+        cache_directory = get_cache_directory()
+        if cache_directory is None:
+            return None
+
+        return BuildCache(os.path.join(cache_directory, name), max_size, version)
+
+    def get_key(self, source: str, *options: object) -> str:
+        key_hash = hashlib.sha256()
+        key_hash.update(self.version.encode())
+        key_hash.update(f'{options}\n'.encode())
+        key_hash.update(source.encode('utf-8'))
+        return key_hash.hexdigest()
+
+    def get_entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def lookup(self, key: str) -> None | BuildCacheEntry:
+        entry_path = self.get_entry_path(key)
+
+        entry: None | BuildCacheEntry
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+
+            if not isinstance(entry, BuildCacheEntry):
+                entry = None
+            else:
+                os.utime(entry_path) # Mark as recently used
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError,
+                pickle.UnpicklingError):
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    # Reports the diagnostics of a cached compilation, and returns its output (None on cache miss).
+    # The same source may have been compiled under another path.
+    def replay(self, key: str, file_path: str) -> Any:
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+
+        report_diagnostics([
+            diagnostic if diagnostic.file_path is None else replace(diagnostic, file_path=file_path)
+            for diagnostic in entry.diagnostics
+        ])
+        return entry.output
+
+    def store(self, key: str, entry: BuildCacheEntry) -> None:
+        entry_path = self.get_entry_path(key)
+        temporary_path = f'{entry_path}.{os.getpid()}.tmp'
+
+        try:
+            # Pickling keeps objects shared between different parts of the syntax tree shared
+            data = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError):
+            return # Syntax tree too deep
+
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with open(temporary_path, 'wb') as f:
+                f.write(data)
+            os.replace(temporary_path, entry_path)
+            self.stored += len(data)
+        except OSError:
+            pass
+
+    # Estimate of the size of all entries, kept so that trimming doesn't need to scan the cache. It
+    # may be off when processes update it concurrently, and is corrected whenever the cache is
+    # scanned.
+    def get_size_path(self) -> str:
+        return os.path.join(self.directory, 'size')
+
+    def read_size(self) -> None | int:
+        try:
+            with open(self.get_size_path(), 'r', encoding='utf-8') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def write_size(self, size: int) -> None:
+        size_path = self.get_size_path()
+        temporary_path = f'{size_path}.{os.getpid()}.tmp'
+
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                f.write(str(size))
+            os.replace(temporary_path, size_path)
+        except OSError:
+            pass
+
+    def get_entries(self) -> list[tuple[os.stat_result, str]]:
+        ret = []
+        for subdirectory, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                entry_path = os.path.join(subdirectory, file_name)
+                if subdirectory == self.directory:
+                    continue # Size index, not an entry
+                try:
+                    ret.append((os.stat(entry_path), entry_path))
+                except OSError:
+                    pass # Entry removed by another process
+
+        return ret
+
+    # Evicts least recently used entries until the cache is under its maximum size. The cache is
+    # only scanned when entries were stored, and its estimated size exceeds the maximum.
+    def trim(self) -> None:
+        if self.stored == 0:
+            return
+
+        size = self.read_size()
+        stored, self.stored = self.stored, 0
+        if size is not None and size + stored <= self.max_size:
+            self.write_size(size + stored)
+            return
+
+        entries = self.get_entries()
+        total_size = sum(stat.st_size for stat, _ in entries)
+        if total_size <= self.max_size:
+            self.write_size(total_size)
+            return
+
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+        for stat, entry_path in entries:
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(entry_path)
+                total_size -= stat.st_size
+            except OSError:
+                pass
+
+        self.write_size(total_size)
+
+    def print_statistics(self) -> None:
+        entries = self.get_entries()
+        total_size = sum(stat.st_size for stat, _ in entries)
+
+        print(f'Cache directory: {self.directory}', file=sys.stderr)
+        print(f'Hits: {self.hits}', file=sys.stderr)
+        print(f'Misses: {self.misses}', file=sys.stderr)
+        print(f'Entries: {len(entries)}', file=sys.stderr)
+        print(f'Size: {total_size / 2 ** 20:.2f} / {self.max_size / 2 ** 20:.2f} MiB',
+              file=sys.stderr)
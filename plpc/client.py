@@ -0,0 +1,99 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+# NOTE: this module must not import the compiler, to keep the startup of the client fast.
+#
+# Protocol: for each compilation, the client connects to the server and sends a JSON object with
+# the keys 'source', 'file_path', 'optimize', 'debug' and (optionally) 'short_circuit', and then
+# shuts down its side of the connection. The server responds with a JSON object with the keys
+# 'assembly' (null on failure) and 'diagnostics' (a list of objects with the fields of Diagnostic),
+# and closes the connection.
+
+import json
+import os
+import socket
+import tempfile
+
+from .error import Diagnostic, print_unlocalized_error, report_diagnostics
+from .sourcefile import read_source_file, write_assembly_file
+
+def get_default_socket_path() -> str:
+    runtime_directory = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_directory:
+        return os.path.join(runtime_directory, 'plpc.sock')
+    else:
+        return os.path.join(tempfile.gettempdir(), f'plpc-{os.getuid()}.sock')
+
+def compile_remotely(socket_path: str,
+                     source: str,
+                     file_path: str,
+                     optimize: bool,
+                     debug: bool,
+                     short_circuit: bool = False) -> tuple[None | str, list[Diagnostic]]:
+
+    request = {
+        'source': source,
+        'file_path': file_path,
+        'optimize': optimize,
+        'debug': debug,
+        'short_circuit': short_circuit
+    }
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode('utf-8'))
+        connection.shutdown(socket.SHUT_WR)
+
+        with connection.makefile('rb') as f:
+            response = json.loads(f.read())
+
+    diagnostics = [Diagnostic(**diagnostic) for diagnostic in response['diagnostics']]
+    return response['assembly'], diagnostics
+
+# Returns whether compilation was successful. Paths can be '-' for stdin / stdout.
+def compile_file_remotely(socket_path: str,
+                          input_path: str,
+                          output_path: str,
+                          optimize: bool,
+                          debug: bool,
+                          short_circuit: bool = False) -> bool:
+
+    read_result = read_source_file(input_path)
+    if read_result is None:
+        return False
+    source, human_readable_filename = read_result
+
+    try:
+        assembly_text, diagnostics = compile_remotely(socket_path,
+                                                      source,
+                                                      human_readable_filename,
+                                                      optimize,
+                                                      debug,
+                                                      short_circuit)
+    except OSError:
+        print_unlocalized_error(f'Failed to connect to compilation server: {socket_path}')
+        return False
+    except (ValueError, KeyError, TypeError):
+        print_unlocalized_error('Invalid response from compilation server')
+        return False
+
+    report_diagnostics(diagnostics)
+    if assembly_text is None:
+        return False
+
+    return write_assembly_file(output_path, assembly_text)
@@ -16,40 +16,129 @@
 #
 # -------------------------------------------------------------------------------------------------
 
+from __future__ import annotations
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+import functools
+import json
+import re
 import sys
+from typing import Iterator, Literal
+
+class SourceIndex:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.line_starts = [0] + [match.end() for match in re.finditer('\n', source)]
+
+    # Line numbers start at 1
+    def get_line_number(self, offset: int) -> int:
+        return bisect_right(self.line_starts, offset)
+
+    def get_line_bounds(self, line_number: int) -> tuple[int, int]:
+        start = self.line_starts[line_number - 1]
+        if line_number < len(self.line_starts):
+            return start, self.line_starts[line_number] - 1
+        else:
+            return start, len(self.source)
+
+# The index is built once per source, and shared by all stages of the compiler
+@functools.lru_cache(maxsize=1)
+def get_source_index(source: str) -> SourceIndex:
+    return SourceIndex(source)
+
+@dataclass
+class Diagnostic:
+    severity: Literal['error', 'warning', 'note']
+    message: str
+
+    # Location (only for localized diagnostics)
+    file_path: None | str = None
+    offset: int = 0
+    length: int = 0
+    line_number: int = 0
+    column: int = 0
+    line: str = ''
+
+    def format(self, color: bool) -> str:
+        if self.severity == 'note':
+            return f'{self.message}\n'
+
+        start_color = ('\033[93m' if self.severity == 'warning' else '\033[91m') if color else ''
+        end_color = '\033[0m' if color else ''
+        header = f'{start_color}{self.severity}{end_color}: {self.message}'
+
+        if self.file_path is None:
+            return f'{header}\n'
+
+        error_location = f'{self.file_path}:{self.line_number}:{self.column}'
+        error_underline = \
+            ' ' * (self.column - 1) + start_color + '^' + '~' * (self.length - 1) + end_color
+
+        return f'{error_location}: {header}\n' \
+            f'{self.line_number: 6d} | {self.line}\n' \
+            f'         {error_underline}\n\n'
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+# Diagnostics are collected in the innermost buffer (see collect_diagnostics), or written to stderr
+# when there's none
+__buffer: ContextVar[None | list[Diagnostic]] = ContextVar('diagnostics', default=None)
+__json_lines = False # pylint: disable=invalid-name
+
+def configure_diagnostics(json_lines: bool) -> None:
+    global __json_lines
+    __json_lines = json_lines
+
+@functools.cache
+def __use_color() -> bool:
+    return sys.stderr.isatty()
+
+def format_diagnostics(diagnostics: list[Diagnostic]) -> str:
+    if __json_lines:
+        return ''.join(diagnostic.to_json() + '\n' for diagnostic in diagnostics)
+    else:
+        color = __use_color()
+        return ''.join(diagnostic.format(color) for diagnostic in diagnostics)
+
+def report_diagnostics(diagnostics: list[Diagnostic]) -> None:
+    buffer = __buffer.get()
+    if buffer is not None:
+        buffer.extend(diagnostics)
+    elif len(diagnostics) > 0:
+        sys.stderr.write(format_diagnostics(diagnostics))
+
+@contextmanager
+def collect_diagnostics() -> Iterator[list[Diagnostic]]:
+    diagnostics: list[Diagnostic] = []
+    token = __buffer.set(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        __buffer.reset(token)
 
 def print_error(file_path: str,
                 source: str,
                 error_message: str,
-                line_number: int,
                 start: int,
                 length: int,
                 warning: bool = False) -> None:
 
     # Error position data
-    line_start = source.rfind('\n', 0, start) + 1
-    if line_start == 0:
-        line_start = 0
-
-    line_end = source.find('\n', start)
-    if line_end == -1:
-        line_end = len(source)
-
-    relative_start = start - line_start
-    length = min(length, line_end - start)
-
-    # Pretty print error
-    color = '\033[93m' if warning else '\033[91m'
-    error_type = 'warning' if warning else 'error'
-    line = source[line_start:line_end]
-    error_location = f'{file_path}:{line_number}:{relative_start + 1}'
-    error_underline = ' ' * relative_start + color + '^' + '~' * (length - 1) + '\033[0m'
+    source_index = get_source_index(source)
+    line_number = source_index.get_line_number(start)
+    line_start, line_end = source_index.get_line_bounds(line_number)
 
-    print(f'{error_location}: {color}{error_type}\033[0m: {error_message}', file=sys.stderr)
-    print(f'{line_number: 6d} | {line}', file=sys.stderr)
-    print(f'         {error_underline}\n', file=sys.stderr)
+    report_diagnostics([Diagnostic('warning' if warning else 'error',
+                                   error_message,
+                                   file_path,
+                                   start,
+                                   min(length, line_end - start),
+                                   line_number,
+                                   start - line_start + 1,
+                                   source[line_start:line_end])])
 
 def print_unlocalized_error(error_message: str, warning: bool = False) -> None:
-    color = '\033[93m' if warning else '\033[91m'
-    error_type = 'warning' if warning else 'error'
-    print(f'{color}{error_type}\033[0m: {error_message}', file=sys.stderr)
+    report_diagnostics([Diagnostic('warning' if warning else 'error', error_message)])
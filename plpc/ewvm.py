@@ -17,14 +17,14 @@
 # -------------------------------------------------------------------------------------------------
 
 from __future__ import annotations
+from functools import partial
 from itertools import chain
-from typing import Any, get_args
+from typing import Any, Callable, get_args
 
 # pylint: disable-next=wildcard-import,unused-wildcard-import
 from .ast import *
 from .error import print_unlocalized_error
 from .typechecker import TypeChecker
-from .symboltable import SymbolTable
 
 class EWVMError(Exception):
     pass
@@ -106,6 +106,24 @@ class Comment:
 
 EWVMProgram = list[Label | EWVMStatement | Comment]
 
+# Pending work while generating statements: statements, code to output, or functions that output
+# code and may return more work
+StatementWork = Statement | Label | EWVMStatement | Comment | Callable[[], None | list[Any]]
+
+# Case statements with fewer labels than this are compiled to a chain of comparisons. Others are
+# compiled to a binary search, if all their labels are ordinal.
+CASE_SEARCH_MIN_LABELS = 4
+
+# Comparisons that are true exactly when others are false. Real comparisons aren't inverted.
+INVERTED_COMPARISONS: dict[str, BinaryOperator] = {
+    '=': '<>',
+    '<>': '=',
+    '<': '>=',
+    '>': '<=',
+    '<=': '>',
+    '>=': '<'
+}
+
 def export_assembly(program: EWVMProgram) -> str:
     return '\n'.join(str(e) for e in program)
 
@@ -122,7 +140,9 @@ class LabelGenerator:
         return Label.system(self.call, self.__count)
 
 class _EWVMCodeGenerator:
-    def __init__(self) -> None:
+    def __init__(self, optimize: bool = False, short_circuit: bool = False) -> None:
+        self.optimize = optimize
+        self.short_circuit = short_circuit # Skip the right operand of and / or when possible
         self.program: EWVMProgram = []
         self.label_generator = LabelGenerator(None)
         self.callable: None | CallableDefinition = None
@@ -146,12 +166,7 @@ class _EWVMCodeGenerator:
                                               scope_offset: int) -> None:
 
         if isinstance(variable_type, ArrayType):
-            # Determine size of array
-            array_size = 1
-            for index_type in variable_type.dimensions:
-                start = self.type_checker.get_constant_ordinal_value(index_type.start)
-                end = self.type_checker.get_constant_ordinal_value(index_type.end)
-                array_size *= end - start + 1
+            array_size = variable_type.size
 
             # Create array in heap
             self.program.append(EWVMStatement('ALLOC', array_size))
@@ -206,12 +221,7 @@ class _EWVMCodeGenerator:
                 )
                 self.program.append(EWVMStatement('SUB'))
 
-                element_size = 1
-                for range_type in current_type.dimensions[1:]:
-                    start = self.type_checker.get_constant_ordinal_value(range_type.start)
-                    end = self.type_checker.get_constant_ordinal_value(range_type.end)
-                    element_size *= end - start + 1
-
+                element_size = current_type.strides[0]
                 if element_size != 1:
                     self.program.append(EWVMStatement('PUSHI', element_size))
                     self.program.append(EWVMStatement('MUL'))
@@ -240,67 +250,161 @@ class _EWVMCodeGenerator:
             self.program.append(EWVMStatement('SUB'))
             self.program.append(EWVMStatement('CHARAT'))
 
+    def get_binary_operation_instructions(self, expression: Expression) -> list[EWVMStatement]:
+        assert isinstance(expression[0], BinaryOperation)
+        any_real = BuiltInType.REAL in [expression[0].left[1], expression[0].right[1]]
+
+        instruction: str
+        if expression[0].operator == '+':
+            instruction = 'FADD' if expression[1] == BuiltInType.REAL else 'ADD'
+        elif expression[0].operator == '-':
+            instruction = 'FSUB' if expression[1] == BuiltInType.REAL else 'SUB'
+        elif expression[0].operator == '*':
+            instruction = 'FMUL' if expression[1] == BuiltInType.REAL else 'MUL'
+        elif expression[0].operator == '/':
+            instruction = 'FDIV'
+        elif expression[0].operator in ['div', 'mod', 'and', 'or']:
+            instruction = expression[0].operator.upper()
+        elif expression[0].operator in ['=', '<>']:
+            instruction = 'EQUAL'
+        elif expression[0].operator == '<':
+            instruction = 'FINF' if any_real else 'INF'
+        elif expression[0].operator == '>':
+            instruction = 'FSUB' if any_real else 'SUP'
+        elif expression[0].operator == '<=':
+            instruction = 'FINFEQ' if any_real else 'INFEQ'
+        elif expression[0].operator == '>=':
+            instruction = 'FSUPEQ' if any_real else 'SUPEQ'
+
+        if expression[0].operator == '<>':
+            return [EWVMStatement(instruction), EWVMStatement('NOT')]
+        else:
+            return [EWVMStatement(instruction)]
+
     def generate_expression_assembly(self, expression: Expression) -> None:
-        if isinstance(expression[0], get_args(ConstantValue)):
-            if isinstance(expression[0], str) and \
-                len(expression[0]) == 1 and \
-                expression[1] == BuiltInType.STRING:
+        # Explicit stack of operands to generate, and of instructions to output after them, so that
+        # long chains of operations don't exhaust Python's stack
+        stack: list[Expression | EWVMStatement] = [expression]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, EWVMStatement):
+                self.program.append(item)
+                continue
+
+            expression = item
+            if isinstance(expression[0], get_args(ConstantValue)):
+                if isinstance(expression[0], str) and \
+                    len(expression[0]) == 1 and \
+                    expression[1] == BuiltInType.STRING:
+
+                    self.program.append(EWVMStatement('PUSHS', expression[0]))
+                else:
+                    self.generate_constant_assembly(expression[0])
+            elif isinstance(expression[0], VariableUsage):
+                self.generate_variable_usage_assembly(expression[0], False)
+            elif isinstance(expression[0], CallableCall):
+                self.generate_callable_call_assembly(expression[0])
+            elif isinstance(expression[0], UnaryOperation):
+                if expression[0].operator == '-':
+                    if expression[0].sub[1] == BuiltInType.REAL:
+                        self.program.append(EWVMStatement('PUSHF', 0.0))
+                    else:
+                        self.program.append(EWVMStatement('PUSHI', 0))
+
+                    stack.append(EWVMStatement(
+                        'FSUB' if expression[0].sub[1] == BuiltInType.REAL else 'SUB'
+                    ))
+                    stack.append(expression[0].sub)
+
+                elif expression[0].operator == 'not':
+                    stack.append(EWVMStatement('NOT'))
+                    stack.append(expression[0].sub)
+
+            elif isinstance(expression[0], BinaryOperation):
+                stack.extend(reversed(self.get_binary_operation_instructions(expression)))
+                stack.append(expression[0].right)
+                stack.append(expression[0].left)
+
+    # Outputs code that jumps to label when a condition evaluates to jump_when, and falls through
+    # otherwise. With short-circuit evaluation, and / or are lowered to jumps, so that the right
+    # operand isn't evaluated when the left one already decides the result.
+    def generate_condition_assembly(self,
+                                    condition: Expression,
+                                    label: Label,
+                                    jump_when: bool = False) -> None:
+
+        # Explicit stack, like in generate_expression_assembly
+        stack: list[tuple[Expression, Label, bool] | Label] = [(condition, label, jump_when)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, Label):
+                self.program.append(item)
+                continue
+
+            condition, label, jump_when = item
+            operation = condition[0]
+            if self.short_circuit and \
+                isinstance(operation, UnaryOperation) and \
+                operation.operator == 'not':
+
+                stack.append((operation.sub, label, not jump_when))
+
+            elif self.short_circuit and \
+                isinstance(operation, BinaryOperation) and \
+                operation.operator in ['and', 'or']:
+
+                if (operation.operator == 'or') == jump_when:
+                    # Either operand alone can cause the jump
+                    stack.append((operation.right, label, jump_when))
+                    stack.append((operation.left, label, jump_when))
+                else:
+                    # The left operand can skip the right one
+                    skip_label = self.label_generator.new()
+                    stack.append(skip_label)
+                    stack.append((operation.right, label, jump_when))
+                    stack.append((operation.left, skip_label, not jump_when))
 
-                self.program.append(EWVMStatement('PUSHS', expression[0]))
             else:
-                self.generate_constant_assembly(expression[0])
-        elif isinstance(expression[0], VariableUsage):
-            self.generate_variable_usage_assembly(expression[0], False)
-        elif isinstance(expression[0], CallableCall):
-            self.generate_callable_call_assembly(expression[0])
-        elif isinstance(expression[0], UnaryOperation):
-            if expression[0].operator == '-':
-                if expression[0].sub[1] == BuiltInType.REAL:
-                    self.program.append(EWVMStatement('PUSHF', 0.0))
-                else:
-                    self.program.append(EWVMStatement('PUSHI', 0))
+                condition, jump_when = self.get_condition_leaf(condition, jump_when)
+                self.generate_expression_assembly(condition)
+                if jump_when:
+                    self.program.append(EWVMStatement('NOT'))
+                self.program.append(EWVMStatement('JZ', label))
 
-                self.generate_expression_assembly(expression[0].sub)
+    # Condition to evaluate when jumping on a condition being jump_when, without a condition lowered
+    # to jumps. When optimizing, not is removed and comparisons are inverted, to avoid a NOT.
+    def get_condition_leaf(self, condition: Expression, jump_when: bool) -> tuple[Expression, bool]:
+        if not self.optimize:
+            return condition, jump_when
 
-                self.program.append(
-                    EWVMStatement('FSUB' if expression[0].sub[1] == BuiltInType.REAL else 'SUB')
-                )
+        while isinstance(condition[0], UnaryOperation) and condition[0].operator == 'not':
+            condition = condition[0].sub
+            jump_when = not jump_when
+
+        operation = condition[0]
+        if jump_when and \
+            isinstance(operation, BinaryOperation) and \
+            operation.operator in INVERTED_COMPARISONS and \
+            BuiltInType.REAL not in [operation.left[1], operation.right[1]]:
+
+            inverted = BinaryOperation(INVERTED_COMPARISONS[operation.operator],
+                                       operation.left,
+                                       operation.right)
+            return (inverted, condition[1]), False
+
+        return condition, jump_when
+
+    # Whether jumping on a condition being jump_when requires a NOT
+    def condition_needs_not(self, condition: Expression, jump_when: bool) -> bool:
+        condition, jump_when = self.get_condition_leaf(condition, jump_when)
+        operation = condition[0]
+        if self.short_circuit and \
+            isinstance(operation, (UnaryOperation, BinaryOperation)) and \
+            operation.operator in ['not', 'and', 'or']:
+
+            return False # Lowered to jumps
 
-            elif expression[0].operator == 'not':
-                self.generate_expression_assembly(expression[0].sub)
-                self.program.append(EWVMStatement('NOT'))
-
-        elif isinstance(expression[0], BinaryOperation):
-            self.generate_expression_assembly(expression[0].left)
-            self.generate_expression_assembly(expression[0].right)
-
-            any_real = BuiltInType.REAL in [expression[0].left[1], expression[0].right[1]]
-
-            instruction: str
-            if expression[0].operator == '+':
-                instruction = 'FADD' if expression[1] == BuiltInType.REAL else 'ADD'
-            elif expression[0].operator == '-':
-                instruction = 'FSUB' if expression[1] == BuiltInType.REAL else 'SUB'
-            elif expression[0].operator == '*':
-                instruction = 'FMUL' if expression[1] == BuiltInType.REAL else 'MUL'
-            elif expression[0].operator == '/':
-                instruction = 'FDIV'
-            elif expression[0].operator in ['div', 'mod', 'and', 'or']:
-                instruction = expression[0].operator.upper()
-            elif expression[0].operator in ['=', '<>']:
-                instruction = 'EQUAL'
-            elif expression[0].operator == '<':
-                instruction = 'FINF' if any_real else 'INF'
-            elif expression[0].operator == '>':
-                instruction = 'FSUB' if any_real else 'SUP'
-            elif expression[0].operator == '<=':
-                instruction = 'FINFEQ' if any_real else 'INFEQ'
-            elif expression[0].operator == '>=':
-                instruction = 'FSUPEQ' if any_real else 'SUPEQ'
-
-            self.program.append(EWVMStatement(instruction))
-            if expression[0].operator == '<>':
-                self.program.append(EWVMStatement('NOT'))
+        return jump_when or (isinstance(operation, BinaryOperation) and operation.operator == '<>')
 
     def generate_builtin_callable_assembly(self, call: CallableCall) -> None:
         name = call.callable.name.lower()
@@ -368,8 +472,12 @@ class _EWVMCodeGenerator:
                     self.program.append(EWVMStatement('DUP', 2))
                     self.program.append(EWVMStatement('STRLEN'))
                     self.program.append(EWVMStatement('PUSHI', 1))
-                    self.program.append(EWVMStatement('EQUAL'))
-                    self.program.append(EWVMStatement('NOT'))
+                    if self.optimize:
+                        # The length minus 1 is 0 (jump) for a single character, without a NOT
+                        self.program.append(EWVMStatement('SUB'))
+                    else:
+                        self.program.append(EWVMStatement('EQUAL'))
+                        self.program.append(EWVMStatement('NOT'))
                     self.program.append(EWVMStatement('JZ', end_label))
                     self.program.append(EWVMStatement('ERR', 'More than one character written'))
                     self.program.append(end_label)
@@ -387,7 +495,7 @@ class _EWVMCodeGenerator:
             self.program.append(EWVMStatement('STRLEN'))
 
     def generate_callable_call_assembly(self, call: CallableCall) -> None:
-        if call.callable.name.lower() in SymbolTable('', None).scopes[0]:
+        if call.builtin:
             self.generate_builtin_callable_assembly(call)
         else:
             if call.callable.return_variable is not None:
@@ -407,6 +515,21 @@ class _EWVMCodeGenerator:
                 self.program.append(EWVMStatement('POP', total_pops))
 
     def generate_statement_assembly(self, statement: Statement) -> None:
+        # Explicit stack, so that deeply nested statements don't exhaust Python's stack. Work is
+        # done in the same order as a recursive traversal, so labels are numbered the same way.
+        stack: list[StatementWork] = [statement]
+        while stack:
+            work = stack.pop()
+            if isinstance(work, tuple):
+                stack.extend(reversed(self.expand_statement(work)))
+            elif isinstance(work, (Label, EWVMStatement, Comment)):
+                self.program.append(work)
+            else:
+                stack.extend(reversed(work() or []))
+
+    # Outputs the code that comes before a statement's first substatement, and returns what comes
+    # after it
+    def expand_statement(self, statement: Statement) -> list[StatementWork]:
         # Statement label
         if statement[1] is not None:
             self.program.append(Label.user(self.callable, statement[1].name))
@@ -432,22 +555,34 @@ class _EWVMCodeGenerator:
 
         # BeginEndStatement
         elif isinstance(statement[0], list):
-            for s in statement[0]:
-                self.generate_statement_assembly(s)
+            return list(statement[0])
 
         # IF
         elif isinstance(statement[0], IfStatement):
-            else_label = self.label_generator.new()
+            second_label = self.label_generator.new()
             end_label = self.label_generator.new()
 
             self.program.append(Comment('IF'))
-            self.generate_expression_assembly(statement[0].condition)
-            self.program.append(EWVMStatement('JZ', else_label))
-            self.generate_statement_assembly(statement[0].when_true)
-            self.program.append(EWVMStatement('JUMP', end_label))
-            self.program.append(else_label)
-            self.generate_statement_assembly(statement[0].when_false)
-            self.program.append(end_label)
+
+            # Swap the branches when that avoids a NOT (e.g., on <>). The else branch then falls
+            # through, and jumps over the then branch.
+            condition = statement[0].condition
+            first, second = statement[0].when_true, statement[0].when_false
+            swap = self.optimize and \
+                second[0] != [] and \
+                self.condition_needs_not(condition, False) and \
+                not self.condition_needs_not(condition, True)
+            if swap:
+                first, second = second, first
+
+            self.generate_condition_assembly(condition, second_label, swap)
+            return [
+                first,
+                EWVMStatement('JUMP', end_label),
+                second_label,
+                second,
+                end_label
+            ]
 
         # REPEAT
         elif isinstance(statement[0], RepeatStatement):
@@ -455,9 +590,10 @@ class _EWVMCodeGenerator:
 
             self.program.append(Comment('REPEAT'))
             self.program.append(start_label)
-            self.generate_statement_assembly((statement[0].body, None))
-            self.generate_expression_assembly(statement[0].condition)
-            self.program.append(EWVMStatement('JZ', start_label))
+            return [
+                (statement[0].body, None),
+                partial(self.generate_condition_assembly, statement[0].condition, start_label)
+            ]
 
         # WHILE
         elif isinstance(statement[0], WhileStatement):
@@ -465,12 +601,22 @@ class _EWVMCodeGenerator:
             end_label = self.label_generator.new()
 
             self.program.append(Comment('WHILE'))
+
+            # Rotate the loop, checking the condition at its end, when jumping back to the body
+            # doesn't require a NOT (e.g., on <>). Each iteration then runs a single jump.
+            condition = statement[0].condition
+            if self.optimize and not self.condition_needs_not(condition, True):
+                self.program.append(EWVMStatement('JUMP', end_label))
+                self.program.append(start_label)
+                return [
+                    statement[0].body,
+                    end_label,
+                    partial(self.generate_condition_assembly, condition, start_label, True)
+                ]
+
             self.program.append(start_label)
-            self.generate_expression_assembly(statement[0].condition)
-            self.program.append(EWVMStatement('JZ', end_label))
-            self.generate_statement_assembly(statement[0].body)
-            self.program.append(EWVMStatement('JUMP', start_label))
-            self.program.append(end_label)
+            self.generate_condition_assembly(condition, end_label)
+            return [statement[0].body, EWVMStatement('JUMP', start_label), end_label]
 
         # FOR
         elif isinstance(statement[0], ForStatement):
@@ -495,18 +641,15 @@ class _EWVMCodeGenerator:
                 self.program.append(EWVMStatement('INFEQ'))
             self.program.append(EWVMStatement('JZ', end_label))
 
-            self.generate_statement_assembly(statement[0].body)
-
-            self.program.append(EWVMStatement('PUSHI', 1))
-            if statement[0].direction == 'to':
-                self.program.append(EWVMStatement('ADD'))
-            elif statement[0].direction == 'downto':
-                self.program.append(EWVMStatement('SUB'))
-            self.program.append(EWVMStatement('JUMP', start_label))
-
-            self.program.append(EWVMStatement('JZ', start_label))
-            self.program.append(end_label)
-            self.program.append(EWVMStatement('POP', 2))
+            return [
+                statement[0].body,
+                EWVMStatement('PUSHI', 1),
+                EWVMStatement('ADD' if statement[0].direction == 'to' else 'SUB'),
+                EWVMStatement('JUMP', start_label),
+                EWVMStatement('JZ', start_label),
+                end_label,
+                EWVMStatement('POP', 2)
+            ]
 
         # CASE
         elif isinstance(statement[0], CaseStatement):
@@ -515,29 +658,119 @@ class _EWVMCodeGenerator:
 
             end_label = self.label_generator.new()
 
-            for element in statement[0].elements:
-                self.program.append(EWVMStatement('PUSHI', 0))
-
-                element_end_label = self.label_generator.new()
-
-                for label_value in element.labels:
-                    self.program.append(EWVMStatement('PUSHSP'))
-                    self.program.append(EWVMStatement('LOAD', -1))
-                    self.generate_constant_assembly(label_value)
-                    self.program.append(EWVMStatement('EQUAL'))
-                    self.program.append(EWVMStatement('OR'))
-
-                self.program.append(EWVMStatement('JZ', element_end_label))
-
-                # Statement body
-                self.program.append(EWVMStatement('POP', 1))
-                self.generate_statement_assembly(element.body)
-                self.program.append(EWVMStatement('JUMP', end_label))
-                self.program.append(element_end_label)
-
-            self.program.append(EWVMStatement('POP', 1))
-            self.program.append(EWVMStatement('ERR', 'Case expression did not match'))
-            self.program.append(end_label)
+            labels = [label for element in statement[0].elements for label in element.labels]
+            ordinals = [get_constant_ordinal_value(label) for label in labels]
+            if self.optimize and len(labels) >= CASE_SEARCH_MIN_LABELS and None not in ordinals:
+                return self.expand_case_search(statement[0], end_label)
+
+            # Elements are expanded one at a time, as their labels are only generated after the
+            # previous element's body
+            return [
+                *(partial(self.expand_case_element, element, end_label)
+                  for element in statement[0].elements),
+                EWVMStatement('POP', 1),
+                EWVMStatement('ERR', 'Case expression did not match'),
+                end_label
+            ]
+
+        return []
+
+    def expand_case_element(self, element: CaseElement, end_label: Label) -> list[StatementWork]:
+        self.program.append(EWVMStatement('PUSHI', 0))
+
+        element_end_label = self.label_generator.new()
+
+        for label_value in element.labels:
+            self.program.append(EWVMStatement('PUSHSP'))
+            self.program.append(EWVMStatement('LOAD', -1))
+            self.generate_constant_assembly(label_value)
+            self.program.append(EWVMStatement('EQUAL'))
+            self.program.append(EWVMStatement('OR'))
+
+        self.program.append(EWVMStatement('JZ', element_end_label))
+
+        # Statement body
+        self.program.append(EWVMStatement('POP', 1))
+        return [element.body, EWVMStatement('JUMP', end_label), element_end_label]
+
+    # Case statement whose labels are all ordinal. Consecutive labels of the same element are merged
+    # into ranges, and a balanced binary search over these ranges jumps to the matching element.
+    def expand_case_search(self, statement: CaseStatement, end_label: Label) -> list[StatementWork]:
+        no_match_label = self.label_generator.new()
+        element_labels = [self.label_generator.new() for _ in statement.elements]
+
+        # Like in a chain of comparisons, the first element with a repeated label is chosen
+        ordinal_elements: dict[int, int] = {}
+        for i, element in enumerate(statement.elements):
+            for label in element.labels:
+                ordinal = get_constant_ordinal_value(label)
+                assert ordinal is not None
+                ordinal_elements.setdefault(ordinal, i)
+
+        ranges: list[tuple[int, int, int]] = [] # First and last ordinal, element index
+        for ordinal, i in sorted(ordinal_elements.items()):
+            if ranges and ranges[-1][1] == ordinal - 1 and ranges[-1][2] == i:
+                ranges[-1] = (ranges[-1][0], ordinal, i)
+            else:
+                ranges.append((ordinal, ordinal, i))
+
+        # Ranges to search, and the bounds the value is already known to be within
+        search_stack: list[tuple[int, int, None | int, None | int] | Label] = \
+            [(0, len(ranges), None, None)]
+        while search_stack:
+            item = search_stack.pop()
+            if isinstance(item, Label):
+                self.program.append(item)
+                continue
+
+            start, end, low, high = item
+            if end - start == 1:
+                first, last, i = ranges[start]
+                checks = []
+                if first == last and low != first and high != last:
+                    checks.append((first, 'EQUAL'))
+                else:
+                    if low != first:
+                        checks.append((first, 'SUPEQ'))
+                    if high != last:
+                        checks.append((last, 'INFEQ'))
+
+                for ordinal, instruction in checks:
+                    self.program.append(EWVMStatement('DUP', 1))
+                    self.program.append(EWVMStatement('PUSHI', ordinal))
+                    self.program.append(EWVMStatement(instruction))
+                    self.program.append(EWVMStatement('JZ', no_match_label))
+                self.program.append(EWVMStatement('JUMP', element_labels[i]))
+            else:
+                middle = (start + end) // 2
+                pivot = ranges[middle][0]
+                right_label = self.label_generator.new()
+
+                self.program.append(EWVMStatement('DUP', 1))
+                self.program.append(EWVMStatement('PUSHI', pivot))
+                self.program.append(EWVMStatement('INF'))
+                self.program.append(EWVMStatement('JZ', right_label))
+
+                search_stack.append((middle, end, pivot, high))
+                search_stack.append(right_label)
+                search_stack.append((start, middle, low, pivot - 1))
+
+        ret: list[StatementWork] = []
+        for element_label, element in zip(element_labels, statement.elements):
+            ret.extend([
+                element_label,
+                EWVMStatement('POP', 1),
+                element.body,
+                EWVMStatement('JUMP', end_label)
+            ])
+
+        return [
+            *ret,
+            no_match_label,
+            EWVMStatement('POP', 1),
+            EWVMStatement('ERR', 'Case expression did not match'),
+            end_label
+        ]
 
     def generate_block_assembly(self, block: Block) -> None:
         # Block start
@@ -597,5 +830,8 @@ class _EWVMCodeGenerator:
 
         return self.program
 
-def generate_ewvm_code(program: Program) -> EWVMProgram:
-    return _EWVMCodeGenerator().generate_program_assembly(program)
+def generate_ewvm_code(program: Program,
+                       optimize: bool = False,
+                       short_circuit: bool = False) -> EWVMProgram:
+
+    return _EWVMCodeGenerator(optimize, short_circuit).generate_program_assembly(program)
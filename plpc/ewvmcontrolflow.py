@@ -0,0 +1,130 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from .ewvm import Comment, EWVMProgram, EWVMStatement, Label
+
+# Instructions after which execution never continues to the next one
+UNCONDITIONAL_INSTRUCTIONS = ('JUMP', 'STOP', 'ERR', 'RETURN')
+
+def __get_jump_target(statement: Label | EWVMStatement | Comment) -> None | Label:
+    if isinstance(statement, EWVMStatement) and statement.instruction in ('JUMP', 'JZ'):
+        target = statement.arguments[0]
+        if isinstance(target, Label):
+            return target
+
+    return None
+
+# Names of the labels right before (direction = -1) or after (direction = 1) the instruction at
+# index i, ignoring comments
+def __get_adjacent_labels(program: EWVMProgram, i: int, direction: int) -> set[str]:
+    ret = set()
+    i += direction
+    while 0 <= i < len(program) and isinstance(program[i], (Label, Comment)):
+        statement = program[i]
+        if isinstance(statement, Label):
+            ret.add(statement.name)
+        i += direction
+
+    return ret
+
+# Jumps to a label followed by a JUMP go straight to that JUMP's target
+def __thread_jumps(program: EWVMProgram) -> bool:
+    label_jumps: dict[str, Label] = {}
+    for i, statement in enumerate(program):
+        target = __get_jump_target(statement)
+        if target is not None and isinstance(statement, EWVMStatement) and \
+            statement.instruction == 'JUMP':
+
+            for name in __get_adjacent_labels(program, i, -1):
+                label_jumps[name] = target
+
+    changed = False
+    for i, statement in enumerate(program):
+        original_target = __get_jump_target(statement)
+        if original_target is None:
+            continue
+        assert isinstance(statement, EWVMStatement)
+
+        target = original_target
+        visited = {target.name}
+        while target.name in label_jumps:
+            target = label_jumps[target.name]
+            if target.name in visited:
+                break # Infinite loop
+            visited.add(target.name)
+        else:
+            if target is not original_target:
+                program[i] = EWVMStatement(statement.instruction, target)
+                changed = True
+
+    return changed
+
+# Removes jumps to the label right after them
+def __remove_jumps_to_next(program: EWVMProgram) -> bool:
+    ret: EWVMProgram = []
+    changed = False
+    for i, statement in enumerate(program):
+        target = __get_jump_target(statement)
+        if target is not None and target.name in __get_adjacent_labels(program, i, 1):
+            # The condition of JZ must still be popped
+            assert isinstance(statement, EWVMStatement)
+            if statement.instruction == 'JZ':
+                ret.append(EWVMStatement('POP', 1))
+            changed = True
+        else:
+            ret.append(statement)
+
+    program[:] = ret
+    return changed
+
+# Removes unreferenced compiler labels, and instructions that can't be reached
+def __remove_unreachable_code(program: EWVMProgram) -> bool:
+    referenced = {argument.name
+                  for statement in program if isinstance(statement, EWVMStatement)
+                  for argument in statement.arguments if isinstance(argument, Label)}
+
+    ret: EWVMProgram = []
+    reachable = True
+    for statement in program:
+        if isinstance(statement, Label):
+            # Other labels are kept, as they may be reached in ways that aren't tracked
+            if statement.name in referenced or not statement.name.startswith('SYS'):
+                ret.append(statement)
+                reachable = True
+        elif reachable:
+            ret.append(statement)
+            if isinstance(statement, EWVMStatement) and \
+                statement.instruction in UNCONDITIONAL_INSTRUCTIONS:
+
+                reachable = False
+
+    changed = len(ret) != len(program)
+    program[:] = ret
+    return changed
+
+def apply_ewvm_control_flow_cleanup(program: EWVMProgram) -> EWVMProgram:
+    program = list(program)
+
+    # Each step may allow the others to do more (e.g., removing code may leave labels unreferenced)
+    changed = True
+    while changed:
+        changed = __thread_jumps(program)
+        changed = __remove_jumps_to_next(program) or changed
+        changed = __remove_unreachable_code(program) or changed
+
+    return program
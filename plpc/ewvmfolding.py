@@ -0,0 +1,218 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from dataclasses import dataclass
+import operator
+from typing import Callable
+
+from .ewvm import Comment, EWVMProgram, EWVMStatement
+
+# Integer constants are only folded when the result fits in 32 bits, like the EWVM's integers
+INTEGER_RANGE = range(-2 ** 31, 2 ** 31)
+
+INTEGER_OPERATIONS: dict[str, Callable[[int, int], None | int]] = {
+    'ADD': operator.add,
+    'SUB': operator.sub,
+    'MUL': operator.mul,
+    'DIV': lambda a, b: a // b if a >= 0 and b > 0 else None,
+    'MOD': lambda a, b: a % b if a >= 0 and b > 0 else None,
+    'EQUAL': lambda a, b: int(a == b),
+    'INF': lambda a, b: int(a < b),
+    'INFEQ': lambda a, b: int(a <= b),
+    'SUP': lambda a, b: int(a > b),
+    'SUPEQ': lambda a, b: int(a >= b),
+    'AND': lambda a, b: a & b if {a, b} <= {0, 1} else None,
+    'OR': lambda a, b: a | b if {a, b} <= {0, 1} else None
+}
+
+# Values popped and pushed by instructions whose stack usage is known. Other instructions (and
+# labels) end the sequence of instructions being analyzed.
+STACK_EFFECTS: dict[str, tuple[int, int]] = {
+    **{instruction: (2, 1) for instruction in INTEGER_OPERATIONS},
+    **{instruction: (2, 1) for instruction in ['FADD', 'FSUB', 'FMUL', 'FDIV', 'FINF', 'FINFEQ',
+                                               'FSUP', 'FSUPEQ', 'PADD', 'CHARAT', 'LOADN']},
+    **{instruction: (1, 1) for instruction in ['NOT', 'LOAD', 'STRLEN', 'ATOI', 'ATOF', 'ITOF',
+                                               'FTOI', 'ALLOCN']},
+    **{instruction: (0, 1) for instruction in ['PUSHI', 'PUSHF', 'PUSHS', 'PUSHG', 'PUSHL', 'PUSHA',
+                                               'READ', 'ALLOC']},
+    **{instruction: (1, 0) for instruction in ['STOREG', 'STOREL', 'WRITEI', 'WRITEF', 'WRITES',
+                                               'WRITECHR']},
+    'STORE': (2, 0),
+    'STOREN': (3, 0),
+    'WRITELN': (0, 0),
+    'SWAP': (2, 2)
+}
+
+# What is known about each value on the stack
+
+@dataclass
+class _Constant:
+    value: int
+    push: int # Index of the instruction that pushes it
+
+@dataclass
+class _Negation: # PUSHI 0; <expression>; SUB
+    zero: int
+    operation: int
+
+@dataclass
+class _Offset: # <expression>; PUSHI constant; ADD / SUB
+    value: int
+    push: int
+    operation: int
+
+_StackValue = None | _Constant | _Negation | _Offset
+
+class _ConstantFolder:
+    def __init__(self, program: EWVMProgram) -> None:
+        self.program = program
+        self.replaced: dict[int, None | EWVMStatement] = {} # None when removed
+        self.stack: list[_StackValue] = []
+
+    def pop(self) -> _StackValue:
+        # Values pushed before the analyzed instructions are unknown
+        return self.stack.pop() if self.stack else None
+
+    def replace(self, i: int, statement: None | EWVMStatement) -> None:
+        self.replaced[i] = statement
+
+    def fold_integer_operation(self, i: int, instruction: str) -> None:
+        right = self.pop()
+        left = self.pop()
+
+        # Constant operands
+        if isinstance(left, _Constant) and isinstance(right, _Constant):
+            result = INTEGER_OPERATIONS[instruction](left.value, right.value)
+            if result is not None and result in INTEGER_RANGE:
+                self.replace(left.push, None)
+                self.replace(right.push, None)
+                self.replace(i, EWVMStatement('PUSHI', result))
+                self.stack.append(_Constant(result, i))
+                return
+
+        # x + 0, x - 0, x * 1, x div 1
+        if isinstance(right, _Constant) and \
+            (instruction, right.value) in [('ADD', 0), ('SUB', 0), ('MUL', 1), ('DIV', 1)]:
+
+            self.replace(right.push, None)
+            self.replace(i, None)
+            self.stack.append(left)
+            return
+
+        # 0 + x, 1 * x
+        if isinstance(left, _Constant) and (instruction, left.value) in [('ADD', 0), ('MUL', 1)]:
+            self.replace(left.push, None)
+            self.replace(i, None)
+            self.stack.append(right)
+            return
+
+        if instruction in ['ADD', 'SUB']:
+            # x + a + b -> x + (a + b)
+            if isinstance(left, _Offset) and isinstance(right, _Constant):
+                offset = left.value + (right.value if instruction == 'ADD' else -right.value)
+                if offset in INTEGER_RANGE:
+                    self.replace(right.push, None)
+                    self.replace(i, None)
+
+                    if offset == 0:
+                        self.replace(left.push, None)
+                        self.replace(left.operation, None)
+                        self.stack.append(None)
+                    else:
+                        self.replace(left.push, EWVMStatement('PUSHI', offset))
+                        self.replace(left.operation, EWVMStatement('ADD'))
+                        self.stack.append(_Offset(offset, left.push, left.operation))
+                    return
+
+            if isinstance(right, _Constant):
+                offset = right.value if instruction == 'ADD' else -right.value
+                self.stack.append(_Offset(offset, right.push, i))
+                return
+
+            # x + (-y) -> x - y, x - (-y) -> x + y
+            if isinstance(right, _Negation):
+                self.replace(right.zero, None)
+                self.replace(right.operation, None)
+                self.replace(i, EWVMStatement('SUB' if instruction == 'ADD' else 'ADD'))
+                self.stack.append(None)
+                return
+
+            # -x
+            if instruction == 'SUB' and isinstance(left, _Constant) and left.value == 0:
+                self.stack.append(_Negation(left.push, i))
+                return
+
+        self.stack.append(None)
+
+    def fold(self) -> EWVMProgram:
+        for i, statement in enumerate(self.program):
+            if isinstance(statement, Comment):
+                continue
+            if not isinstance(statement, EWVMStatement):
+                self.stack.clear() # Label
+                continue
+
+            instruction = statement.instruction
+            if instruction == 'PUSHI' and isinstance(statement.arguments[0], int):
+                self.stack.append(_Constant(statement.arguments[0], i))
+
+            elif instruction in INTEGER_OPERATIONS:
+                self.fold_integer_operation(i, instruction)
+
+            elif instruction == 'NOT' and self.stack and isinstance(self.stack[-1], _Constant):
+                operand = self.stack.pop()
+                assert isinstance(operand, _Constant)
+
+                result = int(operand.value == 0)
+                self.replace(operand.push, None)
+                self.replace(i, EWVMStatement('PUSHI', result))
+                self.stack.append(_Constant(result, i))
+
+            elif instruction == 'JZ':
+                # Constant conditions: always or never jump
+                condition = self.pop()
+                if isinstance(condition, _Constant):
+                    self.replace(condition.push, None)
+                    if condition.value == 0:
+                        self.replace(i, EWVMStatement('JUMP', *statement.arguments))
+                    else:
+                        self.replace(i, None)
+                self.stack.clear()
+
+            elif instruction in STACK_EFFECTS:
+                pops, pushes = STACK_EFFECTS[instruction]
+                for _ in range(pops):
+                    self.pop()
+                self.stack.extend([None] * pushes)
+
+            else:
+                self.stack.clear()
+
+        ret: EWVMProgram = []
+        for i, statement in enumerate(self.program):
+            if i in self.replaced:
+                replacement = self.replaced[i]
+                if replacement is not None:
+                    ret.append(replacement)
+            else:
+                ret.append(statement)
+
+        return ret
+
+def apply_ewvm_constant_folding(program: EWVMProgram) -> EWVMProgram:
+    return _ConstantFolder(program).fold()
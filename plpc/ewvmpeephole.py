@@ -16,78 +16,510 @@
 #
 # -------------------------------------------------------------------------------------------------
 
-from .ewvm import EWVMProgram, EWVMStatement
-
-def __optimization_pass(program: EWVMProgram) -> EWVMProgram:
-    ret: EWVMProgram = []
-
-    i = 0
-    while i < len(program):
-        old_i = i
-
-        if isinstance(program[i], EWVMStatement) and \
-            i + 1 < len(program) and \
-            isinstance(program[i + 1], EWVMStatement):
-
-            current_statement = program[i]
-            next_statement = program[i + 1]
-            assert isinstance(current_statement, EWVMStatement)
-            assert isinstance(next_statement, EWVMStatement)
-
-            # (PUSHI 0){N} -> PUSHN N
-            if current_statement == EWVMStatement('PUSHI', 0) or \
-                current_statement == EWVMStatement('PUSHF', 0.0):
-                count = 0
-                while i + count < len(program):
-                    if program[i + count] != EWVMStatement('PUSHI', 0) and \
-                        program[i + count] != EWVMStatement('PUSHF', 0.0):
-                        break
-                    count += 1
-
-                if count == 1:
-                    ret.append(EWVMStatement('PUSHI', 0))
-                else:
-                    ret.append(EWVMStatement('PUSHN', count))
-
-                i += count
-
-            # STOREL N ; PUSHL N -> DUP 1 ; STOREL N
-            # STOREG N ; PUSHG N -> DUP 1 ; STOREG N
-            if current_statement.instruction in ['STOREL', 'STOREG']:
-                if i + 1 < len(program) and \
-                    next_statement.instruction == 'PUSH' + current_statement.instruction[-1] and \
-                    current_statement.arguments == next_statement.arguments:
-
-                    ret.append(EWVMStatement('DUP', 1))
-                    ret.append(program[i])
-                    i += 2
-
-            # PUSH(I|F) 2 ; F?MUL -> DUP 1 ; F?ADD
-            elif (current_statement == EWVMStatement('PUSHI', 2) or
-                  current_statement == EWVMStatement('PUSHF', 2.0)) and \
-                (next_statement == EWVMStatement('MUL') or
-                 next_statement == EWVMStatement('FMUL')):
-
-                ret.append(EWVMStatement('DUP', 1))
-
-                if next_statement == EWVMStatement('MUL'):
-                    ret.append(EWVMStatement('ADD'))
-                else:
-                    ret.append(EWVMStatement('FADD'))
-                i += 2
-
-        if i == old_i:
-            ret.append(program[i])
-            i += 1
+# Peephole rules are written one per line, as a sequence of instructions, the instructions that
+# replace them, and an optional guard:
+#
+#     STOREL $n; PUSHL $n -> DUP 1; STOREL $n
+#     PUSHI $a; PUSHI $b; DIV -> PUSHI ($a // $b) if $a >= 0 and $b > 0
+#
+# In patterns, an opcode may have alternatives (PUSHI|PUSHF), and each argument is a literal (which
+# must be equal to the instruction's argument) or a variable (bound to the argument the first time
+# it appears, and which must be equal to it afterwards). @name matches (and binds) any instruction.
+# Replacement arguments may also be expressions in parentheses, which use Python syntax.
+# Lines starting with # are comments.
 
-    return ret
+from __future__ import annotations
+import ast as python_ast
+from dataclasses import dataclass
+import re
+import sys
+from types import CodeType
+from typing import Any, Iterable
 
-def apply_ewvm_peephole_optimizations(program: EWVMProgram) -> EWVMProgram:
-    next_program = program
-    while True:
-        previous_program = next_program
-        next_program = __optimization_pass(previous_program)
-        if previous_program == next_program:
+from .ewvm import EWVMArgument, EWVMProgram, EWVMStatement, Label
+
+class PeepholeRuleError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class RuleVariable:
+    name: str
+
+@dataclass(frozen=True)
+class RuleExpression:
+    source: str # Python expression, where variables have had their $ removed
+
+RuleArgument = EWVMArgument | RuleVariable | RuleExpression
+
+@dataclass(frozen=True)
+class RuleInstruction:
+    opcodes: tuple[str, ...]              # Alternatives (only one in replacements)
+    arguments: tuple[RuleArgument, ...]
+    binding: None | str = None            # @name: any instruction (no opcodes nor arguments)
+
+@dataclass(frozen=True)
+class PeepholeRule:
+    pattern: tuple[RuleInstruction, ...]
+    replacement: tuple[RuleInstruction, ...]
+    guard: None | RuleExpression
+    source: str # Text of the rule, to identify it
+
+__TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<separator>->|;) |
+        (?P<string>"(?:[^"\\]|\\.)*") |
+        (?P<expression>\((?:[^()"]|"(?:[^"\\]|\\.)*"|\([^()]*\))*\)) |
+        (?P<word>[^\s;]+)
+    )''', re.VERBOSE)
+__OPCODE = re.compile(r'[A-Z]+(\|[A-Z]+)*')
+__IDENTIFIER = re.compile(r'\$?[A-Za-z_][A-Za-z0-9_]*')
+
+__PYTHON_KEYWORDS = {'and', 'or', 'not', 'True', 'False'}
+__PYTHON_NODES = (
+    python_ast.Expression, python_ast.BoolOp, python_ast.BinOp, python_ast.UnaryOp,
+    python_ast.Compare, python_ast.Name, python_ast.Load, python_ast.Constant,
+    python_ast.And, python_ast.Or, python_ast.Not, python_ast.UAdd, python_ast.USub,
+    python_ast.Add, python_ast.Sub, python_ast.Mult, python_ast.Div, python_ast.FloorDiv,
+    python_ast.Mod, python_ast.Eq, python_ast.NotEq, python_ast.Lt, python_ast.LtE,
+    python_ast.Gt, python_ast.GtE
+)
+
+def __parse_expression(source: str, variables: set[str]) -> RuleExpression:
+    python_source = ''
+    last_end = 0
+    for match in __IDENTIFIER.finditer(source):
+        name = match.group()
+        if name.startswith('$'):
+            if name[1:] not in variables:
+                raise PeepholeRuleError(f'Unbound variable {name}')
+            name = name[1:]
+        elif name not in __PYTHON_KEYWORDS:
+            raise PeepholeRuleError(f'Unknown name \'{name}\' (variables start with $)')
+
+        python_source += source[last_end:match.start()] + name
+        last_end = match.end()
+    python_source += source[last_end:]
+
+    try:
+        tree = python_ast.parse(python_source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise PeepholeRuleError(f'Invalid expression: {source.strip()}') from e
+
+    if not all(isinstance(node, __PYTHON_NODES) for node in python_ast.walk(tree)):
+        raise PeepholeRuleError(f'Unsupported expression: {source.strip()}')
+
+    return RuleExpression(python_source.strip())
+
+def __parse_argument(token: str, kind: str, variables: set[str], pattern: bool) -> RuleArgument:
+    if token.startswith('$'):
+        name = token[1:]
+        if not name.isidentifier():
+            raise PeepholeRuleError(f'Invalid variable name: {token}')
+
+        if pattern:
+            variables.add(name)
+        elif name not in variables:
+            raise PeepholeRuleError(f'Unbound variable {token}')
+        return RuleVariable(name)
+
+    elif kind == 'expression':
+        if pattern:
+            raise PeepholeRuleError('Expressions can only be used in replacements')
+        return __parse_expression(token[1:-1], variables)
+
+    try:
+        value = python_ast.literal_eval(token)
+    except (ValueError, SyntaxError) as e:
+        raise PeepholeRuleError(f'Invalid argument: {token}') from e
+
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise PeepholeRuleError(f'Invalid argument: {token}')
+    return value
+
+def __parse_instructions(tokens: list[tuple[str, str]],
+                         variables: set[str],
+                         pattern: bool) -> tuple[RuleInstruction, ...]:
+
+    # Split by ;
+    groups: list[list[tuple[str, str]]] = [[]]
+    for kind, token in tokens:
+        if kind == 'separator':
+            groups.append([])
+        else:
+            groups[-1].append((kind, token))
+
+    if groups == [[]] and not pattern:
+        return () # Instructions removed
+
+    ret = []
+    for group in groups:
+        if not group:
+            raise PeepholeRuleError('Empty instruction')
+
+        _, opcodes = group[0]
+        if opcodes.startswith('@'):
+            name = opcodes[1:]
+            if len(group) != 1 or not name.isidentifier():
+                raise PeepholeRuleError(f'Invalid instruction variable: {opcodes}')
+
+            if pattern:
+                variables.add(name)
+            elif name not in variables:
+                raise PeepholeRuleError(f'Unbound variable {opcodes}')
+
+            ret.append(RuleInstruction((), (), name))
+        else:
+            if not __OPCODE.fullmatch(opcodes) or (not pattern and '|' in opcodes):
+                raise PeepholeRuleError(f'Invalid opcode: {opcodes}')
+
+            arguments = tuple(__parse_argument(token, kind, variables, pattern)
+                              for kind, token in group[1:])
+            ret.append(RuleInstruction(tuple(opcodes.split('|')), arguments))
+
+    return tuple(ret)
+
+def __parse_rule(source: str) -> PeepholeRule:
+    # Tokenize, up to the guard (the rest of the line after a top-level if)
+    tokens: list[tuple[str, str]] = []
+    guard_source = None
+    position = 0
+    while source[position:].strip():
+        match = __TOKEN.match(source, position)
+        if match is None or match.lastgroup is None:
+            raise PeepholeRuleError(f'Invalid token: {source[position:].strip()}')
+        position = match.end()
+
+        if match.lastgroup == 'word' and match.group('word') == 'if':
+            guard_source = source[position:]
             break
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+
+    arrows = [i for i, (kind, token) in enumerate(tokens) if token == '->']
+    if len(arrows) != 1:
+        raise PeepholeRuleError('Rules must have exactly one ->')
+
+    variables: set[str] = set()
+    pattern = __parse_instructions(tokens[:arrows[0]], variables, True)
+    replacement = __parse_instructions(tokens[arrows[0] + 1:], variables, False)
+    guard = None if guard_source is None else __parse_expression(guard_source, variables)
+
+    return PeepholeRule(pattern, replacement, guard, source.strip())
+
+def parse_peephole_rules(text: str, file_path: str = '<rules>') -> list[PeepholeRule]:
+    ret = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if line.strip() == '' or line.lstrip().startswith('#'):
+            continue
+
+        try:
+            ret.append(__parse_rule(line))
+        except PeepholeRuleError as e:
+            raise PeepholeRuleError(f'{file_path}:{line_number}: {e}') from e
+
+    return ret
+
+def load_peephole_rules(file_path: str) -> list[PeepholeRule]:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError as e:
+        raise PeepholeRuleError(f'Failed to open peephole rules file: {file_path}') from e
+
+    return parse_peephole_rules(text, file_path)
+
+DEFAULT_PEEPHOLE_RULES = tuple(parse_peephole_rules('''
+# (PUSHI 0){N} -> PUSHN N
+PUSHI|PUSHF 0; PUSHI|PUSHF 0 -> PUSHN 2
+PUSHN $n; PUSHI|PUSHF 0 -> PUSHN ($n + 1)
+PUSHF 0; @next -> PUSHI 0; @next
+
+# Reuse stored values
+STOREL $n; PUSHL $n -> DUP 1; STOREL $n
+STOREG $n; PUSHG $n -> DUP 1; STOREG $n
+
+# x * 2 -> x + x
+PUSHI|PUSHF 2; MUL -> DUP 1; ADD
+PUSHI|PUSHF 2; FMUL -> DUP 1; FADD
+''', '<default rules>'))
+
+# Loop depth of each instruction, where loops are the instructions between a label and a jump back
+# to it
+def get_loop_depths(program: EWVMProgram) -> list[int]:
+    label_indices: dict[str, int] = {}
+    changes = [0] * (len(program) + 1)
+    for i, statement in enumerate(program):
+        if isinstance(statement, Label):
+            label_indices[statement.name] = i
+        elif isinstance(statement, EWVMStatement) and statement.instruction in ('JUMP', 'JZ'):
+            target = statement.arguments[0]
+            if isinstance(target, Label) and target.name in label_indices:
+                changes[label_indices[target.name]] += 1
+                changes[i + 1] -= 1
+
+    ret = []
+    depth = 0
+    for change in changes[:-1]:
+        depth += change
+        ret.append(depth)
+
+    return ret
+
+# Assumed number of iterations of every loop, to estimate executed instructions
+LOOP_ITERATIONS = 10
+
+# Rules may rewrite each other's output forever (e.g., PUSHI $a -> PUSHI $a). Optimization fails
+# after this many rewrites per instruction of the program.
+MAX_REWRITES_PER_INSTRUCTION = 8
+
+@dataclass
+class PeepholeRuleStatistics:
+    firings: int = 0
+    removed: int = 0    # Instructions
+    added: int = 0      # Instructions
+    savings: float = 0  # Estimate of executed instructions
+
+class PeepholeStatistics:
+    def __init__(self, rules: Iterable[PeepholeRule] = ()) -> None:
+        self.rules = {rule.source: PeepholeRuleStatistics() for rule in rules}
+
+    def record(self,
+               rule: PeepholeRule,
+               matched: EWVMProgram,
+               replacement: EWVMProgram,
+               loop_depth: int) -> None:
+
+        # Instructions kept at the start or end of the matched ones (e.g., by @name) weren't
+        # changed by the rule
+        common = min(len(matched), len(replacement))
+        prefix = 0
+        while prefix < common and matched[prefix] == replacement[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < common - prefix and matched[-1 - suffix] == replacement[-1 - suffix]:
+            suffix += 1
+
+        removed = len(matched) - prefix - suffix
+        added = len(replacement) - prefix - suffix
+
+        rule_statistics = self.rules.setdefault(rule.source, PeepholeRuleStatistics())
+        rule_statistics.firings += 1
+        rule_statistics.removed += removed
+        rule_statistics.added += added
+        rule_statistics.savings += (removed - added) * LOOP_ITERATIONS ** loop_depth
+
+    def merge(self, other: PeepholeStatistics) -> None:
+        for source, other_statistics in other.rules.items():
+            rule_statistics = self.rules.setdefault(source, PeepholeRuleStatistics())
+            rule_statistics.firings += other_statistics.firings
+            rule_statistics.removed += other_statistics.removed
+            rule_statistics.added += other_statistics.added
+            rule_statistics.savings += other_statistics.savings
+
+    def print_statistics(self) -> None:
+        print(f'{"Firings":>10} {"Removed":>10} {"Added":>10} {"Savings":>12}  Peephole rule',
+              file=sys.stderr)
+
+        # Most profitable rules first
+        for source, rule_statistics in sorted(self.rules.items(),
+                                              key=lambda item: (-item[1].savings,
+                                                                -item[1].firings)):
+            print(f'{rule_statistics.firings:>10} {rule_statistics.removed:>10} '
+                  f'{rule_statistics.added:>10} {rule_statistics.savings:>12.0f}  {source}',
+                  file=sys.stderr)
+
+# Decision tree over the opcodes of a sequence of instructions. Each node is reached after some
+# instructions, and holds the rules whose opcodes all match those instructions (with their
+# position in the list of rules).
+class _DecisionNode:
+    def __init__(self) -> None:
+        self.rules: list[tuple[int, PeepholeRule]] = []
+        self.children: dict[str, _DecisionNode] = {}
+        self.any_instruction: None | _DecisionNode = None # @name
+
+    def insert(self, index: int, rule: PeepholeRule, depth: int = 0) -> None:
+        if depth == len(rule.pattern):
+            self.rules.append((index, rule))
+            return
+
+        instruction = rule.pattern[depth]
+        if not instruction.opcodes:
+            if self.any_instruction is None:
+                self.any_instruction = _DecisionNode()
+            self.any_instruction.insert(index, rule, depth + 1)
+
+        for opcode in instruction.opcodes:
+            self.children.setdefault(opcode, _DecisionNode()).insert(index, rule, depth + 1)
+
+class PeepholeOptimizer:
+    def __init__(self, rules: Iterable[PeepholeRule] = DEFAULT_PEEPHOLE_RULES) -> None:
+        self.rules = list(rules)
+
+        # Only rules whose opcodes match are tried, so the cost of examining an instruction doesn't
+        # grow with the number of rules
+        self.decision_tree = _DecisionNode()
+        for i, rule in enumerate(self.rules):
+            self.decision_tree.insert(i, rule)
+
+        # Number of instructions before rewritten ones that may start a match including them
+        self.lookbehind = max((len(rule.pattern) for rule in self.rules), default=1) - 1
+
+        self.code: dict[str, CodeType] = {}
+        for rule in self.rules:
+            expressions = [argument for instruction in rule.replacement
+                           for argument in instruction.arguments
+                           if isinstance(argument, RuleExpression)]
+            if rule.guard is not None:
+                expressions.append(rule.guard)
+
+            for expression in expressions:
+                self.code[expression.source] = compile(expression.source, '<rule>', 'eval')
+
+    def evaluate(self, expression: RuleExpression, bindings: dict[str, Any]) -> Any:
+        # Only arithmetic, comparisons and boolean operators are allowed in expressions
+        # pylint: disable-next=eval-used
+        return eval(self.code[expression.source], {'__builtins__': {}}, bindings)
+
+    # Returns the rules whose opcodes match the end of program (reversed), in the order they
+    # were written
+    def find_candidates(self, program: EWVMProgram) -> list[tuple[int, PeepholeRule]]:
+        ret: list[tuple[int, PeepholeRule]] = []
+        nodes = [self.decision_tree]
+        for statement in reversed(program):
+            if not nodes or not isinstance(statement, EWVMStatement):
+                break
+
+            next_nodes = []
+            for node in nodes:
+                child = node.children.get(statement.instruction)
+                if child is not None:
+                    ret.extend(child.rules)
+                    next_nodes.append(child)
+                if node.any_instruction is not None:
+                    ret.extend(node.any_instruction.rules)
+                    next_nodes.append(node.any_instruction)
+            nodes = next_nodes
 
-    return previous_program
+        if len(ret) > 1:
+            ret.sort(key=lambda candidate: candidate[0])
+        return ret
+
+    # Returns the instructions that replace the end of program (reversed), or None if the rule
+    # doesn't match. The rule's opcodes must match (see find_candidates).
+    def apply_rule(self, rule: PeepholeRule, program: EWVMProgram) -> None | EWVMProgram:
+        bindings: dict[str, Any] = {}
+        for i, instruction in enumerate(rule.pattern):
+            statement = program[-1 - i]
+            assert isinstance(statement, EWVMStatement)
+
+            if instruction.binding is not None:
+                if bindings.setdefault(instruction.binding, statement) != statement:
+                    return None
+                continue
+
+            if len(statement.arguments) != len(instruction.arguments):
+                return None
+
+            for pattern_argument, argument in zip(instruction.arguments, statement.arguments):
+                if isinstance(pattern_argument, RuleVariable):
+                    if pattern_argument.name not in bindings:
+                        bindings[pattern_argument.name] = argument
+                    elif bindings[pattern_argument.name] != argument:
+                        return None
+                elif pattern_argument != argument or isinstance(argument, Label):
+                    return None
+
+        try:
+            if rule.guard is not None and not self.evaluate(rule.guard, bindings):
+                return None
+
+            ret: EWVMProgram = []
+            for instruction in rule.replacement:
+                if instruction.binding is not None:
+                    ret.append(bindings[instruction.binding])
+                    continue
+
+                arguments: list[EWVMArgument] = []
+                for rule_argument in instruction.arguments:
+                    value: Any
+                    if isinstance(rule_argument, RuleVariable):
+                        value = bindings[rule_argument.name]
+                    elif isinstance(rule_argument, RuleExpression):
+                        value = self.evaluate(rule_argument, bindings)
+                    else:
+                        value = rule_argument
+
+                    if isinstance(value, bool):
+                        value = int(value)
+                    elif not isinstance(value, (int, float, str, Label)):
+                        return None
+                    arguments.append(value)
+
+                ret.append(EWVMStatement(instruction.opcodes[0], *arguments))
+        except (ArithmeticError, TypeError, ValueError):
+            return None # The rule doesn't apply to these arguments
+
+        return ret
+
+    # Firings are recorded in statistics (when provided). Raises PeepholeRuleError when the rules
+    # don't stop rewriting the program.
+    def optimize(self,
+                 program: EWVMProgram,
+                 statistics: None | PeepholeStatistics = None) -> EWVMProgram:
+
+        # Gap buffer: examined instructions, and instructions still to examine (reversed). Each
+        # rewrite replaces instructions right after the cursor. The new instructions are put back to
+        # be examined, along with the ones right before them, so every instruction is only examined
+        # again when something near it changes.
+        done: EWVMProgram = []
+        remaining = program[::-1]
+
+        # Loop depth of each instruction (by identity), for statistics. New instructions are in the
+        # same loop as the ones they replace.
+        loop_depths: dict[int, int] = {}
+        if statistics is not None:
+            loop_depths = {id(statement): depth
+                           for statement, depth in zip(program, get_loop_depths(program))}
+
+        # Most instructions can't start any rule
+        first_opcodes = self.decision_tree.children
+        any_first_opcode = self.decision_tree.any_instruction is not None
+
+        rewrites_left = MAX_REWRITES_PER_INSTRUCTION * (len(program) + 1)
+        while remaining:
+            statement = remaining[-1]
+            if not any_first_opcode and (not isinstance(statement, EWVMStatement) or
+                                         statement.instruction not in first_opcodes):
+
+                done.append(remaining.pop())
+                continue
+
+            for _, rule in self.find_candidates(remaining):
+                replacement = self.apply_rule(rule, remaining)
+                if replacement is not None:
+                    rewrites_left -= 1
+                    if rewrites_left < 0:
+                        raise PeepholeRuleError('Peephole rules don\'t stop rewriting the code '
+                                                f'(last rule: {rule.source})')
+
+                    if statistics is not None:
+                        loop_depth = loop_depths.get(id(remaining[-1]), 0)
+                        matched = remaining[:-len(rule.pattern) - 1:-1]
+                        statistics.record(rule, matched, replacement, loop_depth)
+                        for new_statement in replacement:
+                            loop_depths[id(new_statement)] = loop_depth
+
+                    del remaining[-len(rule.pattern):]
+                    remaining.extend(reversed(replacement))
+
+                    for _ in range(min(self.lookbehind, len(done))):
+                        remaining.append(done.pop())
+                    break
+            else:
+                done.append(remaining.pop())
+
+        return done
+
+__DEFAULT_OPTIMIZER = PeepholeOptimizer()
+
+def apply_ewvm_peephole_optimizations(program: EWVMProgram) -> EWVMProgram:
+    return __DEFAULT_OPTIMIZER.optimize(program)
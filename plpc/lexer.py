@@ -30,9 +30,9 @@ class _Lexer:
         self.file_path = file_path                     # Path to the source for error printing
         self.last_error: tuple[int, int] | None = None # Start position and length of error
 
-        self.literals = '.;:(,)<>=+-*/[]^'
-        self.tokens = [
-            # 6.1.2 - Keywords
+        # 6.1.2 - Keywords
+        # Keywords are matched as identifiers and then looked up in this table (see t_ID)
+        keywords = [
             'PROGRAM', 'BEGIN', 'END',
             'LABEL', 'CONST', 'TYPE', 'VAR',
             'ARRAY', 'PACKED', 'SET', 'FILE', 'OF', 'RECORD',
@@ -46,7 +46,11 @@ class _Lexer:
             'IN',
             'DIV', 'MOD',
             'NIL',
+        ]
+        self.keyword_types = { keyword.lower(): keyword for keyword in keywords }
 
+        self.literals = '.;:(,)<>=+-*/[]^'
+        self.tokens = keywords + [
             # 6.1.2 - Special-symbols
             'DIFFERENT',
             'LE',
@@ -78,153 +82,20 @@ class _Lexer:
         self.t_RANGE = r'\.\.'
 
         self.t_ignore = ' \t\r'
-        # 6.1.8 - Token separators
-        self.t_ignore_COMMENT = r'({|\(\*)((?!{|\(\*)(.|\n))*?(}|\*\))'
+        # 6.1.8 - Token separators (see t_COMMENT)
+        self.comment_delimiters = re.compile(r'}|\*\)|{|\(\*')
 
         self.lexer = ply.lex.lex(module=self, reflags=re.IGNORECASE)
 
-    def t_PROGRAM(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'PROGRAM\b'
-        return t
-
-    def t_BEGIN(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'BEGIN\b'
-        return t
-
-    def t_END(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'END\b'
-        return t
-
-    def t_LABEL(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'LABEL\b'
-        return t
-
-    def t_CONST(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'CONST\b'
-        return t
-
-    def t_TYPE(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'TYPE\b'
-        return t
-
-    def t_VAR(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'VAR\b'
-        return t
-
-    def t_ARRAY(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'ARRAY\b'
-        return t
-
-    def t_PACKED(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'PACKED\b'
-        return t
-
-    def t_SET(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'SET\b'
-        return t
-
-    def t_FILE(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'FILE\b'
-        return t
-
-    def t_OF(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'OF\b'
-        return t
-
-    def t_RECORD(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'RECORD\b'
-        return t
-
-    def t_FUNCTION(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'FUNCTION\b'
-        return t
-
-    def t_PROCEDURE(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'PROCEDURE\b'
-        return t
-
-    def t_IF(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'IF\b'
-        return t
-
-    def t_THEN(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'THEN\b'
-        return t
-
-    def t_ELSE(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'ELSE\b'
-        return t
-
-    def t_FOR(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'FOR\b'
-        return t
-
-    def t_TO(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'TO\b'
-        return t
-
-    def t_DOWNTO(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'DOWNTO\b'
-        return t
-
-    def t_DO(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'DO\b'
-        return t
-
-    def t_WHILE(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'WHILE\b'
-        return t
-
-    def t_REPEAT(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'REPEAT\b'
-        return t
-
-    def t_UNTIL(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'UNTIL\b'
-        return t
-
-    def t_CASE(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'CASE\b'
-        return t
-
-    def t_GOTO(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'GOTO\b'
-        return t
-
-    def t_WITH(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'WITH\b'
-        return t
-
-    def t_AND(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'AND\b'
-        return t
-
-    def t_OR(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'OR\b'
-        return t
-
-    def t_NOT(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'NOT\b'
-        return t
-
-    def t_IN(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'IN\b'
-        return t
-
-    def t_DIV(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'DIV\b'
-        return t
-
-    def t_MOD(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'MOD\b'
-        return t
-
-    def t_NIL(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
-        r'NIL\b'
-        return t
+    def reset(self, file_path: str) -> None:
+        self.has_errors = False
+        self.file_path = file_path
+        self.last_error = None
+        self.lexer.lineno = 1
 
     def t_ID(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
         r'[a-z][a-z0-9]*'
+        t.type = self.keyword_types.get(t.value.lower(), 'ID')
         return t
 
     def t_FLOAT(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
@@ -259,6 +130,33 @@ class _Lexer:
         t.type = ']'
         return t
 
+    # 6.1.8 - Token separators
+
+    def t_COMMENT(self, t: ply.lex.LexToken) -> None | ply.lex.LexToken:
+        r'{|\(\*'
+
+        # Comments can't be nested, so the first delimiter after the opening one must close it
+        source = self.lexer.lexdata
+        delimiter = self.comment_delimiters.search(source, self.lexer.lexpos)
+        if delimiter is not None and delimiter.group() in ('}', '*)'):
+            newlines = source.count('\n', t.lexpos, delimiter.start())
+            if newlines > 0:
+                self.commit_error(self.lexer)
+                self.lexer.lineno += newlines
+
+            self.lexer.lexpos = delimiter.end()
+            return None
+
+        # Not a comment: '(' followed by '*', or an unexpected '{'
+        self.lexer.lexpos = t.lexpos
+        if t.value == '{':
+            self.t_error(t)
+            return None
+
+        self.lexer.lexpos += 1
+        t.type = t.value = '('
+        return t
+
     def t_newline(self, t: ply.lex.LexToken) -> ply.lex.LexToken:
         r'\n+'
 
@@ -293,7 +191,6 @@ class _Lexer:
             print_error(self.file_path,
                         lexer.lexdata,
                         'Lexer failed to reconize the following characters',
-                        lexer.lineno,
                         start,
                         length)
 
@@ -16,90 +16,64 @@
 #
 # -------------------------------------------------------------------------------------------------
 
-from dataclasses import is_dataclass, fields
 import operator
 from typing import Any, Callable, cast, get_args
 
 # pylint: disable-next=wildcard-import,unused-wildcard-import
 from .ast import *
-
-def __replace_expressions(subtree: Any,
-                          replacer: Callable[[Expression], Expression],
-                          visited: set[int]) -> Any:
-
-    if id(subtree) in visited:
-        return subtree
-    else:
-        visited.add(id(subtree))
-
-    if isinstance(subtree, tuple):
-        if isinstance(subtree[0], (UnaryOperation, BinaryOperation)):
-            return replacer(subtree)
-        else:
-            return (__replace_expressions(subtree[0], replacer, visited), subtree[1], visited)
-
-    elif isinstance(subtree, list):
-        return [__replace_expressions(element, replacer, visited) for element in subtree]
-
-    elif is_dataclass(subtree):
-        for field in fields(subtree):
-            setattr(
-                subtree,
-                field.name,
-                __replace_expressions(getattr(subtree, field.name), replacer, visited)
-            )
-
-    return subtree
+from .visitor import transform_expressions
+
+# Expressions are transformed bottom-up, so the operands of an operation have already been folded
+# and simplified when the operation is
+
+__CONSTANT_TYPES = get_args(ConstantValue)
+
+__UNARY_OPERATIONS: dict[str, Callable[[Any], Any]] = {
+    '+': operator.pos,
+    '-': operator.neg,
+    'not': operator.not_,
+}
+
+__BINARY_OPERATIONS: dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    'div': operator.floordiv,
+    'mod': operator.mod,
+    'and': operator.and_,
+    'or': operator.or_,
+    '=': operator.eq,
+    '<>': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge
+}
 
 def __constant_fold_expression(expression: Expression) -> Expression:
     if isinstance(expression[0], UnaryOperation):
-        sub = __constant_fold_expression(expression[0].sub)
-
-        if isinstance(sub[0], get_args(ConstantValue)):
-            unary_operation: Callable[[Any], Any] = cast(Callable[[Any], Any], {
-                '+': operator.pos,
-                '-': operator.neg,
-                'not': operator.not_,
-            }[expression[0].operator])
+        sub = expression[0].sub
 
+        if isinstance(sub[0], __CONSTANT_TYPES):
+            unary_operation = __UNARY_OPERATIONS[expression[0].operator]
             return (unary_operation(sub[0]), expression[1])
 
-        return (UnaryOperation(expression[0].operator, sub), expression[1])
-
     elif isinstance(expression[0], BinaryOperation):
-        left = __constant_fold_expression(expression[0].left)
-        right = __constant_fold_expression(expression[0].right)
-
-        if isinstance(left[0], get_args(ConstantValue)) and \
-            isinstance(right[0], get_args(ConstantValue)):
-
-            binary_operation = {
-                '+': operator.add,
-                '-': operator.sub,
-                '*': operator.mul,
-                '/': operator.truediv,
-                'div': operator.floordiv,
-                'mod': operator.mod,
-                'and': operator.and_,
-                'or': operator.or_,
-                '=': operator.eq,
-                '<>': operator.ne,
-                '<': operator.lt,
-                '>': operator.gt,
-                '<=': operator.le,
-                '>=': operator.ge
-            }.get(expression[0].operator)
+        left = expression[0].left
+        right = expression[0].right
+
+        if isinstance(left[0], __CONSTANT_TYPES) and isinstance(right[0], __CONSTANT_TYPES):
+            binary_operation = __BINARY_OPERATIONS.get(expression[0].operator)
 
             if binary_operation is not None:
                 return (binary_operation(left[0], right[0]), expression[1])
 
-        return (BinaryOperation(expression[0].operator, left, right), expression[1])
-
     return expression
 
 def __simplify_expression(expression: Expression) -> Expression:
     if isinstance(expression[0], UnaryOperation) and expression[0].operator == 'not':
-        sub = __simplify_expression(expression[0].sub)
+        sub = expression[0].sub
 
         # not (not x) -> x
         if isinstance(sub[0], UnaryOperation) and sub[0].operator == 'not':
@@ -119,12 +93,10 @@ def __simplify_expression(expression: Expression) -> Expression:
             }[sub[0].operator])
 
             return (BinaryOperation(new_operator, sub[0].left, sub[0].right), expression[1])
-        else:
-            return (UnaryOperation(expression[0].operator, sub), expression[1])
 
     elif isinstance(expression[0], BinaryOperation) and expression[0].operator in ['and', 'or']:
-        left = __simplify_expression(expression[0].left)
-        right = __simplify_expression(expression[0].right)
+        left = expression[0].left
+        right = expression[0].right
 
         # De Morgan's Laws
         if isinstance(left[0], UnaryOperation) and left[0].operator == 'not' and \
@@ -142,14 +114,8 @@ def __simplify_expression(expression: Expression) -> Expression:
                 ),
                 expression[1]
             )
-        else:
-            return (BinaryOperation(expression[0].operator, left, right), expression[1])
 
     return expression
 
 def optimize_ast(program: Program) -> None:
-    __replace_expressions(
-        program,
-        lambda e: __simplify_expression(__constant_fold_expression(e)),
-        set()
-    )
+    transform_expressions(program, lambda e: __simplify_expression(__constant_fold_expression(e)))
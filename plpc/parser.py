@@ -16,16 +16,20 @@
 #
 # -------------------------------------------------------------------------------------------------
 
-from typing import Any, Callable
+import hashlib
+import os
+import pickle
+from typing import Any
 
 import ply.lex
 import ply.yacc
 
 # pylint: disable-next=wildcard-import,unused-wildcard-import
 from .ast import *
-from .error import print_error
-from .lexer import create_lexer
-from .symboltable import SymbolTable, SymbolTableError
+from .cache import get_cache_directory
+from .error import collect_diagnostics, print_error, report_diagnostics
+from .lexer import LexerError, _Lexer
+from .symboltable import BUILTIN_SYMBOLS, SymbolTable, SymbolTableError
 from .typechecker import TypeChecker, TypeCheckerError
 
 class ParserError(ValueError):
@@ -35,17 +39,106 @@ class _Parser:
     def __init__(self, file_path: str, start_production: str):
         self.file_path = file_path
         self.has_errors = False
+        self.tracking = True         # Whether positions of non-terminals are known
+        self.needs_tracking = False  # Whether a diagnostic needs them, when they aren't known
 
-        self.lexer = create_lexer(file_path)
+        self.lexer_module = _Lexer(file_path)
+        self.lexer = self.lexer_module.lexer
         self.tokens = list(self.lexer.lextokens)
-        self.parser = ply.yacc.yacc(module=self,
-                                    start=start_production,
-                                    debug=False,
-                                    write_tables=False)
+        self.parser = self.__create_yacc_parser(start_production)
+        self.parse_function = self.parser.parse # create_parser replaces self.parser.parse
 
         self.symbols = SymbolTable(file_path, self.lexer)
         self.type_checker = TypeChecker(file_path, self.lexer)
 
+    def reset(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.has_errors = False
+        self.tracking = True
+        self.needs_tracking = False
+
+        self.lexer_module.reset(file_path)
+        self.symbols.reset(file_path)
+        self.type_checker.reset(file_path)
+
+    # Positions of non-terminals are only needed for errors. The source is first parsed without
+    # tracking them, which is faster, and only parsed again (tracking positions) when an error is
+    # reported. Warnings only use the positions of tokens, which are known in both modes, except
+    # for the warning on range types (see p_type_range).
+    def parse(self, source: str, tracking: bool = False) -> Program:
+        if not tracking:
+            self.tracking = False
+            with collect_diagnostics() as diagnostics:
+                try:
+                    ast = self.parse_function(source, lexer=self.lexer)
+                    failed = self.has_errors or self.needs_tracking
+                except LexerError:
+                    failed = True
+
+            if not failed and all(diagnostic.severity != 'error' for diagnostic in diagnostics):
+                report_diagnostics(diagnostics)
+                return ast
+
+            self.reset(self.file_path)
+
+        self.tracking = True
+        ast = self.parse_function(source, lexer=self.lexer, tracking=True)
+        if self.has_errors:
+            raise ParserError()
+
+        return ast
+
+    def __create_yacc_parser(self, start_production: str) -> ply.yacc.LRParser:
+        table_path = self.__get_table_cache_path(start_production)
+        if table_path is None:
+            return ply.yacc.yacc(module=self,
+                                 start=start_production,
+                                 debug=False,
+                                 write_tables=False)
+
+        # Load cached tables. PLY compares the signature of the grammar with the one in the file,
+        # and regenerates the tables if they differ.
+        if os.path.exists(table_path):
+            try:
+                return ply.yacc.yacc(module=self,
+                                     start=start_production,
+                                     debug=False,
+                                     write_tables=False,
+                                     picklefile=table_path)
+            except (EOFError, OSError, pickle.UnpicklingError):
+                pass # Corrupted cache file
+
+        # Generate tables and atomically replace the cache file, so that concurrent compilers never
+        # see a partially written file
+        temporary_path = f'{table_path}.{os.getpid()}.tmp'
+        parser = ply.yacc.yacc(module=self,
+                               start=start_production,
+                               debug=False,
+                               write_tables=False,
+                               picklefile=temporary_path)
+
+        try:
+            os.replace(temporary_path, table_path)
+        except OSError:
+            pass
+
+        return parser
+
+    def __get_table_cache_path(self, start_production: str) -> None | str:
+        cache_directory = get_cache_directory()
+        if cache_directory is None:
+            return None
+
+        grammar_hash = hashlib.sha256()
+        grammar_hash.update(start_production.encode())
+        grammar_hash.update(' '.join(sorted(self.tokens)).encode())
+        for name in sorted(dir(_Parser)):
+            if name.startswith('p_'):
+                grammar_hash.update((getattr(_Parser, name).__doc__ or '').encode())
+
+        file_name = f'parser-{start_production}-{grammar_hash.hexdigest()[:16]}.pickle'
+        return os.path.join(cache_directory, file_name)
+
     def print_error(self,
                     error_message: str,
                     start: int,
@@ -55,7 +148,6 @@ class _Parser:
         print_error(self.file_path,
                     self.lexer.lexdata,
                     error_message,
-                    self.lexer.lineno,
                     start,
                     length,
                     warning)
@@ -95,8 +187,8 @@ class _Parser:
         program-arguments : '(' identifier-list ')'
         '''
         self.print_error('Program arguments are not supported. Ignoring them...',
-                         p.lexspan(0)[0],
-                         p.lexspan(0)[1] - p.lexspan(0)[0] + 1,
+                         p.lexspan(1)[0],
+                         p.lexspan(3)[0] - p.lexspan(1)[0] + 1,
                          True)
 
     def p_identitifier_list_single(self, p: ply.yacc.YaccProduction) -> None:
@@ -417,12 +509,16 @@ class _Parser:
         '''
 
         if p[1] is not None:
-            self.print_error(
-                'Range type being interpreted as the type of its components',
-                p.lexspan(0)[0],
-                self.lexer.lexpos - p.lexspan(0)[0],
-                True
-            )
+            # The start of the range type (its first constant) is only known when tracking positions
+            if self.tracking:
+                self.print_error(
+                    'Range type being interpreted as the type of its components',
+                    p.lexspan(0)[0],
+                    self.lexer.lexpos - p.lexspan(0)[0],
+                    True
+                )
+            else:
+                self.needs_tracking = True
             p[0] = p[1].subtype
 
     def p_type_id(self, p: ply.yacc.YaccProduction) -> None:
@@ -480,11 +576,11 @@ class _Parser:
                                  p.lexspan(0)[0],
                                  p.lexspan(0)[1] - p.lexspan(0)[0] + 1)
 
-                p[0] = RangeType(1, 1, BuiltInType.INTEGER)
+                p[0] = self.type_checker.intern_range_type(RangeType(1, 1, BuiltInType.INTEGER))
                 return
         except TypeCheckerError:
             self.has_errors = True
-            p[0] = RangeType(1, 1, BuiltInType.INTEGER)
+            p[0] = self.type_checker.intern_range_type(RangeType(1, 1, BuiltInType.INTEGER))
             return
 
         try:
@@ -495,7 +591,7 @@ class _Parser:
                              p.lexspan(0)[0],
                              p.lexspan(0)[1] - p.lexspan(0)[0] + 1)
 
-            p[0] = RangeType(1, 1, BuiltInType.INTEGER)
+            p[0] = self.type_checker.intern_range_type(RangeType(1, 1, BuiltInType.INTEGER))
             return
 
         if value1 > value2:
@@ -503,10 +599,11 @@ class _Parser:
                              p.lexspan(0)[0],
                              p.lexspan(0)[1] - p.lexspan(0)[0] + 1)
 
-            p[0] = RangeType(1, 1, BuiltInType.INTEGER)
+            p[0] = self.type_checker.intern_range_type(RangeType(1, 1, BuiltInType.INTEGER))
             return
 
-        p[0] = RangeType(p[1], p[3], self.type_checker.get_constant_type(p[1]))
+        range_type = RangeType(p[1], p[3], self.type_checker.get_constant_type(p[1]))
+        p[0] = self.type_checker.intern_range_type(range_type)
 
     def p_structured_type_unpacked(self, p: ply.yacc.YaccProduction) -> None:
         '''
@@ -520,7 +617,7 @@ class _Parser:
         '''
 
         self.print_error('Packed structured types are not supported. Ignoring this keyword ...',
-                         p.lexspan(0)[0],
+                         p.lexspan(1)[0],
                          len('PACKED'),
                          True)
         p[0] = p[2]
@@ -539,10 +636,11 @@ class _Parser:
         array-type : ARRAY '[' array-dimensions ']' OF type
         '''
         if isinstance(p[6], ArrayType):
-            p[3].extend(p[6].dimensions)
-            p[0] = ArrayType(p[6].subtype, p[3])
+            p[0] = self.type_checker.intern_type(
+                ArrayType(p[6].subtype, (*p[3], *p[6].dimensions))
+            )
         else:
-            p[0] = ArrayType(p[6], p[3])
+            p[0] = self.type_checker.intern_type(ArrayType(p[6], tuple(p[3])))
 
     def p_array_incomplete(self, p: ply.yacc.YaccProduction) -> None:
         '''
@@ -910,7 +1008,8 @@ class _Parser:
                             len(p[1])
                         )
 
-            p[0] = CallableCall(definition, p[2][1])
+            builtin = BUILTIN_SYMBOLS.get(definition.name.lower()) is definition
+            p[0] = CallableCall(definition, p[2][1], builtin)
         except SymbolTableError:
             self.has_errors = True
 
@@ -1495,14 +1594,9 @@ class _Parser:
 def create_parser(file_path: str,
                   start_production: str = 'program') -> ply.yacc.LRParser:
 
-    def parse_wrapper(*args: str, **kwargs: Any) -> Callable[..., ply.yacc.LRParser]:
-        ast = old_parse_fn(*args, tracking=True, **kwargs)
-        if parser.has_errors:
-            raise ParserError()
-
-        return ast
+    def parse_wrapper(source: str, **_: Any) -> Program:
+        return parser.parse(source)
 
     parser = _Parser(file_path, start_production)
-    old_parse_fn = parser.parser.parse
     parser.parser.parse = parse_wrapper
     return parser.parser
@@ -0,0 +1,97 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from dataclasses import asdict
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+
+from .error import collect_diagnostics
+from .session import CompilerSession
+
+class _CompilerServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str) -> None:
+        # Sessions are kept warm between requests, one for each combination of flags
+        self.sessions: dict[tuple[bool, bool, bool], CompilerSession] = {}
+        super().__init__(socket_path, _RequestHandler)
+
+    def get_session(self,
+                    optimize: bool,
+                    debug: bool,
+                    short_circuit: bool = False) -> CompilerSession:
+
+        session = self.sessions.get((optimize, debug, short_circuit))
+        if session is None:
+            session = CompilerSession(optimize, debug, short_circuit=short_circuit)
+            self.sessions[(optimize, debug, short_circuit)] = session
+
+        return session
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _CompilerServer
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.read())
+            source = str(request['source'])
+            file_path = str(request['file_path'])
+            session = self.server.get_session(bool(request['optimize']),
+                                              bool(request['debug']),
+                                              bool(request.get('short_circuit', False)))
+        except (ValueError, KeyError, TypeError):
+            return # Invalid request
+
+        # Diagnostics are sent to the client, which decides how to print them
+        with collect_diagnostics() as diagnostics:
+            assembly_text = session.compile_to_text(source, file_path)
+
+        response = {
+            'assembly': assembly_text,
+            'diagnostics': [asdict(diagnostic) for diagnostic in diagnostics]
+        }
+        self.wfile.write(json.dumps(response).encode('utf-8'))
+
+def run_server(socket_path: str) -> bool:
+    if os.path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(socket_path)
+                print(f'A compilation server is already running on {socket_path}',
+                      file=sys.stderr)
+                return False
+            except OSError:
+                os.remove(socket_path) # Stale socket from a previous server
+
+    with _CompilerServer(socket_path) as server:
+        server.get_session(False, False) # Load parsing tables before the first request
+        print(f'Listening on {socket_path}', file=sys.stderr)
+
+        # Remove the socket when terminated
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+    return True
@@ -0,0 +1,164 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from typing import Sequence
+
+from .ast import Program
+from .cache import BuildCache, BuildCacheEntry
+from .error import Diagnostic, collect_diagnostics, report_diagnostics
+from .ewvm import EWVMProgram, export_assembly, generate_ewvm_code, remove_ewvm_comments
+from .ewvmcontrolflow import apply_ewvm_control_flow_cleanup
+from .ewvmfolding import apply_ewvm_constant_folding
+from .ewvmpeephole import DEFAULT_PEEPHOLE_RULES, PeepholeOptimizer, PeepholeRule, \
+    PeepholeRuleError, PeepholeStatistics
+from .lexer import LexerError
+from .optimizer import optimize_ast
+from .parser import ParserError, _Parser
+from .sourcefile import read_source_file, write_assembly_file
+
+class CompilerSession:
+    def __init__(self,
+                 optimize: bool = False,
+                 debug: bool = False,
+                 ast_cache: None | BuildCache = None,
+                 peephole_rules: Sequence[PeepholeRule] = (),
+                 peephole_statistics: None | PeepholeStatistics = None,
+                 short_circuit: bool = False) -> None:
+
+        self.optimize = optimize             # -O
+        self.debug = debug                   # -g
+        self.short_circuit = short_circuit   # -fshort-circuit
+        self.ast_cache = ast_cache           # Typed syntax trees, to skip the frontend
+        self.peephole_rules = peephole_rules # Besides the default ones
+
+        self.peephole_optimizer = PeepholeOptimizer([*DEFAULT_PEEPHOLE_RULES, *peephole_rules])
+        self.peephole_statistics = peephole_statistics # Updated on every compilation
+
+        # The lexer and the parsing tables are only built once (when first needed), and reused in
+        # every compilation
+        self.__parser: None | _Parser = None
+
+    @property
+    def parser(self) -> _Parser:
+        if self.__parser is None:
+            self.__parser = _Parser('<unknown>', 'program')
+
+        return self.__parser
+
+    # Key of the compiled assembly in a build cache
+    def get_cache_key(self, cache: BuildCache, source: str) -> str:
+        return cache.get_key(source,
+                             self.optimize,
+                             self.debug,
+                             self.short_circuit,
+                             *(rule.source for rule in self.peephole_rules))
+
+    def reset(self, file_path: str) -> None:
+        self.parser.reset(file_path)
+
+    def parse(self, source: str, file_path: str) -> Program:
+        if self.ast_cache is None:
+            self.reset(file_path)
+            return self.parser.parse(source)
+
+        # Syntax trees are cached before being optimized, so they can be reused with any flags
+        key = self.ast_cache.get_key(source)
+        ast = self.ast_cache.replay(key, file_path)
+        if isinstance(ast, Program):
+            return ast
+
+        diagnostics: list[Diagnostic] = []
+        try:
+            with collect_diagnostics() as diagnostics:
+                self.reset(file_path)
+                ast = self.parser.parse(source)
+        finally:
+            report_diagnostics(diagnostics)
+
+        self.ast_cache.store(key, BuildCacheEntry(ast, diagnostics))
+        return ast
+
+    def compile(self, source: str, file_path: str) -> EWVMProgram:
+        ast = self.parse(source, file_path)
+
+        if self.optimize:
+            optimize_ast(ast)
+
+        assembly = generate_ewvm_code(ast, self.optimize, self.short_circuit)
+
+        if not self.debug:
+            assembly = remove_ewvm_comments(assembly)
+
+        if self.optimize:
+            assembly = apply_ewvm_constant_folding(assembly)
+            assembly = apply_ewvm_control_flow_cleanup(assembly)
+            assembly = self.peephole_optimizer.optimize(assembly, self.peephole_statistics)
+
+        return assembly
+
+    # Returns None when compilation fails. Diagnostics are reported all at once, at the end of the
+    # compilation. When a cache is provided, successful compilations are stored in it, along with
+    # their diagnostics.
+    def compile_to_text(self,
+                        source: str,
+                        file_path: str,
+                        cache: None | BuildCache = None) -> None | str:
+
+        with collect_diagnostics() as diagnostics:
+            try:
+                assembly_text: None | str = export_assembly(self.compile(source, file_path))
+            except LexerError:
+                diagnostics.append(Diagnostic('note', 'Lexer failed. Aborting ...'))
+                assembly_text = None
+            except ParserError:
+                diagnostics.append(Diagnostic('note', 'Parser failed. Aborting ...'))
+                assembly_text = None
+            except PeepholeRuleError as e:
+                diagnostics.append(Diagnostic('error', str(e)))
+                assembly_text = None
+
+        report_diagnostics(diagnostics)
+
+        if cache is not None and assembly_text is not None:
+            key = self.get_cache_key(cache, source)
+            cache.store(key, BuildCacheEntry(assembly_text, diagnostics))
+
+        return assembly_text
+
+    # Returns whether compilation was successful. Paths can be '-' for stdin / stdout.
+    def compile_file(self,
+                     input_path: str,
+                     output_path: str,
+                     cache: None | BuildCache = None) -> bool:
+
+        read_result = read_source_file(input_path)
+        if read_result is None:
+            return False
+        source, human_readable_filename = read_result
+
+        assembly_text = None
+        if cache is not None:
+            key = self.get_cache_key(cache, source)
+            assembly_text = cache.replay(key, human_readable_filename)
+
+        if assembly_text is None:
+            assembly_text = self.compile_to_text(source, human_readable_filename, cache)
+            if assembly_text is None:
+                return False
+
+        return write_assembly_file(output_path, assembly_text)
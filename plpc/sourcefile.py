@@ -0,0 +1,50 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+# NOTE: this module must not import the compiler, to keep the startup of the client fast.
+
+import sys
+
+from .error import print_unlocalized_error
+
+# Returns the source and its human-readable file name, or None on failure. '-' is stdin.
+def read_source_file(input_path: str) -> None | tuple[str, str]:
+    if input_path == '-':
+        return sys.stdin.read(), '<stdin>'
+
+    try:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            return f.read(), input_path
+    except IOError:
+        print_unlocalized_error(f'Failed to open source file: {input_path}')
+        return None
+
+# Returns whether writing was successful. '-' is stdout.
+def write_assembly_file(output_path: str, assembly_text: str) -> bool:
+    if output_path == '-':
+        print(assembly_text)
+        return True
+
+    try:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(assembly_text)
+    except IOError:
+        print_unlocalized_error(f'Failed to write to output file: {output_path}')
+        return False
+
+    return True
@@ -17,6 +17,8 @@
 # -------------------------------------------------------------------------------------------------
 
 from pprint import pprint
+from types import MappingProxyType
+from typing import Mapping
 
 import ply.lex
 
@@ -30,46 +32,62 @@ class SymbolTableError(ValueError):
 SymbolValue = \
     LabelDefinition | CallableDefinition | ConstantDefinition | TypeDefinition | VariableDefinition
 
+__EMPTY_BODY = Block([], [], [], [], [], [])
+
+# 6.2.2.10 - Required identifiers are in the scope of the program
+# These definitions are shared by all compilations, and must not be modified.
+BUILTIN_SYMBOLS: Mapping[str, SymbolValue] = MappingProxyType({
+    # 6.4.2 - Required simple types
+    'integer': TypeDefinition('integer', BuiltInType.INTEGER),
+    'real': TypeDefinition('real', BuiltInType.REAL),
+    'boolean': TypeDefinition('boolean', BuiltInType.BOOLEAN),
+    'char': TypeDefinition('char', BuiltInType.CHAR),
+    'true': ConstantDefinition('true', True),
+    'false': ConstantDefinition('false', False),
+    'maxint': ConstantDefinition('maxint', 1 << 16 - 1),
+    'write': CallableDefinition('write', None, None, __EMPTY_BODY),
+    'writeln': CallableDefinition('writeln', None, None, __EMPTY_BODY),
+    'read': CallableDefinition('read', None, None, __EMPTY_BODY),
+    'readln': CallableDefinition('readln', None, None, __EMPTY_BODY),
+
+    # Non-standard
+    'string': TypeDefinition('char', BuiltInType.STRING),
+    'length': CallableDefinition('length',
+                                 [
+                                    VariableDefinition('str', BuiltInType.STRING, True)
+                                 ],
+                                 VariableDefinition('length', BuiltInType.INTEGER, True),
+                                 __EMPTY_BODY),
+})
+
 class SymbolTable:
     def __init__(self, file_path: str, lexer: ply.lex.Lexer) -> None:
         self.file_path = file_path
         self.lexer = lexer
 
-        empty_body = Block([], [], [], [], [], [])
-
-        self.scopes: list[dict[str, SymbolValue]] = [
-            # 6.2.2.10 - Required identifiers are in the scope of the program
-            # 6.4.2 - Required simple types
-            {
-                'integer': TypeDefinition('integer', BuiltInType.INTEGER),
-                'real': TypeDefinition('real', BuiltInType.REAL),
-                'boolean': TypeDefinition('boolean', BuiltInType.BOOLEAN),
-                'char': TypeDefinition('char', BuiltInType.CHAR),
-                'true': ConstantDefinition('true', True),
-                'false': ConstantDefinition('false', False),
-                'maxint': ConstantDefinition('maxint', 1 << 16 - 1),
-                'write': CallableDefinition('write', None, None, empty_body),
-                'writeln': CallableDefinition('writeln', None, None, empty_body),
-                'read': CallableDefinition('read', None, None, empty_body),
-                'readln': CallableDefinition('readln', None, None, empty_body),
-
-                # Non-standard
-                'string': TypeDefinition('char', BuiltInType.STRING),
-                'length': CallableDefinition('length',
-                                             [
-                                                VariableDefinition('str', BuiltInType.STRING, True)
-                                             ],
-                                             VariableDefinition(
-                                                'length', BuiltInType.INTEGER, True),
-                                             empty_body),
-            }
-        ]
+        # The symbols of every scope, and, for every identifier, a stack of its definitions (and the
+        # depths of their scopes). Popping a scope undoes its definitions in the stacks.
+        self.scopes: list[dict[str, SymbolValue]] = []
+        self.symbols: dict[str, list[tuple[int, SymbolValue]]] = {}
+        self.reset(file_path)
+
+    def reset(self, file_path: str) -> None:
+        self.file_path = file_path
+
+        # Built-in identifiers aren't copied, and are looked up after the index. They are in the
+        # same scope as program-level definitions, which can't redefine them.
+        self.scopes = [{}]
+        self.symbols = {}
 
     def new_scope(self) -> None:
         self.scopes.append({})
 
     def unstack_top_scope(self) -> None:
-        self.scopes.pop()
+        for name in self.scopes.pop():
+            stack = self.symbols[name]
+            stack.pop()
+            if len(stack) == 0:
+                del self.symbols[name]
 
     def query(self,
               identifier: str,
@@ -77,18 +95,20 @@ class SymbolTable:
               error: bool = False,
               target_object_name: str = 'Object') -> tuple[None | SymbolValue, bool]:
 
-        identifier_lower = identifier.lower()
+        name = identifier.lower()
+        stack = self.symbols.get(name)
+        if stack is not None:
+            depth, value = stack[-1]
+            return value, depth == len(self.scopes) - 1
 
-        for i, scope in enumerate(reversed(self.scopes)):
-            scope_result = scope.get(identifier_lower)
-            if scope_result is not None:
-                return scope_result, i == 0
+        builtin = BUILTIN_SYMBOLS.get(name)
+        if builtin is not None:
+            return builtin, len(self.scopes) == 1
 
         if error:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'{target_object_name} \'{identifier}\' not found',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -106,7 +126,6 @@ class SymbolTable:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Object with name \'{identifier}\' is not a label',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -115,7 +134,6 @@ class SymbolTable:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Label \'{identifier}\' not in the top-most scope',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -133,7 +151,6 @@ class SymbolTable:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Object with name \'{identifier}\' is not a constant',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -151,7 +168,6 @@ class SymbolTable:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Object with name \'{identifier}\' is not a type',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -169,7 +185,6 @@ class SymbolTable:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Object with name \'{identifier}\' is not a variable',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -187,7 +202,6 @@ class SymbolTable:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Object with name \'{identifier}\' is not a callable',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise SymbolTableError()
@@ -196,14 +210,20 @@ class SymbolTable:
 
     def add(self, value: SymbolValue, lexspan: tuple[int, int]) -> None:
         name = str(value.name) if isinstance(value, LabelDefinition) else value.name
-        query_result, top_scope = self.query(name)
+        name_lower = name.lower()
+        stack = self.symbols.get(name_lower)
+
+        depth: None | int = None # Of the visible definition with the same name
+        if stack is not None:
+            depth = stack[-1][0]
+        elif name_lower in BUILTIN_SYMBOLS:
+            depth = 0
 
-        if query_result is not None:
-            if top_scope:
+        if depth is not None:
+            if depth == len(self.scopes) - 1:
                 print_error(self.file_path,
                             self.lexer.lexdata,
                             f'Object with name \'{name}\' already exists in this scope',
-                            self.lexer.lineno,
                             lexspan[0],
                             lexspan[1] - lexspan[0] + 1)
 
@@ -212,10 +232,9 @@ class SymbolTable:
                 print_error(self.file_path,
                             self.lexer.lexdata,
                             f'Shadowing object with name \'{name}\'',
-                            self.lexer.lineno,
                             lexspan[0],
                             lexspan[1] - lexspan[0] + 1,
                             True)
-                self.scopes[-1][name.lower()] = value
-        else:
-            self.scopes[-1][name.lower()] = value
+
+        self.symbols.setdefault(name_lower, []).append((len(self.scopes) - 1, value))
+        self.scopes[-1][name_lower] = value
@@ -29,6 +29,72 @@ class TypeChecker:
     def __init__(self, file_path: str, lexer: ply.lex.Lexer) -> None:
         self.file_path = file_path
         self.lexer = lexer
+        self.reset(file_path)
+
+    def reset(self, file_path: str) -> None:
+        self.file_path = file_path
+
+        # Canonical range and array types, indexed by their components' identities
+        self.interned_types: dict[tuple[object, ...], RangeType | ArrayType] = {}
+        self.string_type = self.intern_array_type(
+            ArrayType(BuiltInType.CHAR, (RangeType(1, 2048, BuiltInType.INTEGER),))
+        )
+
+    def get_constant_key(self, constant: ConstantValue) -> tuple[object, ...]:
+        # Enumerated constants are unique objects. The type distinguishes between True and 1.
+        if isinstance(constant, EnumeratedTypeConstantValue):
+            return (type(constant), id(constant))
+        else:
+            return (type(constant), constant)
+
+    # Returns a unique object for every distinct type, so that types can be compared by identity.
+    # Built-in types are enumeration members and every enumerated type is a different type, so
+    # they are returned unchanged.
+    def intern_type(self, value: TypeValue) -> TypeValue:
+        if isinstance(value, RangeType):
+            return self.intern_range_type(value)
+        elif isinstance(value, ArrayType):
+            return self.intern_array_type(value)
+        else:
+            return value
+
+    def intern_range_type(self, value: RangeType) -> RangeType:
+        subtype = self.intern_type(value.subtype)
+        key = ('range',
+               *self.get_constant_key(value.start),
+               *self.get_constant_key(value.end),
+               id(subtype))
+
+        interned = self.interned_types.get(key)
+        if not isinstance(interned, RangeType):
+            interned = RangeType(value.start, value.end, subtype)
+            self.interned_types[key] = interned
+        return interned
+
+    def intern_array_type(self, value: ArrayType) -> ArrayType:
+        subtype = self.intern_type(value.subtype)
+        dimensions = tuple(self.intern_range_type(dimension) for dimension in value.dimensions)
+        key = ('array', id(subtype), *map(id, dimensions))
+
+        interned = self.interned_types.get(key)
+        if isinstance(interned, ArrayType):
+            return interned
+
+        # Number of elements between consecutive indices of each dimension
+        strides = [1] * len(dimensions)
+        size = 1
+        for i in reversed(range(len(dimensions))):
+            strides[i] = size
+            size *= self.get_constant_ordinal_value(dimensions[i].end) - \
+                self.get_constant_ordinal_value(dimensions[i].start) + 1
+
+        element_type = subtype
+        if len(dimensions) > 1:
+            element_type = self.intern_array_type(ArrayType(subtype, dimensions[1:]))
+
+        interned = ArrayType(subtype, dimensions, size, tuple(strides), element_type)
+        self.interned_types[key] = interned
+        return interned
 
     def get_constant_type(self, constant: ConstantValue) -> TypeValue:
         if isinstance(constant, bool):
@@ -77,7 +143,6 @@ class TypeChecker:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Invalid type for unary operator \'{operation.operator}\'',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise TypeCheckerError()
@@ -132,14 +197,13 @@ class TypeChecker:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         f'Invalid types for binary operator \'{operation.operator}\'',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise TypeCheckerError()
 
     # 6.4.6. Assignment compatibility
     def can_assign(self, left_type: TypeValue, right_type: TypeValue) -> bool:
-        if left_type == right_type:
+        if left_type is right_type:
             return True
         elif left_type == BuiltInType.REAL and right_type == BuiltInType.INTEGER:
             return True
@@ -154,13 +218,12 @@ class TypeChecker:
                               lexspan: tuple[int, int]) -> TypeValue:
 
         if array_type == BuiltInType.STRING:
-            array_type = ArrayType(BuiltInType.CHAR, [RangeType(1, 2048, BuiltInType.INTEGER)])
+            array_type = self.string_type
 
         if not isinstance(array_type, ArrayType):
             print_error(self.file_path,
                         self.lexer.lexdata,
                         'Indexing value that\'s not an array',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise TypeCheckerError()
@@ -169,15 +232,15 @@ class TypeChecker:
             print_error(self.file_path,
                         self.lexer.lexdata,
                         'Invalid index type',
-                        self.lexer.lineno,
                         lexspan[0],
                         lexspan[1] - lexspan[0] + 1)
             raise TypeCheckerError()
 
-        if len(array_type.dimensions) > 1:
-            return ArrayType(array_type.subtype, array_type.dimensions[1:])
-        else:
-            return array_type.subtype
+        if array_type.element_type is None:
+            array_type = self.intern_array_type(array_type)
+
+        assert array_type.element_type is not None
+        return array_type.element_type
 
     def fail_on_string_indexation(self, variable: VariableUsage, lexspan: tuple[int, int]) -> None:
         current_type = variable.variable.variable_type
@@ -186,7 +249,6 @@ class TypeChecker:
                 print_error(self.file_path,
                             self.lexer.lexdata,
                             'Invalid assignement to string character',
-                            self.lexer.lineno,
                             lexspan[0],
                             lexspan[1] - lexspan[0] + 1)
                 raise TypeCheckerError()
@@ -0,0 +1,128 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from types import MappingProxyType
+from typing import Any, Callable, Literal, Mapping
+
+# pylint: disable-next=wildcard-import,unused-wildcard-import
+from .ast import *
+
+# What a child field holds. Lists may contain None (placeholders left by invalid code).
+ChildKind = Literal['node', 'nodes', 'expression', 'expressions', 'statement', 'statements']
+
+# Fields that own other parts of the syntax tree, for every node class. Fields that refer to
+# definitions owned by another part of the tree (variables, callables and labels) aren't children,
+# so that every node is only visited once.
+CHILD_FIELDS: Mapping[type, tuple[tuple[str, ChildKind], ...]] = MappingProxyType({
+    Program: (('block', 'node'),),
+    Block: (('labels', 'nodes'),
+            ('constants', 'nodes'),
+            ('types', 'nodes'),
+            ('variables', 'nodes'),
+            ('callables', 'nodes'),
+            ('body', 'statements')),
+    LabelDefinition: (),
+    ConstantDefinition: (),
+    TypeDefinition: (),
+    EnumeratedTypeConstantValue: (),
+    RangeType: (),
+    ArrayType: (),
+    VariableDefinition: (),
+    VariableUsage: (('indices', 'expressions'),),
+    CallableDefinition: (('parameters', 'nodes'), ('return_variable', 'node'), ('body', 'node')),
+    CallableCall: (('arguments', 'expressions'),),
+    BinaryOperation: (('left', 'expression'), ('right', 'expression')),
+    UnaryOperation: (('sub', 'expression'),),
+    AssignStatement: (('left', 'node'), ('right', 'expression')),
+    GotoStatement: (),
+    IfStatement: (('condition', 'expression'),
+                  ('when_true', 'statement'),
+                  ('when_false', 'statement')),
+    CaseElement: (('body', 'statement'),),
+    CaseStatement: (('expression', 'expression'), ('elements', 'nodes')),
+    RepeatStatement: (('condition', 'expression'), ('body', 'statements')),
+    WhileStatement: (('condition', 'expression'), ('body', 'statement')),
+    ForStatement: (('initial_expression', 'expression'),
+                   ('final_expression', 'expression'),
+                   ('body', 'statement')),
+})
+
+Transform = Callable[[Expression], Expression]
+
+# Kinds of pending work in transform_expressions
+__NODE = 0
+__STATEMENT = 1
+__EXPRESSION = 2 # Visit the expression's children
+__TRANSFORM = 3  # Transform the expression, after its children
+
+def __get_expression(container: Any, key: str | int) -> Expression:
+    return container[key] if isinstance(key, int) else getattr(container, key)
+
+# Replaces every expression in a (sub)tree by the result of transform, bottom-up: an expression is
+# transformed after its subexpressions (operands, indices and arguments). An explicit stack is used,
+# so that deeply nested expressions and statements don't exhaust Python's stack. Expressions are
+# referred to by their container (node or list) and key (field name or index), so that they can be
+# replaced.
+def transform_expressions(node: Any, transform: Transform) -> None:
+    stack: list[tuple[int, Any, str | int]] = [(__NODE, node, 0)]
+    while stack:
+        work, value, key = stack.pop()
+
+        if work == __NODE:
+            children: list[tuple[int, Any, str | int]] = []
+            for name, kind in CHILD_FIELDS[type(value)]:
+                child = getattr(value, name)
+                if child is None:
+                    continue
+
+                if kind == 'node':
+                    children.append((__NODE, child, 0))
+                elif kind == 'nodes':
+                    children.extend((__NODE, element, 0) for element in child)
+                elif kind == 'expression':
+                    children.append((__EXPRESSION, value, name))
+                elif kind == 'expressions':
+                    children.extend((__EXPRESSION, child, i)
+                                    for i, element in enumerate(child) if element is not None)
+                elif kind == 'statement':
+                    children.append((__STATEMENT, child, 0))
+                elif kind == 'statements':
+                    children.extend((__STATEMENT, element, 0) for element in child)
+
+            stack.extend(reversed(children))
+
+        elif work == __STATEMENT:
+            if isinstance(value[0], list):
+                stack.extend((__STATEMENT, element, 0) for element in reversed(value[0]))
+            else:
+                stack.append((__NODE, value[0], 0))
+
+        elif work == __EXPRESSION:
+            expression = __get_expression(value, key)
+            stack.append((__TRANSFORM, value, key))
+            if type(expression[0]) in CHILD_FIELDS:
+                stack.append((__NODE, expression[0], 0))
+
+        else:
+            expression = __get_expression(value, key)
+            new_expression = transform(expression)
+            if new_expression is not expression:
+                if isinstance(key, int):
+                    value[key] = new_expression
+                else:
+                    setattr(value, key, new_expression)
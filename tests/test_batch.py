@@ -0,0 +1,113 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import pytest
+
+from plpc.batch import compile_files, find_source_files
+from plpc.ewvmpeephole import PeepholeStatistics, parse_peephole_rules
+
+# ------------------------------------------ EASE OF USE ------------------------------------------
+
+PROGRAMS = ['1.pas', '2.pas', '3.pas', '4.pas', '6.pas', '7.pas']
+
+def copy_programs(directory: Path) -> list[str]:
+    ret = []
+    for program in PROGRAMS:
+        shutil.copy(Path('tests/professor') / program, directory / program)
+        ret.append(str(directory / program))
+
+    return ret
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+def test_find_source_files(tmp_path: Path) -> None:
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.pas').touch()
+    (tmp_path / 'b.txt').touch()
+    (tmp_path / 'sub' / 'c.pas').touch()
+
+    assert find_source_files([str(tmp_path)]) == \
+        [str(tmp_path / 'a.pas'), str(tmp_path / 'sub' / 'c.pas')]
+    assert find_source_files([str(tmp_path / '*.pas'), 'other.pas']) == \
+        [str(tmp_path / 'a.pas'), 'other.pas']
+
+@pytest.mark.parametrize('peephole_rules', ['', 'WRITES; WRITELN -> WRITELN; WRITES'])
+def test_parallel_output_matches_serial(tmp_path: Path, peephole_rules: str) -> None:
+    rules = parse_peephole_rules(peephole_rules)
+    serial_directory = tmp_path / 'serial'
+    parallel_directory = tmp_path / 'parallel'
+    serial_directory.mkdir()
+    parallel_directory.mkdir()
+
+    assert compile_files(copy_programs(serial_directory), True, False, 1, peephole_rules=rules) == 0
+    assert compile_files(copy_programs(parallel_directory), True, False, 3, peephole_rules=rules) \
+        == 0
+
+    for program in PROGRAMS:
+        output = Path(program).with_suffix('.ewvm')
+        assert (serial_directory / output).read_text() == (parallel_directory / output).read_text()
+
+def test_parallel_peephole_statistics(tmp_path: Path) -> None:
+    serial_statistics = PeepholeStatistics()
+    parallel_statistics = PeepholeStatistics()
+
+    assert compile_files(copy_programs(tmp_path), True, False, 1,
+                         peephole_statistics=serial_statistics) == 0
+    assert compile_files(copy_programs(tmp_path), True, False, 3,
+                         peephole_statistics=parallel_statistics) == 0
+
+    assert serial_statistics.rules == parallel_statistics.rules
+    assert sum(rule.firings for rule in serial_statistics.rules.values()) > 0
+
+def test_parallel_diagnostics_order(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    paths = []
+    for i in range(4):
+        path = tmp_path / f'{i}.pas'
+        path.write_text(f'program test;\nbegin\n    x{i} := 1 + 1\nend.')
+        paths.append(str(path))
+
+    assert compile_files(paths, False, False, 2) == 4
+
+    diagnostics = capfd.readouterr().err
+    positions = [diagnostics.index(f'\'x{i}\' not found') for i in range(4)]
+    assert positions == sorted(positions)
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_exit_status(tmp_path: Path, jobs: int) -> None:
+    paths = copy_programs(tmp_path)
+    environment = {**os.environ, 'PLPC_CACHE_DIR': ''}
+
+    def run(*args: str) -> int:
+        return subprocess.run([sys.executable, '-m', 'plpc', '-j', str(jobs), *args],
+                              env=environment,
+                              capture_output=True,
+                              check=False).returncode
+
+    assert run(str(tmp_path)) == 0
+    assert run(paths[0], '-o', str(tmp_path / 'a.ewvm')) == 0
+
+    # Failures in a single file, or in any of many files, are reported by the exit status
+    source = 'program wrong;\nvar x: integer;\nbegin\n    x := true\nend.'
+    (tmp_path / 'wrong.pas').write_text(source, encoding='utf-8')
+    assert run(str(tmp_path)) == 1
+    assert run(str(tmp_path / 'wrong.pas'), '-o', str(tmp_path / 'b.ewvm')) == 1
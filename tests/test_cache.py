@@ -0,0 +1,168 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import os
+from pathlib import Path
+import re
+import pytest
+
+from plpc.ast import AssignStatement, BinaryOperation, VariableUsage
+from plpc.cache import FRONTEND_MODULES, BuildCache, BuildCacheEntry
+from plpc.error import Diagnostic
+from plpc.ewvm import export_assembly
+from plpc.ewvmpeephole import parse_peephole_rules
+from plpc.session import CompilerSession
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+def test_cache_key() -> None:
+    cache = BuildCache('', 0)
+
+    assert cache.get_key('source', False, False) == cache.get_key('source', False, False)
+    assert cache.get_key('source', False, False) != cache.get_key('source', True, False)
+    assert cache.get_key('source', False, False) != cache.get_key('source', False, True)
+    assert cache.get_key('source', False, False) != cache.get_key('other', False, False)
+
+def test_frontend_modules() -> None:
+    # Every module imported (directly or not) by the parser, or by the cache itself
+    modules = {'parser.py', 'cache.py'}
+    pending = list(modules)
+    while pending:
+        with open(Path('plpc') / pending.pop(), 'r', encoding='utf-8') as f:
+            for imported in re.findall(r'^from \.(\w+) import', f.read(), re.MULTILINE):
+                if f'{imported}.py' not in modules:
+                    modules.add(f'{imported}.py')
+                    pending.append(f'{imported}.py')
+
+    assert modules <= set(FRONTEND_MODULES)
+
+def test_cache_replay(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    cache = BuildCache(str(tmp_path), 2 ** 20)
+    assert cache.replay(cache.get_key('source', False, False), 'a.pas') is None
+
+    cache.store(cache.get_key('source', False, False), BuildCacheEntry('STOP', []))
+    assert cache.replay(cache.get_key('source', False, False), 'a.pas') == 'STOP'
+    assert cache.replay(cache.get_key('source', False, False), 'b.pas') == 'STOP'
+    assert cache.replay(cache.get_key('source', True, False), 'a.pas') is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # Diagnostics are replayed with the path of the file being compiled
+    warning = Diagnostic('warning', 'message', 'a.pas', 0, 1, 1, 1, 'x')
+    cache.store(cache.get_key('source', False, False), BuildCacheEntry('STOP', [warning]))
+    assert cache.replay(cache.get_key('source', False, False), 'b.pas') == 'STOP'
+    assert capsys.readouterr().err.startswith('b.pas:1:1: warning: message')
+
+def test_cache_trim(tmp_path: Path) -> None:
+    cache = BuildCache(str(tmp_path), 0)
+
+    for i in range(4):
+        key = cache.get_key(str(i), False, False)
+        cache.store(key, BuildCacheEntry('STOP', []))
+        os.utime(cache.get_entry_path(key), (i, i))
+
+    entry_size = os.stat(cache.get_entry_path(cache.get_key('0', False, False))).st_size
+    cache.max_size = entry_size * 2
+    cache.replay(cache.get_key('0', False, False), 'a.pas') # Mark as recently used
+    cache.trim()
+
+    assert cache.replay(cache.get_key('0', False, False), 'a.pas') is not None
+    assert cache.replay(cache.get_key('1', False, False), 'a.pas') is None
+    assert cache.replay(cache.get_key('2', False, False), 'a.pas') is None
+    assert cache.replay(cache.get_key('3', False, False), 'a.pas') is not None
+
+def test_cache_size_index(tmp_path: Path) -> None:
+    cache = BuildCache(str(tmp_path), 2 ** 20)
+    for i in range(2):
+        cache.store(cache.get_key(str(i), False, False), BuildCacheEntry('STOP', []))
+    cache.trim()
+
+    entries = cache.get_entries()
+    assert len(entries) == 2
+    assert cache.read_size() == sum(stat.st_size for stat, _ in entries)
+
+    # Without new entries, the cache isn't scanned, even if it's too large
+    cache = BuildCache(str(tmp_path), 0)
+    cache.trim()
+    assert len(cache.get_entries()) == 2
+
+    # The estimated size exceeds the maximum, so the cache is scanned and trimmed
+    cache.store(cache.get_key('2', False, False), BuildCacheEntry('STOP', []))
+    cache.trim()
+    assert len(cache.get_entries()) == 0
+    assert cache.read_size() == 0
+
+def test_cached_compilation(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    cache = BuildCache(str(tmp_path / 'cache'), 2 ** 20)
+    session = CompilerSession(True)
+
+    outputs = []
+    for i in range(2):
+        output_path = str(tmp_path / f'{i}.ewvm')
+        assert session.compile_file('tests/professor/7.pas', output_path, cache)
+        outputs.append((Path(output_path).read_text(encoding='utf-8'), capsys.readouterr().err))
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert outputs[0] == outputs[1]
+    assert 'Shadowing' in outputs[1][1]
+
+def test_cached_compilation_peephole_rules(tmp_path: Path) -> None:
+    cache = BuildCache(str(tmp_path / 'cache'), 2 ** 20)
+    rules = parse_peephole_rules('WRITES; WRITELN -> WRITELN; WRITES')
+    sessions = [CompilerSession(True), CompilerSession(True, peephole_rules=rules)]
+
+    outputs = []
+    for i, session in enumerate(sessions):
+        output_path = str(tmp_path / f'{i}.ewvm')
+        assert session.compile_file('tests/professor/1.pas', output_path, cache)
+        outputs.append(Path(output_path).read_text(encoding='utf-8'))
+
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert outputs[0] != outputs[1]
+
+def test_ast_cache_identity(tmp_path: Path) -> None:
+    source = 'program test;\nvar x: integer;\nbegin\n    x := x + 1\nend.'
+    cache = BuildCache(str(tmp_path), 2 ** 20)
+
+    CompilerSession(ast_cache=cache).parse(source, 'a.pas')
+    ast = CompilerSession(ast_cache=cache).parse(source, 'a.pas')
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert ast == CompilerSession().parse(source, 'a.pas')
+
+    # Variable usages must still refer to the variable's definition
+    statement, _ = ast.block.body[0]
+    assert isinstance(statement, AssignStatement)
+    expression, _ = statement.right
+    assert isinstance(expression, BinaryOperation)
+    usage, _ = expression.left
+    assert isinstance(usage, VariableUsage)
+
+    assert statement.left.variable is ast.block.variables[0]
+    assert usage.variable is ast.block.variables[0]
+
+@pytest.mark.parametrize('path', ['tests/professor/6.pas', 'tests/professor/7.pas'])
+def test_ast_cache_compilation(tmp_path: Path, path: str) -> None:
+    cache = BuildCache(str(tmp_path), 2 ** 20)
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    for optimize, debug in [(False, False), (True, False), (False, True), (True, True)]:
+        expected = export_assembly(CompilerSession(optimize, debug).compile(source, path))
+        got = export_assembly(CompilerSession(optimize, debug, cache).compile(source, path))
+        assert got == expected
+
+    assert (cache.hits, cache.misses) == (3, 1)
@@ -0,0 +1,65 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import json
+import pytest
+
+from plpc.error import Diagnostic, SourceIndex, collect_diagnostics, configure_diagnostics, \
+    print_error
+from plpc.parser import ParserError
+from plpc.session import CompilerSession
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+def test_source_index() -> None:
+    index = SourceIndex('ab\ncd\n\nef')
+
+    assert [index.get_line_number(offset) for offset in range(9)] == [1, 1, 1, 2, 2, 2, 3, 4, 4]
+    assert index.get_line_bounds(1) == (0, 2)
+    assert index.get_line_bounds(3) == (6, 6)
+    assert index.get_line_bounds(4) == (7, 9)
+
+def test_collect_diagnostics() -> None:
+    source = 'program test;\n    x := y\n'
+    with collect_diagnostics() as diagnostics:
+        print_error('a.pas', source, 'Wrong', 18, 10)
+
+    # The length is cut at the end of the line
+    assert diagnostics == [Diagnostic('error', 'Wrong', 'a.pas', 18, 6, 2, 5, '    x := y')]
+    assert diagnostics[0].format(False) == \
+        'a.pas:2:5: error: Wrong\n     2 |     x := y\n             ^~~~~~\n\n'
+
+def test_diagnostics_line_numbers(capsys: pytest.CaptureFixture[str]) -> None:
+    # The error is only detected after the lexer has moved past the line it is in
+    with pytest.raises(ParserError):
+        CompilerSession().compile('program test;\nvar x: integer;\nbegin\n    x := y\n\n\nend.',
+                                  'a.pas')
+
+    assert 'a.pas:4:10:' in capsys.readouterr().err
+
+def test_json_diagnostics(capsys: pytest.CaptureFixture[str]) -> None:
+    configure_diagnostics(True)
+    try:
+        source = 'program test;\nvar x: integer;\nbegin\n    x := y\nend.'
+        assert CompilerSession().compile_to_text(source, 'a.pas') is None
+    finally:
+        configure_diagnostics(False)
+
+    diagnostics = [ json.loads(line) for line in capsys.readouterr().err.splitlines() ]
+    assert [ d['severity'] for d in diagnostics ] == ['error', 'note']
+    assert (diagnostics[0]['file_path'], diagnostics[0]['line_number']) == ('a.pas', 4)
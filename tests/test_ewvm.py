@@ -0,0 +1,111 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import sys
+import pytest
+
+from plpc.ewvm import CASE_SEARCH_MIN_LABELS, export_assembly
+from plpc.session import CompilerSession
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_deeply_nested_program(optimize: bool) -> None:
+    # Much deeper than Python's recursion limit
+    depth = 5 * sys.getrecursionlimit()
+    chain = ' + '.join(['(x - 1)'] * depth)
+    ladder = ''.join(f'if x = {i} then x := {i} else ' for i in range(depth))
+    source = f'program test;\nvar x: integer;\nbegin\n    x := {chain};\n    {ladder}x := 0\nend.'
+
+    assembly = export_assembly(CompilerSession(optimize).compile(source, 'a.pas'))
+    assert assembly.count('SUB') == depth
+    assert assembly.count('EQUAL') == depth
+
+@pytest.mark.parametrize('short_circuit', [False, True])
+def test_short_circuit(short_circuit: bool) -> None:
+    source = 'program test;\nvar a: array[1..5] of integer;\n    i, x: integer;\nbegin\n' \
+        '    i := 1;\n    while (i <= 5) and (a[i] <> x) do\n        i := i + 1;\n' \
+        '    if (i = 1) or (i = 3) then\n        writeln(i)\nend.'
+
+    session = CompilerSession(short_circuit=short_circuit)
+    assembly = export_assembly(session.compile(source, 'a.pas'))
+    instructions = [line.split()[0] for line in assembly.splitlines()]
+    assert ('AND' in instructions) != short_circuit
+    assert ('OR' in instructions) != short_circuit
+    assert instructions.count('JZ') == (5 if short_circuit else 3) # One for array initialization
+
+def test_deeply_nested_short_circuit() -> None:
+    depth = 5 * sys.getrecursionlimit()
+    condition = ' and '.join(f'(x <> {i})' for i in range(depth))
+    source = f'program test;\nvar x: integer;\nbegin\n    if {condition} then x := 0\nend.'
+
+    assembly = export_assembly(CompilerSession(short_circuit=True).compile(source, 'a.pas'))
+    assert assembly.count('JZ') == depth
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_branch_inversion(optimize: bool) -> None:
+    source = 'program test;\nvar x: integer;\n    c: char;\nbegin\n    readln(c);\n' \
+        '    if (x < 1) or (x > 5) then\n        x := 0;\n' \
+        '    if x <> 3 then\n        writeln(\'then\')\n    else\n        writeln(\'else\')\nend.'
+
+    session = CompilerSession(optimize, short_circuit=True)
+    assembly = export_assembly(session.compile(source, 'a.pas'))
+    instructions = [line.split()[0] for line in assembly.splitlines()]
+    if optimize:
+        # x < 1 is jumped on when true (SUPEQ), and the branches on x <> 3 are swapped
+        assert 'NOT' not in instructions
+        assert instructions.count('SUPEQ') == 1
+        assert assembly.index('else') < assembly.index('then')
+    else:
+        assert instructions.count('NOT') == 3
+        assert assembly.index('then') < assembly.index('else')
+
+@pytest.mark.parametrize('optimize', [False, True])
+@pytest.mark.parametrize('arms', [3, 200])
+def test_case_dispatch(optimize: bool, arms: int) -> None:
+    elements = ';\n'.join(f'        {i}: x := {i}' for i in range(arms))
+    source = f'program test;\nvar x: integer;\nbegin\n    read(x);\n    case x of\n{elements}\n' \
+        '    end\nend.'
+
+    assembly = export_assembly(CompilerSession(optimize).compile(source, 'a.pas'))
+    instructions = [line.split()[0] for line in assembly.splitlines()]
+    if not optimize or arms < CASE_SEARCH_MIN_LABELS:
+        # Chain of comparisons
+        assert instructions.count('OR') == arms
+    else:
+        # Binary search, with the bounds only checked at the ends
+        assert 'OR' not in instructions
+        assert instructions.count('INF') == arms - 1
+        assert instructions.count('SUPEQ') == instructions.count('INFEQ') == 1
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_while_rotation(optimize: bool) -> None:
+    source = 'program test;\nvar x: integer;\n    b: boolean;\nbegin\n    read(x);\n' \
+        '    while x <> 0 do\n        x := x - 1;\n    while b do\n        b := false\nend.'
+
+    assembly = export_assembly(CompilerSession(optimize).compile(source, 'a.pas'))
+    instructions = [line.split()[0] for line in assembly.splitlines()]
+    if optimize:
+        # x <> 0 is checked at the end of the loop, jumping back on EQUAL without a NOT. The loop
+        # on b isn't rotated, as jumping back while b is true would need a NOT.
+        assert 'NOT' not in instructions
+        assert instructions.count('JUMP') == 2
+        assert instructions.index('JUMP') < instructions.index('EQUAL')
+    else:
+        assert instructions.count('NOT') == 1
+        assert instructions.index('EQUAL') < instructions.index('JUMP')
@@ -0,0 +1,126 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from plpc.ewvm import Comment, EWVMProgram, EWVMStatement, Label
+from plpc.ewvmcontrolflow import apply_ewvm_control_flow_cleanup
+
+def test_jump_threading() -> None:
+    label_1, label_2, label_3 = Label('SYS1'), Label('SYS2'), Label('SYS3')
+    comment = Comment('IF')
+    before: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', label_1),
+        EWVMStatement('WRITELN'),
+        EWVMStatement('STOP'),
+        label_1,
+        comment,
+        label_2,
+        EWVMStatement('JUMP', label_3),
+        EWVMStatement('WRITELN'),
+        label_3,
+        EWVMStatement('STOP')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', label_3),
+        EWVMStatement('WRITELN'),
+        EWVMStatement('STOP'),
+        label_3,
+        EWVMStatement('STOP')
+    ]
+
+    after = apply_ewvm_control_flow_cleanup(before)
+    assert after == expected
+
+def test_jump_threading_infinite_loop() -> None:
+    label_1, label_2 = Label('SYS1'), Label('SYS2')
+    before: EWVMProgram = [
+        EWVMStatement('JUMP', label_1),
+        label_2,
+        EWVMStatement('JUMP', label_1),
+        label_1,
+        EWVMStatement('JUMP', label_2)
+    ]
+    expected: EWVMProgram = [
+        label_2,
+        EWVMStatement('JUMP', label_2)
+    ]
+
+    after = apply_ewvm_control_flow_cleanup(before)
+    assert after == expected
+
+def test_jumps_to_next() -> None:
+    else_label, end_label = Label('SYS1'), Label('SYS2')
+    comment = Comment('Empty')
+    before: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', else_label),
+        EWVMStatement('WRITELN'),
+        EWVMStatement('JUMP', end_label),
+        else_label,
+        end_label,
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', end_label),
+        comment,
+        end_label,
+        EWVMStatement('STOP')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', else_label),
+        EWVMStatement('WRITELN'),
+        else_label,
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('POP', 1),
+        comment,
+        EWVMStatement('STOP')
+    ]
+
+    after = apply_ewvm_control_flow_cleanup(before)
+    assert after == expected
+
+def test_unreachable_code() -> None:
+    start_label, end_label = Label('SYS1'), Label('SYS2')
+    before: EWVMProgram = [
+        start_label,
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', end_label),
+        EWVMStatement('JUMP', start_label),
+        EWVMStatement('JZ', start_label),
+        end_label,
+        EWVMStatement('STOP'),
+        EWVMStatement('WRITELN'),
+        Label('SYS3'),
+        EWVMStatement('WRITELN'),
+        Label('FNf'),
+        EWVMStatement('RETURN'),
+        EWVMStatement('WRITELN')
+    ]
+    expected: EWVMProgram = [
+        start_label,
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', end_label),
+        EWVMStatement('JUMP', start_label),
+        end_label,
+        EWVMStatement('STOP'),
+        before[10],
+        EWVMStatement('RETURN')
+    ]
+
+    after = apply_ewvm_control_flow_cleanup(before)
+    assert after == expected
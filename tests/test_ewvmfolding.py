@@ -0,0 +1,162 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from plpc.ewvm import EWVMProgram, EWVMStatement, Label
+from plpc.ewvmfolding import apply_ewvm_constant_folding
+
+def test_constant_operands() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('PUSHI', 5),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('SUB'),
+        EWVMStatement('PUSHI', 2),
+        EWVMStatement('MUL'),
+        EWVMStatement('PUSHI', 8),
+        EWVMStatement('EQUAL'),
+        EWVMStatement('NOT')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHI', 0)
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == expected
+
+def test_constant_operands_not_folded() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('PUSHI', -7),
+        EWVMStatement('PUSHI', 2),
+        EWVMStatement('DIV'),
+        EWVMStatement('PUSHI', 2 ** 30),
+        EWVMStatement('PUSHI', 4),
+        EWVMStatement('MUL'),
+        EWVMStatement('PUSHF', 1.0),
+        EWVMStatement('PUSHF', 2.0),
+        EWVMStatement('FADD')
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == before
+
+def test_identities() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('SUB'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('MUL'),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('ADD'),
+        EWVMStatement('ADD')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('ADD')
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == expected
+
+def test_offsets() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHI', 3),
+        EWVMStatement('SUB'),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('SUB')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('PUSHI', -2),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHG', 1)
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == expected
+
+def test_negations() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('SUB'),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('SUB'),
+        EWVMStatement('SUB'),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('SUB'),
+        EWVMStatement('STOREG', 0)
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('SUB'),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHG', 1),
+        EWVMStatement('SUB'),
+        EWVMStatement('STOREG', 0)
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == expected
+
+def test_constant_conditions() -> None:
+    label_a, label_b = Label('A'), Label('B')
+    before: EWVMProgram = [
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('JZ', label_a),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('JZ', label_b)
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('JUMP', label_b)
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == expected
+
+def test_unknown_stack_usage() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('PUSHI', 1),
+        Label('A'),
+        EWVMStatement('PUSHI', 2),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('CALL'),
+        EWVMStatement('PUSHI', 2),
+        EWVMStatement('ADD'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('DUP', 1),
+        EWVMStatement('ADD')
+    ]
+
+    after = apply_ewvm_constant_folding(before)
+    assert after == before
@@ -16,8 +16,12 @@
 #
 # --------------------------------------------------------------------------------------------------
 
-from plpc.ewvm import EWVMStatement, EWVMProgram
-from plpc.ewvmpeephole import apply_ewvm_peephole_optimizations
+from pathlib import Path
+import pytest
+
+from plpc.ewvm import EWVMStatement, EWVMProgram, Label
+from plpc.ewvmpeephole import PeepholeOptimizer, PeepholeRuleError, PeepholeStatistics, \
+    apply_ewvm_peephole_optimizations, get_loop_depths, load_peephole_rules, parse_peephole_rules
 
 def test_multiple_push_single_integer() -> None:
     before: EWVMProgram = [
@@ -249,3 +253,197 @@ def test_multiplication_float_2() -> None:
     after = apply_ewvm_peephole_optimizations(before)
     print(after[0], after[1])
     assert after == expected
+
+def test_store_push_repeated() -> None:
+    before: EWVMProgram = [
+        EWVMStatement('STOREL', 100),
+        EWVMStatement('PUSHL', 100),
+        EWVMStatement('PUSHL', 100),
+        EWVMStatement('ADD')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('DUP', 1),
+        EWVMStatement('DUP', 1),
+        EWVMStatement('STOREL', 100),
+        EWVMStatement('ADD')
+    ]
+
+    after = apply_ewvm_peephole_optimizations(before)
+    assert after == expected
+
+def test_rules_bindings() -> None:
+    optimizer = PeepholeOptimizer(parse_peephole_rules('SWAP; @a; @a -> @a; @a'))
+    before: EWVMProgram = [
+        EWVMStatement('SWAP'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('SWAP'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('PUSHI', 2),
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('SWAP'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('PUSHI', 2),
+    ]
+
+    assert optimizer.optimize(before) == expected
+
+def test_rules_labels_not_matched() -> None:
+    optimizer = PeepholeOptimizer(parse_peephole_rules('JUMP $l; @x -> JUMP $l'))
+    before: EWVMProgram = [
+        EWVMStatement('JUMP', Label('L')),
+        Label('L'),
+        EWVMStatement('PUSHI', 1)
+    ]
+
+    assert optimizer.optimize(before) == before
+
+def test_rules_guard_and_expressions() -> None:
+    optimizer = PeepholeOptimizer(parse_peephole_rules("""
+        # Constant folding
+        PUSHI $a; PUSHI $b; DIV -> PUSHI ($a // $b) if $a >= 0 and $b > 0
+        PUSHI $a; PUSHI $b; INFEQ -> PUSHI ($a <= $b)
+    """))
+    before: EWVMProgram = [
+        EWVMStatement('PUSHI', 7),
+        EWVMStatement('PUSHI', 2),
+        EWVMStatement('DIV'),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('DIV'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('PUSHI', 2),
+        EWVMStatement('INFEQ')
+    ]
+    expected: EWVMProgram = [
+        EWVMStatement('PUSHI', 3),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('DIV'),
+        EWVMStatement('PUSHI', 1)
+    ]
+
+    assert optimizer.optimize(before) == expected
+
+def test_rules_evaluation_errors() -> None:
+    rules = parse_peephole_rules('PUSHS $a; PUSHI $b; ADD -> PUSHI ($a + $b)')
+    optimizer = PeepholeOptimizer(rules)
+    before: EWVMProgram = [
+        EWVMStatement('PUSHS', '"a"'),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('ADD')
+    ]
+
+    assert optimizer.optimize(before) == before
+
+@pytest.mark.parametrize('text', [
+    'PUSHI $a -> PUSHI $a',
+    'PUSHI $a -> PUSHI ($a + 1)',
+    'PUSHI $a; POP 1 -> PUSHI $a; PUSHI $a; POP 2\nPUSHI $a; PUSHI $a; POP 2 -> PUSHI $a; POP 1'
+])
+def test_rules_not_terminating(text: str) -> None:
+    optimizer = PeepholeOptimizer(parse_peephole_rules(text))
+    with pytest.raises(PeepholeRuleError, match='stop rewriting'):
+        optimizer.optimize([EWVMStatement('PUSHI', 1), EWVMStatement('POP', 1)])
+
+@pytest.mark.parametrize('text', [
+    'PUSHI 0',
+    'PUSHI 0 -> -> PUSHN 1',
+    '-> PUSHN 1',
+    'PUSHI 0; ; PUSHI 0 -> PUSHN 2',
+    'push 0 -> PUSHN 1',
+    'PUSHI 0 -> PUSHI|PUSHF 0',
+    'PUSHI 0 -> PUSHI $a',
+    'PUSHI 0 -> @a',
+    'PUSHI ($a) -> PUSHI 0',
+    'PUSHI $a -> PUSHI ($a + b)',
+    'PUSHI $a -> PUSHI (__import__("os"))',
+    'PUSHI $a -> PUSHI ($a +)',
+    'PUSHI $a -> PUSHI 0 if $b',
+    'PUSHI [1] -> PUSHI 0'
+])
+def test_rules_invalid(text: str) -> None:
+    with pytest.raises(PeepholeRuleError):
+        parse_peephole_rules(text)
+
+def test_rules_error_location() -> None:
+    with pytest.raises(PeepholeRuleError, match='^rules.txt:3: '):
+        parse_peephole_rules('# Comment\n\nPUSHI 0 -> PUSHN 1;', 'rules.txt')
+
+def test_rules_file(tmp_path: Path) -> None:
+    rules_path = str(tmp_path / 'rules.txt')
+    with open(rules_path, 'w', encoding='utf-8') as f:
+        f.write('PUSHI 1; MUL ->\n')
+
+    optimizer = PeepholeOptimizer(load_peephole_rules(rules_path))
+    assert not optimizer.optimize([EWVMStatement('PUSHI', 1), EWVMStatement('MUL')])
+
+    with pytest.raises(PeepholeRuleError):
+        load_peephole_rules(str(tmp_path / 'missing.txt'))
+
+def test_loop_depths() -> None:
+    outer, inner, end = Label('OUTER'), Label('INNER'), Label('END')
+    program: EWVMProgram = [
+        EWVMStatement('PUSHI', 0),
+        outer,
+        EWVMStatement('JZ', end),
+        inner,
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('JZ', inner),
+        EWVMStatement('JUMP', outer),
+        end,
+        EWVMStatement('STOP')
+    ]
+
+    assert get_loop_depths(program) == [0, 1, 1, 2, 2, 2, 1, 0, 0]
+
+def test_statistics() -> None:
+    loop = Label('LOOP')
+    before: EWVMProgram = [
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHI', 0),
+        loop,
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('STOREG', 0),
+        EWVMStatement('PUSHG', 0),
+        EWVMStatement('JZ', loop)
+    ]
+
+    statistics = PeepholeStatistics()
+    assert apply_ewvm_peephole_optimizations(before) == \
+        PeepholeOptimizer().optimize(before, statistics)
+
+    zeros = statistics.rules['PUSHI|PUSHF 0; PUSHI|PUSHF 0 -> PUSHN 2']
+    assert (zeros.firings, zeros.removed, zeros.added, zeros.savings) == (2, 4, 2, 1 + 10)
+
+    more_zeros = statistics.rules['PUSHN $n; PUSHI|PUSHF 0 -> PUSHN ($n + 1)']
+    assert (more_zeros.firings, more_zeros.savings) == (1, 10)
+
+    store = statistics.rules['STOREG $n; PUSHG $n -> DUP 1; STOREG $n']
+    assert (store.firings, store.removed, store.added, store.savings) == (1, 2, 2, 0)
+
+def test_statistics_unchanged_instructions() -> None:
+    rules = parse_peephole_rules('PUSHF 0; @next -> PUSHI 0; @next\n'
+                                 '@previous; POP 1; POP 1 -> @previous; POP 2')
+    before: EWVMProgram = [
+        EWVMStatement('PUSHF', 0.0),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('POP', 1),
+        EWVMStatement('POP', 1)
+    ]
+
+    statistics = PeepholeStatistics()
+    assert PeepholeOptimizer(rules).optimize(before, statistics) == [
+        EWVMStatement('PUSHI', 0),
+        EWVMStatement('PUSHI', 1),
+        EWVMStatement('POP', 2)
+    ]
+
+    float_zero = statistics.rules['PUSHF 0; @next -> PUSHI 0; @next']
+    assert (float_zero.firings, float_zero.removed, float_zero.added) == (1, 1, 1)
+
+    pops = statistics.rules['@previous; POP 1; POP 1 -> @previous; POP 2']
+    assert (pops.firings, pops.removed, pops.added, pops.savings) == (1, 2, 1, 1)
@@ -157,6 +157,11 @@ def test_nested_comment_9() -> None:
 def test_nested_comment_10() -> None:
     pass
 
+def test_multiline_comment_line_numbers() -> None:
+    lexer = create_lexer('<test-input>')
+    lexer.input('{ a\nb } x\n(* c\n\nd *) y')
+    assert [ (t.value, t.lineno) for t in lexer ] == [('x', 2), ('y', 5)]
+
 # Special Symbols
 
 @successful_test('<>')
@@ -16,8 +16,12 @@
 #
 # -------------------------------------------------------------------------------------------------
 
+from pathlib import Path
 from typing import Any, Callable
-from plpc.parser import ParserError, create_parser
+import pytest
+
+from plpc.ast import AssignStatement, BuiltInType, CallableCall, RangeType
+from plpc.parser import ParserError, _Parser, create_parser
 
 # ------------------------------------------ EASE OF USE ------------------------------------------
 
@@ -62,3 +66,104 @@ def test_program_definition_1() -> None:
     return None
 
 # -------------------------------------- WHOLE PROGRAM TESTS --------------------------------------
+
+def test_builtin_calls() -> None:
+    source = 'program test;\nvar x: integer;\nfunction f(a: integer): integer;\nbegin\n' \
+        '    f := a\nend;\nbegin\n    x := f(1);\n    writeln(x)\nend.'
+    ast = create_parser('a.pas').parse(source)
+
+    assignment, _ = ast.block.body[0]
+    call, _ = ast.block.body[1]
+    assert isinstance(assignment, AssignStatement) and isinstance(assignment.right[0], CallableCall)
+    assert isinstance(call, CallableCall)
+
+    assert not assignment.right[0].builtin
+    assert call.builtin
+
+def test_parse_without_tracking(capsys: pytest.CaptureFixture[str]) -> None:
+    # Diagnostics use the positions of non-terminals, which must be the same in both modes
+    parser = _Parser('a.pas', 'program')
+    source = 'program test;\ntype r = 5..1;\nvar x: integer;\nbegin\n    x := 1\nend.'
+
+    outputs = []
+    for tracking in [True, False]:
+        parser.reset('a.pas')
+        with pytest.raises(ParserError):
+            parser.parse(source, tracking)
+        outputs.append(capsys.readouterr().err)
+
+    assert 'a.pas:2:10:' in outputs[0]
+    assert outputs[0] == outputs[1]
+
+def test_parse_warnings_without_tracking(capsys: pytest.CaptureFixture[str]) -> None:
+    # Warnings don't need a second parse with tracking, and are the same in both modes
+    parser = _Parser('a.pas', 'program')
+    source = 'program test(input, output);\nvar a: packed array[1..2] of integer;\n' \
+        'procedure p(a: integer);\nbegin\n    a := 0\nend;\nbegin\n    a[1] := 1\nend.'
+
+    parses = 0
+    parse_function = parser.parse_function
+    def counted_parse_function(*args: Any, **kwargs: Any) -> Any:
+        nonlocal parses
+        parses += 1
+        return parse_function(*args, **kwargs)
+    parser.parse_function = counted_parse_function
+
+    outputs = []
+    for tracking in [True, False]:
+        parser.reset('a.pas')
+        parser.parse(source, tracking)
+        outputs.append(capsys.readouterr().err)
+
+    assert parses == 2
+    assert outputs[0].count('warning') == 3
+    assert outputs[0] == outputs[1]
+
+def test_parse_range_type_warning_without_tracking(capsys: pytest.CaptureFixture[str]) -> None:
+    # The warning on range types needs the positions of non-terminals
+    parser = _Parser('a.pas', 'program')
+    source = 'program test;\nvar x: 1..5;\nbegin\n    x := 1\nend.'
+
+    outputs = []
+    for tracking in [True, False]:
+        parser.reset('a.pas')
+        parser.parse(source, tracking)
+        outputs.append(capsys.readouterr().err)
+
+    assert 'a.pas:2:8: warning' in outputs[0]
+    assert outputs[0] == outputs[1]
+
+def test_parse_interned_range_type() -> None:
+    parser = _Parser('a.pas', 'range-type')
+    got = parser.parse('1..5')
+
+    assert got is parser.type_checker.intern_range_type(RangeType(1, 5, BuiltInType.INTEGER))
+
+# ------------------------------------------ TABLE CACHE ------------------------------------------
+
+CACHE_TEST_SOURCE = 'program test; var x: integer; begin x := 1 + 2 end.'
+
+def test_table_cache_warm(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('PLPC_CACHE_DIR', str(tmp_path))
+
+    cold = create_parser('<test-input>').parse(CACHE_TEST_SOURCE)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    warm = create_parser('<test-input>').parse(CACHE_TEST_SOURCE)
+    assert cold == warm
+
+def test_table_cache_corrupted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('PLPC_CACHE_DIR', str(tmp_path))
+
+    expected = create_parser('<test-input>').parse(CACHE_TEST_SOURCE)
+    for table_file in tmp_path.iterdir():
+        table_file.write_bytes(b'corrupted')
+
+    assert create_parser('<test-input>').parse(CACHE_TEST_SOURCE) == expected
+
+def test_table_cache_disabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('PLPC_CACHE_DIR', '')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+    create_parser('<test-input>').parse(CACHE_TEST_SOURCE)
+    assert len(list(tmp_path.iterdir())) == 0
@@ -0,0 +1,75 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from multiprocessing import Process
+from pathlib import Path
+import time
+from typing import Iterator
+import pytest
+
+from plpc.client import compile_remotely
+from plpc.ewvm import export_assembly
+from plpc.server import run_server
+from plpc.session import CompilerSession
+
+# ------------------------------------------ EASE OF USE ------------------------------------------
+
+@pytest.fixture(name='socket_path')
+def fixture_socket_path(tmp_path: Path) -> Iterator[str]:
+    socket_path = str(tmp_path / 'plpc.sock')
+
+    server = Process(target=run_server, args=(socket_path,))
+    server.start()
+
+    try:
+        for _ in range(200):
+            if Path(socket_path).exists():
+                break
+            time.sleep(0.05)
+
+        yield socket_path
+    finally:
+        server.terminate()
+        server.join()
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+@pytest.mark.parametrize('optimize,debug,short_circuit',
+                         [(False, False, False), (True, False, False), (True, True, False),
+                          (True, False, True)])
+def test_server_output(socket_path: str, optimize: bool, debug: bool, short_circuit: bool) -> None:
+    for i in [1, 2, 3, 4, 6, 7]:
+        path = f'tests/professor/{i}.pas'
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        session = CompilerSession(optimize, debug, short_circuit=short_circuit)
+        expected = export_assembly(session.compile(source, path))
+        assert compile_remotely(socket_path, source, path, optimize, debug, short_circuit)[0] == \
+            expected
+
+def test_server_diagnostics(socket_path: str) -> None:
+    assembly, diagnostics = compile_remotely(socket_path,
+                                             'program test;\nbegin\n    x := 1 + 1\nend.',
+                                             'remote.pas',
+                                             False,
+                                             False)
+
+    assert assembly is None
+    assert diagnostics[0].file_path == 'remote.pas' and diagnostics[0].line_number == 3
+    assert diagnostics[-1].message == 'Parser failed. Aborting ...'
@@ -0,0 +1,64 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+import pytest
+
+from plpc.ewvm import export_assembly
+from plpc.parser import ParserError
+from plpc.session import CompilerSession
+
+# ------------------------------------------ EASE OF USE ------------------------------------------
+
+def read_program(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+PROGRAMS = [f'tests/professor/{i}.pas' for i in range(1, 8)] + [
+    'tests/programs/casestatement.pas',
+    'tests/programs/io.pas',
+    'tests/programs/nestedfor.pas',
+    'tests/programs/optimizations.pas'
+]
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_session_reuse(optimize: bool) -> None:
+    session = CompilerSession(optimize)
+
+    for path in PROGRAMS:
+        source = read_program(path)
+
+        got = export_assembly(session.compile(source, path))
+        expected = export_assembly(CompilerSession(optimize).compile(source, path))
+        assert got == expected
+
+def test_session_recovers_from_errors(capsys: pytest.CaptureFixture[str]) -> None:
+    session = CompilerSession()
+    source = read_program('tests/professor/1.pas')
+
+    with pytest.raises(ParserError):
+        session.compile('program test;\nvar x: integer;\nbegin\n    x := y + 1\nend.', 'first.pas')
+    assert 'first.pas:4:' in capsys.readouterr().err
+
+    # No state (errors, line numbers, symbols) from the failed compilation is kept
+    session.compile(source, 'second.pas')
+    with pytest.raises(ParserError):
+        session.compile('program test;\nbegin\n    x := 1 + 1\nend.', 'third.pas')
+
+    assert 'third.pas:3:' in capsys.readouterr().err
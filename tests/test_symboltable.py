@@ -20,6 +20,7 @@ from typing import Callable, Dict, Tuple
 import pytest
 
 from plpc.symboltable import (
+    BUILTIN_SYMBOLS,
     SymbolTable,
     SymbolTableError,
     SymbolValue,
@@ -72,7 +73,11 @@ def successful_test() -> Callable[[Callable[[SymbolTable], ExpectedMapping]], Ca
             st = SymbolTable("<test-input>", DummyLexer())
             expected_map = test(st)
 
+            # Built-in identifiers are a shared layer under the program's scope
             got_map: ExpectedMapping = {}
+            if st.scopes:
+                got_map = { name: (symval, 0) for name, symval in BUILTIN_SYMBOLS.items() }
+
             for depth, scope_dict in enumerate(st.scopes):
                 for name, symval in scope_dict.items():
                     got_map[name] = (symval, depth)
@@ -92,6 +97,27 @@ def test_builtin_symbols_present(symtab: SymbolTable) -> ExpectedMapping:
     # pylint: disable=unused-argument
     return _BUILTIN_SYMBOLS
 
+@successful_test()
+def test_reset(symtab: SymbolTable) -> ExpectedMapping:
+    symtab.add(VariableDefinition("x", BuiltInType.REAL, False), (0, 0))
+    symtab.new_scope()
+    symtab.add(TypeDefinition("integer", BuiltInType.REAL), (0, 0))
+
+    # Built-in symbols are shared, and aren't copied or modified
+    symtab.reset("<other-input>")
+    assert symtab.scopes == [{}] and symtab.symbols == {}
+    assert symtab.query_type("integer") == (BUILTIN_SYMBOLS["integer"], True)
+    assert symtab.query("x") == (None, False)
+
+    return _BUILTIN_SYMBOLS
+
+@successful_test()
+def test_redeclare_builtin_raises(symtab: SymbolTable) -> ExpectedMapping:
+    with pytest.raises(SymbolTableError):
+        symtab.add(VariableDefinition("integer", BuiltInType.REAL, False), (0, 0))
+
+    return _BUILTIN_SYMBOLS
+
 @successful_test()
 def test_redeclare_same_scope_raises(symtab: SymbolTable) -> ExpectedMapping:
     symtab.add(TypeDefinition("MyType", BuiltInType.INTEGER), (0,0))
@@ -126,6 +152,61 @@ def test_shadowing(symtab: SymbolTable) -> ExpectedMapping:
         "a": (VariableDefinition("a", BuiltInType.REAL, False), 1)
     }
 
+@successful_test()
+def test_shadowing_restored(symtab: SymbolTable) -> ExpectedMapping:
+    outer = VariableDefinition("a", BuiltInType.INTEGER, False)
+    inner = VariableDefinition("a", BuiltInType.REAL, False)
+    symtab.add(outer, (0, 0))
+
+    symtab.new_scope()
+    symtab.add(inner, (0, 0))
+    assert symtab.query_variable("a")[0] is inner
+    assert symtab.symbols["a"] == [(0, outer), (1, inner)]
+
+    # Popping the inner scope makes the outer definition visible again
+    symtab.unstack_top_scope()
+    assert symtab.query_variable("a") == (outer, True)
+    assert symtab.symbols["a"] == [(0, outer)]
+
+    return {
+        **_BUILTIN_SYMBOLS,
+        "a": (outer, 0)
+    }
+
+@successful_test()
+def test_redeclare_keeps_index(symtab: SymbolTable) -> ExpectedMapping:
+    outer = VariableDefinition("a", BuiltInType.INTEGER, False)
+    inner = VariableDefinition("a", BuiltInType.REAL, False)
+    symtab.add(outer, (0, 0))
+    symtab.new_scope()
+    symtab.add(inner, (0, 0))
+
+    with pytest.raises(SymbolTableError):
+        symtab.add(VariableDefinition("a", BuiltInType.CHAR, False), (0, 0))
+    assert symtab.symbols["a"] == [(0, outer), (1, inner)]
+    assert symtab.query_variable("a")[0] is inner
+
+    return {
+        **_BUILTIN_SYMBOLS,
+        "a": (inner, 1)
+    }
+
+@successful_test()
+def test_case_insensitive(symtab: SymbolTable) -> ExpectedMapping:
+    variable = VariableDefinition("MyVar", BuiltInType.INTEGER, False)
+    symtab.add(variable, (0, 0))
+
+    assert symtab.query_variable("myvar")[0] is variable
+    assert symtab.query_variable("MYVAR")[0] is variable
+    assert symtab.query_type("Integer")[0] is BUILTIN_SYMBOLS["integer"]
+    with pytest.raises(SymbolTableError):
+        symtab.add(VariableDefinition("MYVAR", BuiltInType.REAL, False), (0, 0))
+
+    return {
+        **_BUILTIN_SYMBOLS,
+        "myvar": (variable, 0)
+    }
+
 @successful_test()
 def test_shadow_builtin_type(symtab: SymbolTable) -> ExpectedMapping:
     orig_def, _ = symtab.query_type("integer")
@@ -205,20 +205,20 @@ def test_can_assign() -> ExpectedMapping:
 
 @successful_test()
 def test_type_after_indexation() -> ExpectedMapping:
-    array1 = ArrayType(BuiltInType.INTEGER, [
-        RangeType(start=1, end=10, subtype=BuiltInType.INTEGER)
-    ])
-    array2 = ArrayType(BuiltInType.REAL, [
+    array1 = ArrayType(BuiltInType.INTEGER, (
+        RangeType(start=1, end=10, subtype=BuiltInType.INTEGER),
+    ))
+    array2 = ArrayType(BuiltInType.REAL, (
         RangeType(start=1, end=5, subtype=BuiltInType.INTEGER),
         RangeType(start=1, end=5, subtype=BuiltInType.INTEGER)
-    ])
+    ))
 
     return {
         "type_after_indexation": [
             ( (array1, BuiltInType.INTEGER, (0,1)), BuiltInType.INTEGER ),
-            ( (array2, BuiltInType.INTEGER, (0,1)), ArrayType(BuiltInType.REAL, [
-                RangeType(1,5, BuiltInType.INTEGER)
-            ]) ),
+            ( (array2, BuiltInType.INTEGER, (0,1)), ArrayType(BuiltInType.REAL, (
+                RangeType(1,5, BuiltInType.INTEGER),
+            )) ),
             ( (BuiltInType.STRING, BuiltInType.INTEGER, (0,1)), BuiltInType.CHAR ),
             ( (array1, BuiltInType.REAL, (0,1)), TypeCheckerError ),
             ( (BuiltInType.BOOLEAN, BuiltInType.INTEGER, (0,1)), TypeCheckerError ),
@@ -235,10 +235,10 @@ def test_fail_on_string_indexation() -> ExpectedMapping:
     )
 
     var2 = VariableUsage(
-        VariableDefinition("tmp", ArrayType(BuiltInType.INTEGER, [
-            RangeType(1, 5, BuiltInType.INTEGER)
-        ]), False),
-        ArrayType(BuiltInType.INTEGER, [RangeType(1, 5, BuiltInType.INTEGER)]),
+        VariableDefinition("tmp", ArrayType(BuiltInType.INTEGER, (
+            RangeType(1, 5, BuiltInType.INTEGER),
+        )), False),
+        ArrayType(BuiltInType.INTEGER, (RangeType(1, 5, BuiltInType.INTEGER),)),
         [(3, BuiltInType.INTEGER)]
     )
 
@@ -248,3 +248,41 @@ def test_fail_on_string_indexation() -> ExpectedMapping:
             ( (var2, (0,1)), None ),
         ],
     }
+
+def test_intern_type() -> None:
+    tc = TypeChecker("<test-input>", DummyLexer())
+
+    array1 = tc.intern_type(ArrayType(BuiltInType.REAL, (
+        RangeType(1, 4, BuiltInType.INTEGER),
+        RangeType("a", "c", BuiltInType.CHAR),
+    )))
+    array2 = tc.intern_type(ArrayType(BuiltInType.REAL, (
+        RangeType(1, 4, BuiltInType.INTEGER),
+        RangeType("a", "c", BuiltInType.CHAR),
+    )))
+    array3 = tc.intern_type(ArrayType(BuiltInType.REAL, (
+        RangeType(True, True, BuiltInType.BOOLEAN),
+        RangeType("a", "c", BuiltInType.CHAR),
+    )))
+
+    assert isinstance(array1, ArrayType)
+    assert array1 is array2
+    assert array1 is not array3
+    assert array1.size == 12
+    assert array1.strides == (3, 1)
+
+    # Types that weren't interned know their layout too
+    array4 = ArrayType(BuiltInType.REAL, (
+        RangeType(1, 4, BuiltInType.INTEGER),
+        RangeType("a", "c", BuiltInType.CHAR),
+    ))
+    assert (array4.size, array4.strides) == (12, (3, 1))
+
+    element_type = tc.type_after_indexation(array1, BuiltInType.INTEGER, (0, 1))
+    assert element_type is tc.intern_type(ArrayType(BuiltInType.REAL, (
+        RangeType("a", "c", BuiltInType.CHAR),
+    )))
+    assert tc.can_assign(
+        element_type,
+        tc.type_after_indexation(array2, BuiltInType.INTEGER, (0, 1))
+    )
@@ -0,0 +1,77 @@
+# -------------------------------------------- LICENSE --------------------------------------------
+#
+# Copyright 2025 Humberto Gomes, José Lopes, José Matos
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -------------------------------------------------------------------------------------------------
+
+from dataclasses import fields, is_dataclass
+import inspect
+
+import plpc.ast
+from plpc.ast import AssignStatement, BinaryOperation, BuiltInType, Expression, VariableUsage
+from plpc.optimizer import optimize_ast
+from plpc.session import CompilerSession
+from plpc.visitor import CHILD_FIELDS, transform_expressions
+
+# ------------------------------------------ EASE OF USE ------------------------------------------
+
+SOURCE = '''program test;
+var i: integer;
+    a: array[1..10] of integer;
+begin
+    i := 1;
+    a[i + (2 * 3)] := a[i] + (1 + 1)
+end.'''
+
+# --------------------------------------------- TESTS ---------------------------------------------
+
+def test_child_fields() -> None:
+    node_classes = [
+        value for _, value in inspect.getmembers(plpc.ast, inspect.isclass)
+        if is_dataclass(value)
+    ]
+
+    assert set(node_classes) == set(CHILD_FIELDS)
+    for node_class, child_fields in CHILD_FIELDS.items():
+        field_names = [field.name for field in fields(node_class)]
+        assert all(name in field_names for name, _ in child_fields)
+
+def test_transform_expressions_bottom_up() -> None:
+    ast = CompilerSession().parse(SOURCE, '<test-input>')
+
+    operators = []
+    def transform(expression: Expression) -> Expression:
+        if isinstance(expression[0], BinaryOperation):
+            operators.append(expression[0].operator)
+        return expression
+
+    transform_expressions(ast, transform)
+    assert operators == ['*', '+', '+', '+']
+
+def test_optimize_indices() -> None:
+    ast = CompilerSession().parse(SOURCE, '<test-input>')
+    optimize_ast(ast)
+
+    # Indices are folded, and remain (value, type) pairs
+    assignment = ast.block.body[1][0]
+    assert isinstance(assignment, AssignStatement)
+
+    index = assignment.left.indices[0]
+    assert len(index) == 2 and isinstance(index[0], BinaryOperation)
+    assert isinstance(index[0].left[0], VariableUsage)
+    assert index[0].right == (6, BuiltInType.INTEGER)
+
+    assert isinstance(assignment.right[0], BinaryOperation)
+    assert assignment.right[0].right == (2, BuiltInType.INTEGER)